@@ -0,0 +1,303 @@
+"""
+Activity Feeds
+==============
+The superadmin, coordinator and parent dashboards each show a "recent
+activity" feed. Instead of pulling the latest rows of several models and
+merging them in Python, every feed reads ActivityEvent rows of its scope:
+
+  - accounts.signals / competencies.signals record an event when a school,
+    teacher, student, class, score or feedback is saved
+  - bulk writes that skip signals (bulk import, api_save_scores) call
+    record_events() with the same builders
+  - feed() pages a scope newest-first with a keyset cursor ("load more");
+    feeds() loads the first page of many scopes in one query
+  - rebuild_activity_feed() backfills from the source tables (used by
+    `manage.py rebuild_activity_feed`)
+
+Events are inserted in the writer's transaction, so a rolled back save
+leaves no event behind.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils.timesince import timesince
+
+from .models import ActivityEvent
+
+
+FEED_PAGE_SIZE = 5
+PLATFORM       = 'platform'
+
+# Parent dashboard icon / colour per kind
+KIND_STYLES = {
+    ActivityEvent.SCORE:            ('assignment_turned_in', 'blue'),
+    ActivityEvent.FEEDBACK:         ('comment', 'purple'),
+    ActivityEvent.PROJECT_FEEDBACK: ('rate_review', 'orange'),
+}
+
+
+def school_scope(school_id):
+    return f'school:{school_id}'
+
+
+def student_scope(student_id):
+    return f'student:{student_id}'
+
+
+# ─────────────────────────────────────────────
+# Event builders — unsaved events, one per feed
+# ─────────────────────────────────────────────
+
+def _event(kind, scope, title, description='', school_name='', created_at=None):
+    event = ActivityEvent(
+        scope=scope,
+        kind=kind,
+        title=title[:255],
+        description=description[:255],
+        school_name=(school_name or '')[:255],
+    )
+    if created_at is not None:
+        event.created_at = created_at
+    return event
+
+
+def school_events(school, created_at=None):
+    return [
+        _event(ActivityEvent.SCHOOL, PLATFORM, 'New school registered',
+               f'{school.school_name} onboarded', school.school_name, created_at),
+    ]
+
+
+def teacher_events(teacher, created_at=None):
+    events = [
+        _event(ActivityEvent.TEACHER, PLATFORM, 'Teacher onboarded',
+               f'{teacher.full_name} added to platform', created_at=created_at),
+    ]
+    if teacher.school_id:
+        events.append(_event(
+            ActivityEvent.TEACHER, school_scope(teacher.school_id), 'New Teacher Added',
+            f'{teacher.full_name} joined as {teacher.get_designation_display()}',
+            teacher.school.school_name, created_at,
+        ))
+    return events
+
+
+def student_events(student, created_at=None):
+    events = [
+        _event(ActivityEvent.STUDENT, PLATFORM, 'Student enrolled',
+               f'{student.full_name} added to platform', created_at=created_at),
+    ]
+    if student.school_id:
+        events.append(_event(
+            ActivityEvent.STUDENT, school_scope(student.school_id), 'New Student Enrolled',
+            f'{student.first_name} {student.last_name} enrolled in Class {student.student_class or "—"}',
+            student.school.school_name, created_at,
+        ))
+    return events
+
+
+def class_events(cls, created_at=None):
+    return [
+        _event(ActivityEvent.CLASS, school_scope(cls.school_id), 'New Class Created',
+               f'{cls.class_name} — {cls.academic_year}', cls.school.school_name, created_at),
+    ]
+
+
+def score_events(scores, created_at=None):
+    """
+    scores: iterable of (student_id, assessment_competency_id, score) or
+    (…, score, created_at). Looks up the competency and assessment names
+    in one query; cleared scores (None) get no event.
+    """
+    from competencies.models import AssessmentCompetency
+
+    scores = [s for s in scores if s[2] is not None]
+    if not scores:
+        return []
+
+    names = {
+        ac_id: (competency or 'Unknown', assessment or '')
+        for ac_id, competency, assessment in
+        AssessmentCompetency.objects
+        .filter(id__in={s[1] for s in scores})
+        .values_list('id', 'competency__name', 'assessment__name')
+    }
+    events = []
+    for student_id, ac_id, score, *stamp in scores:
+        if ac_id not in names:
+            continue
+        competency, assessment = names[ac_id]
+        events.append(_event(
+            ActivityEvent.SCORE, student_scope(student_id), f'Score Recorded — {competency}',
+            f'{assessment} · Score: {score}/10', created_at=stamp[0] if stamp else created_at,
+        ))
+    return events
+
+
+def assessment_feedback_events(feedback, created_at=None):
+    name = feedback.assessment.name
+    return [
+        _event(ActivityEvent.FEEDBACK, student_scope(feedback.student_id), 'Assessment Feedback',
+               f'{name} — {feedback.feedback[:80]}' if feedback.feedback else name,
+               created_at=created_at),
+    ]
+
+
+def project_feedback_events(feedback, created_at=None):
+    return [
+        _event(ActivityEvent.PROJECT_FEEDBACK, student_scope(feedback.student_id),
+               f'Project Feedback — {feedback.project.title}',
+               feedback.feedback[:80] if feedback.feedback else 'Feedback received',
+               created_at=created_at),
+    ]
+
+
+def record_events(events):
+    """Inserts unsaved events with one bulk INSERT."""
+    if events:
+        ActivityEvent.objects.bulk_create(events)
+
+
+# ─────────────────────────────────────────────
+# Reading a feed
+# ─────────────────────────────────────────────
+
+def encode_cursor(event):
+    stamp = int(event.created_at.timestamp()) * 1_000_000 + event.created_at.microsecond
+    return f'{stamp}.{event.id}'
+
+
+def decode_cursor(cursor):
+    """(created_at, id) from encode_cursor(), or None if malformed."""
+    try:
+        stamp, event_id = (int(part) for part in cursor.split('.'))
+    except (AttributeError, ValueError):
+        return None
+    created_at = datetime.fromtimestamp(stamp // 1_000_000, tz=dt_timezone.utc)
+    return created_at.replace(microsecond=stamp % 1_000_000), event_id
+
+
+def feed(scopes, before=None, limit=FEED_PAGE_SIZE):
+    """
+    Newest events of one scope (or several), after the `before` cursor.
+    Returns (events, next_cursor); next_cursor is None on the last page.
+    """
+    if isinstance(scopes, str):
+        events = ActivityEvent.objects.filter(scope=scopes)
+    else:
+        events = ActivityEvent.objects.filter(scope__in=list(scopes))
+
+    position = decode_cursor(before) if before else None
+    if position:
+        created_at, event_id = position
+        events = events.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=event_id))
+
+    page = list(events.order_by('-created_at', '-id')[:limit + 1])
+    if len(page) > limit:
+        return page[:limit], encode_cursor(page[limit - 1])
+    return page, None
+
+
+def feeds(scopes, limit=FEED_PAGE_SIZE):
+    """
+    First page of several feeds in ONE query — a ROW_NUMBER() window per
+    scope keeps the newest limit + 1 events of each.
+    Returns { scope: (events, next_cursor) } for every requested scope.
+    """
+    scopes = list(scopes)
+    ranked = (
+        ActivityEvent.objects
+        .filter(scope__in=scopes)
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=[F('scope')],
+            order_by=[F('created_at').desc(), F('id').desc()],
+        ))
+        .filter(rank__lte=limit + 1)
+        .order_by('scope', '-created_at', '-id')
+    )
+    pages = {scope: [] for scope in scopes}
+    for event in ranked:
+        pages[event.scope].append(event)
+
+    result = {}
+    for scope, page in pages.items():
+        if len(page) > limit:
+            result[scope] = (page[:limit], encode_cursor(page[limit - 1]))
+        else:
+            result[scope] = (page, None)
+    return result
+
+
+def as_dict(event):
+    """A feed entry as the parent dashboard's JavaScript renders it."""
+    icon, color = KIND_STYLES.get(event.kind, ('info', 'blue'))
+    return {
+        'type':        event.kind,
+        'icon':        icon,
+        'color':       color,
+        'title':       event.title,
+        'description': event.description,
+        'time':        timesince(event.created_at) + ' ago',
+        'timestamp':   event.created_at.isoformat(),
+    }
+
+
+# ─────────────────────────────────────────────
+# Backfill
+# ─────────────────────────────────────────────
+
+def rebuild_activity_feed(batch_size=2000):
+    """
+    Replaces every event with ones built from the source tables, dated
+    like the records they describe. Returns the number of events.
+    """
+    from competencies.models import ScoreEntry, StudentAssessmentFeedback, StudentProjectFeedback
+    from schools.models import Class, School
+    from student.models import Student
+    from teacher.models import Teacher
+
+    sources = [
+        (School.objects.all(), school_events, 'created_at'),
+        (Teacher.objects.select_related('school'), teacher_events, 'created_at'),
+        (Student.objects.select_related('school'), student_events, 'created_at'),
+        (Class.objects.select_related('school'), class_events, 'created_at'),
+        (StudentAssessmentFeedback.objects.exclude(feedback='').select_related('assessment'),
+         assessment_feedback_events, 'updated_at'),
+        (StudentProjectFeedback.objects.exclude(feedback='').select_related('project'),
+         project_feedback_events, 'updated_at'),
+    ]
+
+    ActivityEvent.objects.all().delete()
+    total = 0
+    for queryset, build, stamp in sources:
+        events = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            events.extend(build(obj, created_at=getattr(obj, stamp)))
+            if len(events) >= batch_size:
+                record_events(events)
+                total += len(events)
+                events = []
+        record_events(events)
+        total += len(events)
+
+    scores = (
+        ScoreEntry.objects.filter(score__isnull=False)
+        .values_list('student_id', 'assessment_competency_id', 'score', 'updated_at')
+    )
+    batch = []
+    for row in scores.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            total += _record_scores(batch)
+            batch = []
+    total += _record_scores(batch)
+    return total
+
+
+def _record_scores(rows):
+    events = score_events(rows)
+    record_events(events)
+    return len(events)
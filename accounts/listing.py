@@ -0,0 +1,219 @@
+"""
+Directory Lists
+===============
+The role directories (students, teachers, parents, schools, school admins)
+used to render every row and leave paging, search and sorting to
+DataTables in the browser. A DirectoryList serves them a page at a time:
+
+  - search (?q=), filters (?status=, ?school=, …) and sort (?sort=name,
+    ?sort=-created) run in the database
+  - pages are keyset paginated on (sort column, id): the next page starts
+    after the last row's values (?after=<cursor>), so a deep page costs
+    the same as the first one
+  - the list page renders the first page; rows_response() returns the
+    following ones as {html, next, total} for infinite scroll
+    (static/js/common/keyset-list.js)
+
+Badge initials and colours are worked out for the rows of a page only.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+
+
+PAGE_SIZE    = 50
+BADGE_COLORS = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4']
+
+
+def initials(name):
+    words = (name or '').strip().split()
+    if len(words) >= 2:
+        return (words[0][0] + words[1][0]).upper()
+    return (name or '').strip()[:2].upper()
+
+
+def badge_color(name, colors=BADGE_COLORS):
+    """Same colour for the same name on every page."""
+    name = (name or '').strip()
+    return colors[ord(name[0]) % len(colors)] if name else colors[0]
+
+
+# ─────────────────────────────────────────────
+# Cursor — opaque "<sort value>, <id>" of a page's last row
+# ─────────────────────────────────────────────
+
+def encode_cursor(value, pk):
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()   # full precision; DjangoJSONEncoder drops µs
+    raw = json.dumps([value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(sort value, id) from encode_cursor(), or None if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, pk = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(pk, int):
+        return None
+    return value, pk
+
+
+# ─────────────────────────────────────────────
+# Lists
+# ─────────────────────────────────────────────
+
+class ListFilter:
+    """
+    One ?param= filter: an exact lookup, with the choices offered in the
+    toolbar (a list of (value, label), or a callable returning one — only
+    called when the toolbar is rendered).
+    """
+
+    def __init__(self, param, lookup, label, choices=()):
+        self.param    = param
+        self.lookup   = lookup
+        self.label    = label
+        self._choices = choices
+
+    @property
+    def choices(self):
+        return self._choices() if callable(self._choices) else self._choices
+
+
+class ListPage:
+    """A page of rows plus what the toolbar needs to show the current query."""
+
+    def __init__(self, rows, next_cursor, total, sort, query, filters):
+        self.rows    = rows
+        self.next    = next_cursor
+        self.total   = total
+        self.sort    = sort
+        self.query   = query
+        self.filters = filters   # [(ListFilter, current value)]
+
+
+class DirectoryList:
+    """
+    queryset:     every row the user may see
+    sorts:        { key: model field } — ?sort=key ascending, ?sort=-key descending;
+                  sort fields must be NOT NULL for the keyset comparison
+    default_sort: e.g. '-created'
+    search:       fields matched with icontains against ?q=
+    filters:      [ListFilter]
+    decorate:     called with each page's rows (initials, badge colours, …)
+    """
+
+    def __init__(self, queryset, sorts, default_sort, search=(), filters=(),
+                 decorate=None, page_size=PAGE_SIZE):
+        self.queryset     = queryset
+        self.sorts        = sorts
+        self.default_sort = default_sort
+        self.search       = search
+        self.filters      = filters
+        self.decorate     = decorate
+        self.page_size    = page_size
+
+    def _sort(self, params):
+        sort = params.get('sort') or self.default_sort
+        if sort.lstrip('-') not in self.sorts:
+            sort = self.default_sort
+        return sort, self.sorts[sort.lstrip('-')], sort.startswith('-')
+
+    def filtered(self, params):
+        """The queryset narrowed by ?q= and the filters."""
+        rows  = self.queryset
+        query = (params.get('q') or '').strip()
+        if query and self.search:
+            match = Q()
+            for field in self.search:
+                match |= Q(**{f'{field}__icontains': query})
+            rows = rows.filter(match)
+
+        for list_filter in self.filters:
+            value = params.get(list_filter.param)
+            if not value:
+                continue
+            try:
+                rows = rows.filter(**{list_filter.lookup: value})
+            except (ValueError, ValidationError):
+                return rows.none()   # e.g. ?school=abc
+        return rows
+
+    def page(self, params):
+        """
+        The page after ?after= (the first page without it). total is only
+        counted for a first page — scrolling further does not recount.
+        """
+        sort, field, descending = self._sort(params)
+        rows = self.filtered(params)
+
+        cursor   = params.get('after')
+        position = decode_cursor(cursor) if cursor else None
+        total    = None
+        if position:
+            value, pk = position
+            op = 'lt' if descending else 'gt'
+            rows = rows.filter(Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'pk__{op}': pk}))
+        else:
+            total = rows.count()
+
+        order = [f'-{field}', '-pk'] if descending else [field, 'pk']
+        page  = list(rows.order_by(*order)[:self.page_size + 1])
+
+        next_cursor = None
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            last = page[-1]
+            next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+        if self.decorate and page:
+            self.decorate(page)
+
+        filters = [(f, params.get(f.param, '')) for f in self.filters]
+        return ListPage(page, next_cursor, total, sort, params.get('q', ''), filters)
+
+
+def rows_response(request, directory, template, name, context=None):
+    """
+    JSON for infinite scroll: {html, next, total}. template renders the
+    page's rows (<tr>s) from the context variable `name`.
+    """
+    listing = directory.page(request.GET)
+    html = render_to_string(template, {name: listing.rows, **(context or {})}, request=request)
+    return JsonResponse({'html': html, 'next': listing.next, 'total': listing.total})
+
+
+# ─────────────────────────────────────────────
+# Shared directories
+# ─────────────────────────────────────────────
+
+ACTIVE_CHOICES = [('1', 'Active'), ('0', 'Inactive')]
+
+
+def school_directory():
+    """Every school — the superadmin and coordinator school lists."""
+    from schools.models import School
+
+    return DirectoryList(
+        School.objects.all(),
+        sorts={'created': 'created_at', 'name': 'school_name', 'code': 'school_code'},
+        default_sort='-created',
+        search=['school_name', 'school_code', 'city', 'state', 'school_email'],
+        filters=[ListFilter('status', 'is_active', 'All statuses', ACTIVE_CHOICES)],
+        decorate=_school_badges,
+    )
+
+
+def _school_badges(schools):
+    for school in schools:
+        school.initials    = initials(school.school_name)
+        school.badge_color = badge_color(school.school_name)
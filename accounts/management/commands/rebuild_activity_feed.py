@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.activity import rebuild_activity_feed
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the dashboard activity feeds (ActivityEvent) from schools, users, scores and feedback.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Rows read and events inserted per batch (default: 2000).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            events = rebuild_activity_feed(options['batch_size'])
+        self.stdout.write(f'Rebuilt {events} activity event(s).')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from accounts.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the global search index (SearchEntry) from schools, students, teachers and parents.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Rows read and entries inserted per batch (default: 2000).')
+
+    def handle(self, *args, **options):
+        entries = rebuild_search_index(options['batch_size'])
+        self.stdout.write(f'Indexed {entries} search entr{"y" if entries == 1 else "ies"}.')
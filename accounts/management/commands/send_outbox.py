@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import purge_finished, send_once, sender_name
+
+
+PURGE_INTERVAL = 3600   # seconds between purges of sent and failed messages
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails (OutboxEmail) over a reused mail connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Messages claimed and sent per connection (default 100).')
+        parser.add_argument('--rate', type=float, default=None,
+                            help='Maximum messages per second (default: no limit).')
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help='Seconds to wait when the outbox is empty (default 5).')
+        parser.add_argument('--backend', default=None,
+                            help='Email backend to use instead of EMAIL_BACKEND, '
+                                 'e.g. django.core.mail.backends.console.EmailBackend.')
+        parser.add_argument('--keep-days', type=int, default=7,
+                            help='Delete sent and failed messages older than this (default 7).')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox once and exit instead of running forever.')
+
+    def handle(self, *args, **options):
+        sender     = sender_name()
+        keep       = timedelta(days=options['keep_days'])
+        last_purge = 0.0
+        self.stdout.write(f'Outbox sender {sender} started.')
+
+        while True:
+            if time.monotonic() - last_purge >= PURGE_INTERVAL:
+                purged = purge_finished(keep)
+                if purged:
+                    self.stdout.write(f'Purged {purged} sent or failed message(s).')
+                last_purge = time.monotonic()
+
+            connection = get_connection(options['backend']) if options['backend'] else None
+            sent, failed = send_once(sender, options['batch_size'], connection, options['rate'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}.')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
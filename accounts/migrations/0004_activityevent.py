@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=40)),
+                ('kind', models.CharField(choices=[('school', 'School onboarded'), ('teacher', 'Teacher added'), ('student', 'Student enrolled'), ('class', 'Class created'), ('score', 'Score recorded'), ('feedback', 'Assessment feedback'), ('project_feedback', 'Project feedback')], max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('school_name', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['scope', 'created_at', 'id'], name='accounts_ac_scope_84c594_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:59
+
+from django.db import OperationalError, migrations, models
+
+
+# Full-text index over title + keywords; accounts.search queries it
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE accounts_searchentry_fts USING fts5(
+        title, keywords,
+        content='accounts_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER accounts_searchentry_ai AFTER INSERT ON accounts_searchentry BEGIN
+        INSERT INTO accounts_searchentry_fts(rowid, title, keywords) VALUES (new.id, new.title, new.keywords);
+    END""",
+    """CREATE TRIGGER accounts_searchentry_ad AFTER DELETE ON accounts_searchentry BEGIN
+        INSERT INTO accounts_searchentry_fts(accounts_searchentry_fts, rowid, title, keywords)
+        VALUES ('delete', old.id, old.title, old.keywords);
+    END""",
+    """CREATE TRIGGER accounts_searchentry_au AFTER UPDATE ON accounts_searchentry BEGIN
+        INSERT INTO accounts_searchentry_fts(accounts_searchentry_fts, rowid, title, keywords)
+        VALUES ('delete', old.id, old.title, old.keywords);
+        INSERT INTO accounts_searchentry_fts(rowid, title, keywords) VALUES (new.id, new.title, new.keywords);
+    END""",
+]
+SQLITE_FTS_DROP = [
+    'DROP TRIGGER IF EXISTS accounts_searchentry_ai',
+    'DROP TRIGGER IF EXISTS accounts_searchentry_ad',
+    'DROP TRIGGER IF EXISTS accounts_searchentry_au',
+    'DROP TABLE IF EXISTS accounts_searchentry_fts',
+]
+POSTGRES_TSV = [
+    """CREATE INDEX accounts_searchentry_tsv ON accounts_searchentry
+       USING GIN (to_tsvector('simple', title || ' ' || keywords))""",
+]
+POSTGRES_TSV_DROP = ['DROP INDEX IF EXISTS accounts_searchentry_tsv']
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FTS)
+        except OperationalError:
+            # SQLite built without FTS5: accounts.search falls back to LIKE
+            _run(schema_editor, SQLITE_FTS_DROP)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_TSV)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FTS_DROP)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_TSV_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_activityevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('school', 'School'), ('student', 'Student'), ('teacher', 'Teacher'), ('parent', 'Parent')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('keywords', models.TextField(blank=True)),
+                ('school_id', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Search entries',
+                'indexes': [models.Index(fields=['school_id'], name='accounts_se_school__6b99a3_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,112 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+
+
+def backfill_activity_events(apps, schema_editor):
+    """
+    The feeds used to be computed from these records; fill ActivityEvent
+    from them (same wording as accounts.activity, dated like the records)
+    so the dashboards are not empty after deploying 0004.
+    """
+    ActivityEvent             = apps.get_model('accounts', 'ActivityEvent')
+    School                    = apps.get_model('schools', 'School')
+    Class                     = apps.get_model('schools', 'Class')
+    Teacher                   = apps.get_model('teacher', 'Teacher')
+    Student                   = apps.get_model('student', 'Student')
+    ScoreEntry                = apps.get_model('competencies', 'ScoreEntry')
+    StudentAssessmentFeedback = apps.get_model('competencies', 'StudentAssessmentFeedback')
+    StudentProjectFeedback    = apps.get_model('competencies', 'StudentProjectFeedback')
+
+    def event(kind, scope, title, description='', school_name='', created_at=None):
+        return ActivityEvent(
+            scope=scope, kind=kind, title=title[:255], description=description[:255],
+            school_name=(school_name or '')[:255], created_at=created_at,
+        )
+
+    def school_events(school):
+        return [event('school', 'platform', 'New school registered',
+                      f'{school.school_name} onboarded', school.school_name, school.created_at)]
+
+    def teacher_events(teacher):
+        events = [event('teacher', 'platform', 'Teacher onboarded',
+                        f'{teacher.full_name} added to platform', created_at=teacher.created_at)]
+        if teacher.school_id:
+            events.append(event(
+                'teacher', f'school:{teacher.school_id}', 'New Teacher Added',
+                f'{teacher.full_name} joined as {teacher.get_designation_display()}',
+                teacher.school.school_name, teacher.created_at,
+            ))
+        return events
+
+    def student_events(student):
+        full_name = ' '.join(filter(None, [student.first_name, student.middle_name, student.last_name]))
+        events = [event('student', 'platform', 'Student enrolled',
+                        f'{full_name} added to platform', created_at=student.created_at)]
+        if student.school_id:
+            events.append(event(
+                'student', f'school:{student.school_id}', 'New Student Enrolled',
+                f'{student.first_name} {student.last_name} enrolled in Class {student.student_class or "—"}',
+                student.school.school_name, student.created_at,
+            ))
+        return events
+
+    def class_events(cls):
+        return [event('class', f'school:{cls.school_id}', 'New Class Created',
+                      f'{cls.class_name} — {cls.academic_year}', cls.school.school_name, cls.created_at)]
+
+    def score_events(row):
+        student_id, score, competency, assessment, updated_at = row
+        return [event('score', f'student:{student_id}', f'Score Recorded — {competency or "Unknown"}',
+                      f'{assessment or ""} · Score: {score}/10', created_at=updated_at)]
+
+    def assessment_feedback_events(feedback):
+        name = feedback.assessment.name
+        return [event('feedback', f'student:{feedback.student_id}', 'Assessment Feedback',
+                      f'{name} — {feedback.feedback[:80]}', created_at=feedback.updated_at)]
+
+    def project_feedback_events(feedback):
+        return [event('project_feedback', f'student:{feedback.student_id}',
+                      f'Project Feedback — {feedback.project.title}', feedback.feedback[:80],
+                      created_at=feedback.updated_at)]
+
+    sources = [
+        (School.objects.all(), school_events),
+        (Teacher.objects.select_related('school'), teacher_events),
+        (Student.objects.select_related('school'), student_events),
+        (Class.objects.select_related('school'), class_events),
+        (ScoreEntry.objects.filter(score__isnull=False).values_list(
+            'student_id', 'score', 'assessment_competency__competency__name',
+            'assessment_competency__assessment__name', 'updated_at',
+        ), score_events),
+        (StudentAssessmentFeedback.objects.exclude(feedback='').select_related('assessment'),
+         assessment_feedback_events),
+        (StudentProjectFeedback.objects.exclude(feedback='').select_related('project'),
+         project_feedback_events),
+    ]
+
+    ActivityEvent.objects.all().delete()
+    for queryset, build in sources:
+        events = []
+        for obj in queryset.iterator(chunk_size=BATCH_SIZE):
+            events.extend(build(obj))
+            if len(events) >= BATCH_SIZE:
+                ActivityEvent.objects.bulk_create(events)
+                events = []
+        ActivityEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_searchentry'),
+        ('competencies', '0016_assessmentstat'),
+        ('schools', '0004_school_list_indexes'),
+        ('student', '0002_student_list_indexes'),
+        ('teacher', '0002_teacher_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_activity_events, migrations.RunPython.noop),
+    ]
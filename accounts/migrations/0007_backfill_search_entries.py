@@ -0,0 +1,88 @@
+import re
+
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+WORD       = re.compile(r'\w+')
+
+
+def backfill_search_entries(apps, schema_editor):
+    """
+    The school picker and /search/ read only SearchEntry; index the records
+    that existed before 0005 (same entries as accounts.search builds).
+    """
+    SearchEntry = apps.get_model('accounts', 'SearchEntry')
+    School      = apps.get_model('schools', 'School')
+    Student     = apps.get_model('student', 'Student')
+    Teacher     = apps.get_model('teacher', 'Teacher')
+    Parent      = apps.get_model('parent', 'Parent')
+
+    def words(*values):
+        return ' '.join(WORD.findall(' '.join(str(v) for v in values if v).lower()))
+
+    def school_entry(school):
+        return SearchEntry(
+            kind='school', object_id=school.pk,
+            title=school.school_name[:255],
+            subtitle=' · '.join(filter(None, [school.school_code, school.city]))[:255],
+            keywords=words(school.school_code, school.school_email, school.city, school.state),
+            school_id=school.pk,
+        )
+
+    def student_entry(student):
+        return SearchEntry(
+            kind='student', object_id=student.pk,
+            title=' '.join(filter(None, [student.first_name, student.middle_name, student.last_name]))[:255],
+            subtitle=' · '.join(filter(None, [
+                f'Class {student.student_class}-{student.division}', student.school_name,
+            ]))[:255],
+            keywords=words(student.gr_number, student.skill_lab_reg_id, student.school_email),
+            school_id=student.school_id,
+        )
+
+    def teacher_entry(teacher):
+        return SearchEntry(
+            kind='teacher', object_id=teacher.pk,
+            title=teacher.full_name[:255],
+            subtitle=' · '.join(filter(None, [teacher.employee_id, teacher.get_designation_display()]))[:255],
+            keywords=words(teacher.employee_id, teacher.official_email, teacher.mobile_number),
+            school_id=teacher.school_id,
+        )
+
+    def parent_entry(parent):
+        return SearchEntry(
+            kind='parent', object_id=parent.pk,
+            title=parent.full_name[:255],
+            subtitle=parent.parent_id or '',
+            keywords=words(parent.parent_id, parent.email, parent.mobile_number),
+        )
+
+    sources = [
+        (School, school_entry),
+        (Student, student_entry),
+        (Teacher, teacher_entry),
+        (Parent, parent_entry),
+    ]
+
+    SearchEntry.objects.all().delete()
+    for model, build in sources:
+        entries = []
+        for obj in model.objects.all().iterator(chunk_size=BATCH_SIZE):
+            entries.append(build(obj))
+            if len(entries) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(entries)
+                entries = []
+        SearchEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_backfill_activity_events'),
+        ('parent', '0002_parent_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
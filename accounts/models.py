@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -35,3 +36,123 @@ class User(AbstractUser):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be delivered by `manage.py send_outbox`.
+    Written in the same transaction as the account it belongs to, so a
+    rolled back onboarding never emails credentials — see accounts.outbox.
+    """
+    PENDING = 'Pending'
+    SENT    = 'Sent'
+    FAILED  = 'Failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT,    'Sent'),
+        (FAILED,  'Failed'),
+    ]
+
+    subject      = models.CharField(max_length=255)
+    body         = models.TextField()
+    from_email   = models.CharField(max_length=255, blank=True)   # blank = DEFAULT_FROM_EMAIL
+    to           = models.JSONField(default=list)
+    status       = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    error        = models.TextField(blank=True)
+    send_after   = models.DateTimeField(default=timezone.now)
+    claimed_by   = models.CharField(max_length=100, blank=True)
+    claimed_at   = models.DateTimeField(null=True, blank=True)
+    sent_at      = models.DateTimeField(null=True, blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['send_after', 'id']
+        indexes  = [models.Index(fields=['status', 'send_after'])]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
+
+
+class ActivityEvent(models.Model):
+    """
+    One entry of a dashboard activity feed, written when the thing it
+    describes is saved — see accounts.activity. Append-only: an event is
+    copied once per feed (scope) that shows it, with that feed's wording,
+    so every feed is one range scan of the (scope, created_at) index.
+
+    Scopes: 'platform' (superadmin), 'school:<id>' (coordinators of the
+    school), 'student:<id>' (the student's parents).
+    """
+    SCHOOL           = 'school'
+    TEACHER          = 'teacher'
+    STUDENT          = 'student'
+    CLASS            = 'class'
+    SCORE            = 'score'
+    FEEDBACK         = 'feedback'
+    PROJECT_FEEDBACK = 'project_feedback'
+    KIND_CHOICES = [
+        (SCHOOL,           'School onboarded'),
+        (TEACHER,          'Teacher added'),
+        (STUDENT,          'Student enrolled'),
+        (CLASS,            'Class created'),
+        (SCORE,            'Score recorded'),
+        (FEEDBACK,         'Assessment feedback'),
+        (PROJECT_FEEDBACK, 'Project feedback'),
+    ]
+
+    scope       = models.CharField(max_length=40)
+    kind        = models.CharField(max_length=20, choices=KIND_CHOICES)
+    title       = models.CharField(max_length=255)
+    description = models.CharField(max_length=255, blank=True)
+    school_name = models.CharField(max_length=255, blank=True)
+    created_at  = models.DateTimeField(default=timezone.now)   # of the source record when backfilled
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes  = [models.Index(fields=['scope', 'created_at', 'id'])]
+
+    def __str__(self):
+        return f"[{self.scope}] {self.title}"
+
+    @property
+    def activity_type(self):
+        return self.kind
+
+
+class SearchEntry(models.Model):
+    """
+    One school, student, teacher or parent in the global search index —
+    see accounts.search. Kept in sync by signals; the full-text index over
+    `title` and `keywords` (FTS5 on SQLite, a GIN tsvector index on
+    PostgreSQL) is maintained by the database from this table.
+
+    keywords holds codes, GR numbers, emails and phone numbers split into
+    plain lower-case words, so both backends tokenize them the same way.
+    """
+    SCHOOL  = 'school'
+    STUDENT = 'student'
+    TEACHER = 'teacher'
+    PARENT  = 'parent'
+    KIND_CHOICES = [
+        (SCHOOL,  'School'),
+        (STUDENT, 'Student'),
+        (TEACHER, 'Teacher'),
+        (PARENT,  'Parent'),
+    ]
+
+    kind      = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title     = models.CharField(max_length=255)
+    subtitle  = models.CharField(max_length=255, blank=True)
+    keywords  = models.TextField(blank=True)
+    school_id = models.PositiveIntegerField(null=True, blank=True)   # for scoping school admins / coordinators
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        indexes = [models.Index(fields=['school_id'])]
+        verbose_name_plural = 'Search entries'
+
+    def __str__(self):
+        return f"[{self.kind}] {self.title}"
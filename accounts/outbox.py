@@ -0,0 +1,198 @@
+"""
+Email Outbox
+============
+Views and the bulk importer never talk to SMTP themselves: they call
+queue_email(), which only inserts an OutboxEmail row inside the caller's
+transaction, and `manage.py send_outbox` delivers the queue.
+
+  queue_email() / queue_emails() — one message / a batch in one INSERT
+  claim_emails()                 — a sender atomically takes due messages
+  send_emails()                  — delivers a claimed batch over ONE mail
+                                   connection; failures retry with backoff
+  purge_finished()               — drops sent and failed messages after
+                                   their retention period
+
+Welcome emails carry temporary passwords, so a message's body is blanked
+as soon as it is sent or has failed for good; only the envelope (subject,
+recipients, status, error) is kept until the purge.
+
+Delivery uses the configured EMAIL_BACKEND (or the one passed to
+send_emails), so the console, file-based and locmem backends work for
+development and tests.
+"""
+
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+RETRY_BASE_DELAY = timedelta(minutes=1)    # doubled on every retry
+STALE_AFTER      = timedelta(minutes=10)   # claimed longer than this → sender died
+
+
+def sender_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ─────────────────────────────────────────────
+# Queueing
+# ─────────────────────────────────────────────
+
+def build_email(subject, body, recipients, from_email=None):
+    """An unsaved OutboxEmail, for queue_emails()."""
+    return OutboxEmail(
+        subject=subject,
+        body=body,
+        to=list(recipients),
+        from_email=from_email or '',
+    )
+
+
+def queue_email(subject, body, recipients, from_email=None):
+    """Queues one message; same arguments as send_mail."""
+    email = build_email(subject, body, recipients, from_email)
+    email.save()
+    return email
+
+
+def queue_emails(emails):
+    """Queues unsaved OutboxEmail objects with one bulk INSERT."""
+    return OutboxEmail.objects.bulk_create(emails)
+
+
+# ─────────────────────────────────────────────
+# Sender side
+# ─────────────────────────────────────────────
+
+def claim_emails(sender, limit=100):
+    """
+    Takes up to `limit` due Pending messages for this sender. The
+    conditional UPDATE only takes rows still unclaimed, so several senders
+    never deliver the same message.
+    """
+    now = timezone.now()
+    OutboxEmail.objects.filter(
+        status=OutboxEmail.PENDING,
+        claimed_at__lt=now - STALE_AFTER,
+    ).update(claimed_by='', claimed_at=None)
+
+    due_ids = list(
+        OutboxEmail.objects
+        .filter(status=OutboxEmail.PENDING, claimed_by='', send_after__lte=now)
+        .values_list('id', flat=True)[:limit]
+    )
+    if not due_ids:
+        return []
+
+    token = f'{sender}:{uuid.uuid4().hex[:8]}'
+    OutboxEmail.objects.filter(id__in=due_ids, status=OutboxEmail.PENDING, claimed_by='').update(
+        claimed_by=token,
+        claimed_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(OutboxEmail.objects.filter(claimed_by=token, status=OutboxEmail.PENDING))
+
+
+def send_emails(emails, connection=None, rate=None):
+    """
+    Delivers claimed messages over one connection, opened once for the
+    whole batch. rate caps messages per second (None = no limit).
+    Returns (sent, failed) counts; failed messages are requeued with
+    backoff until max_attempts.
+    """
+    if not emails:
+        return 0, 0
+
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        _retry_or_fail(emails, str(exc) or exc.__class__.__name__)
+        return 0, len(emails)
+
+    sent     = []
+    failed   = []
+    interval = 1.0 / rate if rate else 0
+    next_at  = time.monotonic()
+    try:
+        for email in emails:
+            if interval:
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_at = max(next_at, time.monotonic()) + interval
+
+            message = EmailMessage(
+                email.subject, email.body,
+                email.from_email or settings.DEFAULT_FROM_EMAIL,
+                email.to,
+                connection=connection,
+            )
+            try:
+                if not connection.send_messages([message]):
+                    raise RuntimeError('Message was not accepted by the mail backend')
+            except Exception as exc:
+                email.error = str(exc) or exc.__class__.__name__
+                failed.append(email)
+                continue
+
+            email.status  = OutboxEmail.SENT
+            email.sent_at = timezone.now()
+            email.error   = ''
+            email.body    = ''   # may hold a temporary password
+            sent.append(email)
+    finally:
+        connection.close()
+
+    OutboxEmail.objects.bulk_update(sent, ['status', 'sent_at', 'error', 'body'])
+    if failed:
+        _retry_or_fail(failed)
+    return len(sent), len(failed)
+
+
+def _retry_or_fail(emails, error=None):
+    now = timezone.now()
+    for email in emails:
+        if error is not None:
+            email.error = error
+        email.claimed_by = ''
+        email.claimed_at = None
+        if email.attempts >= email.max_attempts:
+            email.status = OutboxEmail.FAILED
+            email.body   = ''   # never sent; may hold a temporary password
+        else:
+            email.send_after = now + RETRY_BASE_DELAY * (2 ** (email.attempts - 1))
+
+    OutboxEmail.objects.bulk_update(emails, ['status', 'error', 'claimed_by', 'claimed_at', 'send_after', 'body'])
+
+
+def send_once(sender=None, limit=100, connection=None, rate=None):
+    """Claims and delivers one batch. Returns (sent, failed)."""
+    emails = claim_emails(sender or sender_name(), limit)
+    return send_emails(emails, connection, rate)
+
+
+def purge_finished(older_than=timedelta(days=7)):
+    """
+    Deletes messages sent, or failed for good, before `older_than` ago,
+    and blanks the body of any finished message that still has one.
+    Returns the number deleted.
+    """
+    cutoff = timezone.now() - older_than
+    deleted, _ = OutboxEmail.objects.filter(
+        Q(status=OutboxEmail.SENT, sent_at__lt=cutoff) |
+        Q(status=OutboxEmail.FAILED, send_after__lt=cutoff)   # when its last attempt was due
+    ).delete()
+    OutboxEmail.objects.filter(
+        status__in=[OutboxEmail.SENT, OutboxEmail.FAILED]
+    ).exclude(body='').update(body='')
+    return deleted
@@ -0,0 +1,279 @@
+"""
+Global Search
+=============
+One index over schools, students, teachers and parents, behind the
+/search/ API and the superadmin's school picker (search_schools):
+
+  - accounts.signals keeps one SearchEntry per record (post_save /
+    post_delete); the bulk importer, which skips signals, calls
+    index_objects()
+  - the database keeps the full-text index in step with SearchEntry: an
+    FTS5 table maintained by triggers on SQLite, a GIN tsvector index on
+    PostgreSQL (migration 0005_searchentry); without either, search()
+    falls back to LIKE on the same table
+  - every query word is a prefix match ("pri sha" finds Priya Sharma), and
+    results are ranked by relevance (bm25 / ts_rank) with names weighted
+    above codes, GR numbers and emails
+  - rebuild_search_index() reindexes from the tables (`manage.py
+    rebuild_search_index`); migration 0007_backfill_search_entries keeps
+    its own copy of the builders
+"""
+
+import re
+
+from django.db import OperationalError, connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.urls import reverse
+
+from .models import SearchEntry
+
+
+SEARCH_LIMIT = 20
+MAX_TERMS    = 8                 # words of a query that are matched
+WORD         = re.compile(r'\w+')
+
+# Relative weight of a match in the name vs. in the keywords
+TITLE_WEIGHT   = 10.0
+KEYWORD_WEIGHT = 1.0
+
+
+def words(*values):
+    """The indexed form of values: lower-case words, space separated."""
+    return ' '.join(WORD.findall(' '.join(str(v) for v in values if v).lower()))
+
+
+# ─────────────────────────────────────────────
+# Entry builders — an unsaved SearchEntry per record
+# ─────────────────────────────────────────────
+
+def school_entry(school):
+    return SearchEntry(
+        kind=SearchEntry.SCHOOL,
+        object_id=school.pk,
+        title=school.school_name[:255],
+        subtitle=' · '.join(filter(None, [school.school_code, school.city]))[:255],
+        keywords=words(school.school_code, school.school_email, school.city, school.state),
+        school_id=school.pk,
+    )
+
+
+def student_entry(student):
+    return SearchEntry(
+        kind=SearchEntry.STUDENT,
+        object_id=student.pk,
+        title=' '.join(filter(None, [student.first_name, student.middle_name, student.last_name]))[:255],
+        subtitle=' · '.join(filter(None, [
+            f'Class {student.student_class}-{student.division}', student.school_name,
+        ]))[:255],
+        keywords=words(student.gr_number, student.skill_lab_reg_id, student.school_email),
+        school_id=student.school_id,
+    )
+
+
+def teacher_entry(teacher):
+    return SearchEntry(
+        kind=SearchEntry.TEACHER,
+        object_id=teacher.pk,
+        title=teacher.full_name[:255],
+        subtitle=' · '.join(filter(None, [teacher.employee_id, teacher.get_designation_display()]))[:255],
+        keywords=words(teacher.employee_id, teacher.official_email, teacher.mobile_number),
+        school_id=teacher.school_id,
+    )
+
+
+def parent_entry(parent):
+    return SearchEntry(
+        kind=SearchEntry.PARENT,
+        object_id=parent.pk,
+        title=parent.full_name[:255],
+        subtitle=parent.parent_id or '',
+        keywords=words(parent.parent_id, parent.email, parent.mobile_number),
+    )
+
+
+ENTRY_BUILDERS = {
+    'schools.School':  school_entry,
+    'student.Student': student_entry,
+    'teacher.Teacher': teacher_entry,
+    'parent.Parent':   parent_entry,
+}
+
+ENTRY_FIELDS = ['title', 'subtitle', 'keywords', 'school_id']
+
+
+def index_object(instance):
+    entry = ENTRY_BUILDERS[instance._meta.label](instance)
+    SearchEntry.objects.update_or_create(
+        kind=entry.kind, object_id=entry.object_id,
+        defaults={field: getattr(entry, field) for field in ENTRY_FIELDS},
+    )
+
+
+def unindex_object(instance):
+    entry = ENTRY_BUILDERS[instance._meta.label](instance)
+    SearchEntry.objects.filter(kind=entry.kind, object_id=entry.object_id).delete()
+
+
+def index_objects(objects):
+    """
+    Indexes records saved without signals (bulk_create) with one upsert;
+    records of models that are not searched (school admins) are skipped.
+    """
+    entries = [
+        ENTRY_BUILDERS[obj._meta.label](obj) for obj in objects if obj._meta.label in ENTRY_BUILDERS
+    ]
+    if entries:
+        SearchEntry.objects.bulk_create(
+            entries, update_conflicts=True,
+            unique_fields=['kind', 'object_id'], update_fields=ENTRY_FIELDS,
+        )
+
+
+# ─────────────────────────────────────────────
+# Searching
+# ─────────────────────────────────────────────
+
+def search(query, kinds=None, school_ids=None, limit=SEARCH_LIMIT):
+    """
+    Entries matching every word of query as a prefix, best first.
+
+    kinds:      only these kinds (None = all)
+    school_ids: only entries of these schools (None = no restriction)
+
+    Each entry carries has_admin — for a school, whether it has an active
+    school admin — from one annotated subquery.
+    """
+    ids = match_ids(query, kinds, school_ids, limit)
+    if not ids:
+        return []
+
+    from school_admin.models import SchoolAdmin
+    entries = SearchEntry.objects.filter(id__in=ids).annotate(
+        has_admin=Exists(SchoolAdmin.objects.filter(school_id=OuterRef('object_id'), is_active=True))
+    )
+    by_id = {entry.id: entry for entry in entries}
+    return [by_id[entry_id] for entry_id in ids if entry_id in by_id]
+
+
+def match_ids(query, kinds=None, school_ids=None, limit=SEARCH_LIMIT):
+    """Ids of the best matching entries, in rank order — one query."""
+    terms = WORD.findall(query.lower())[:MAX_TERMS]
+    if not terms or (school_ids is not None and not school_ids):
+        return []
+    if connection.vendor == 'postgresql':
+        return _match_tsvector(terms, kinds, school_ids, limit)
+    if connection.vendor == 'sqlite':
+        try:
+            return _match_fts5(terms, kinds, school_ids, limit)
+        except OperationalError:
+            pass   # SQLite without FTS5 — no index table
+    return _match_like(terms, kinds, school_ids, limit)
+
+
+def _restrict(sql, params, kinds, school_ids):
+    if kinds:
+        sql.append(f"AND e.kind IN ({', '.join(['%s'] * len(kinds))})")
+        params.extend(kinds)
+    if school_ids is not None:
+        sql.append(f"AND e.school_id IN ({', '.join(['%s'] * len(school_ids))})")
+        params.extend(school_ids)
+
+
+def _match_fts5(terms, kinds, school_ids, limit):
+    # Terms are \w+ only, so quoting them as "term"* is safe MATCH syntax
+    sql = [
+        'SELECT e.id FROM accounts_searchentry_fts f',
+        'JOIN accounts_searchentry e ON e.id = f.rowid',
+        'WHERE accounts_searchentry_fts MATCH %s',
+    ]
+    params = [' '.join(f'"{term}"*' for term in terms)]
+    _restrict(sql, params, kinds, school_ids)
+    sql.append(f'ORDER BY bm25(accounts_searchentry_fts, {TITLE_WEIGHT}, {KEYWORD_WEIGHT}), e.id LIMIT %s')
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(' '.join(sql), params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _match_tsvector(terms, kinds, school_ids, limit):
+    # Same expression as the GIN index, so the @@ filter uses it
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    sql = [
+        'SELECT e.id FROM accounts_searchentry e',
+        "WHERE to_tsvector('simple', e.title || ' ' || e.keywords) @@ to_tsquery('simple', %s)",
+    ]
+    params = [tsquery]
+    _restrict(sql, params, kinds, school_ids)
+    sql.append(
+        "ORDER BY ts_rank(setweight(to_tsvector('simple', e.title), 'A') || "
+        "setweight(to_tsvector('simple', e.keywords), 'D'), to_tsquery('simple', %s)) DESC, e.id LIMIT %s"
+    )
+    params.extend([tsquery, limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(' '.join(sql), params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _match_like(terms, kinds, school_ids, limit):
+    entries = SearchEntry.objects.all()
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(keywords__icontains=term))
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    if school_ids is not None:
+        entries = entries.filter(school_id__in=school_ids)
+    return list(entries.order_by('title', 'id').values_list('id', flat=True)[:limit])
+
+
+# Superadmin detail page of each kind
+DETAIL_URLS = {
+    SearchEntry.SCHOOL:  'view_school',
+    SearchEntry.STUDENT: 'view_student',
+    SearchEntry.TEACHER: 'view_teacher',
+    SearchEntry.PARENT:  'view_parent',
+}
+
+
+def as_dict(entry, with_url=False):
+    """A search result as the /search/ API returns it."""
+    result = {
+        'kind':     entry.kind,
+        'id':       entry.object_id,
+        'title':    entry.title,
+        'subtitle': entry.subtitle,
+    }
+    if entry.kind == SearchEntry.SCHOOL:
+        result['has_admin'] = entry.has_admin
+    if with_url:
+        result['url'] = reverse(DETAIL_URLS[entry.kind], args=[entry.object_id])
+    return result
+
+
+# ─────────────────────────────────────────────
+# Backfill
+# ─────────────────────────────────────────────
+
+def rebuild_search_index(batch_size=2000):
+    """
+    Replaces every entry with ones built from the tables, in one
+    transaction — searches keep seeing the old index until it commits.
+    Returns the count.
+    """
+    from django.apps import apps
+
+    total = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for label, build in ENTRY_BUILDERS.items():
+            entries = []
+            for obj in apps.get_model(label).objects.all().iterator(chunk_size=batch_size):
+                entries.append(build(obj))
+                if len(entries) >= batch_size:
+                    SearchEntry.objects.bulk_create(entries)
+                    total += len(entries)
+                    entries = []
+            SearchEntry.objects.bulk_create(entries)
+            total += len(entries)
+    return total
@@ -0,0 +1,49 @@
+"""
+Signal handlers for the accounts app.
+"""
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .activity import class_events, record_events, school_events, student_events, teacher_events
+from .search import ENTRY_BUILDERS, index_object, unindex_object
+
+
+# ─────────────────────────────────────────────
+# Activity feeds — new schools, teachers, students, classes
+# ─────────────────────────────────────────────
+
+CREATED_EVENTS = {
+    'schools.School':  school_events,
+    'teacher.Teacher': teacher_events,
+    'student.Student': student_events,
+    'schools.Class':   class_events,
+}
+
+
+def record_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_events(CREATED_EVENTS[sender._meta.label](instance))
+
+
+for _label in CREATED_EVENTS:
+    post_save.connect(record_created, sender=apps.get_model(_label), dispatch_uid=f'activity_created_{_label}')
+
+
+# ─────────────────────────────────────────────
+# Search index — one SearchEntry per school, student, teacher, parent
+# ─────────────────────────────────────────────
+
+def index_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(instance)
+
+
+def unindex_deleted(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+for _label in ENTRY_BUILDERS:
+    _model = apps.get_model(_label)
+    post_save.connect(index_saved, sender=_model, dispatch_uid=f'search_index_{_label}')
+    post_delete.connect(unindex_deleted, sender=_model, dispatch_uid=f'search_unindex_{_label}')
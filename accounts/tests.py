@@ -1,3 +1,154 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from importlib import import_module
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from parent.models import Parent
+from school_admin.models import SchoolAdmin
+from schools.models import School
+from student.models import Student
+from teacher.models import Teacher
+
+from .models import OutboxEmail, SearchEntry
+from .outbox import purge_finished, queue_email, send_once
+from .search import rebuild_search_index, search
+
+
+User = get_user_model()
+
+
+class GlobalSearchTests(TestCase):
+    """The search index follows saves and deletes and matches word prefixes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.greenwood = School.objects.create(
+            school_name='Greenwood High', school_code='GWH01', city='Pune', state='MH',
+            pincode='411001', school_email='office@greenwood.edu',
+        )
+        cls.riverdale = School.objects.create(
+            school_name='Riverdale Academy', school_code='RDA02', city='Greenfield', state='MH',
+            pincode='411002',
+        )
+        cls.student = Student.objects.create(
+            first_name='Priya', last_name='Sharma', gender='female', date_of_birth=date(2012, 1, 1),
+            student_class='8', division='A', roll_number='1', academic_year='2024-2025',
+            gr_number='GR1042', school_board='CBSE', school_email='priya.sharma@example.com',
+            enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+            emergency_mobile='9000000002', school=cls.greenwood,
+        )
+        admin_user = User.objects.create_user(username='admin', password='pw', role='SCHOOL_ADMIN')
+        SchoolAdmin.objects.create(
+            user=admin_user, full_name='Admin', email='admin@example.com', phone='9000000003',
+            gender='male', school=cls.greenwood, is_active=True,
+        )
+
+    def titles(self, query, **kwargs):
+        return [entry.title for entry in search(query, **kwargs)]
+
+    def test_prefix_matches_names_codes_gr_numbers_and_emails(self):
+        self.assertEqual(self.titles('pri sha'), ['Priya Sharma'])
+        self.assertEqual(self.titles('gr104'), ['Priya Sharma'])
+        self.assertEqual(self.titles('priya.sharma@exa'), ['Priya Sharma'])
+        self.assertEqual(self.titles('gwh'), ['Greenwood High'])
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.titles('green', kinds=['school']), ['Greenwood High', 'Riverdale Academy'])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.student.first_name = 'Anita'
+        self.student.save()
+        self.assertEqual(self.titles('anita'), ['Anita Sharma'])
+        self.assertEqual(self.titles('gr104'), ['Anita Sharma'])
+
+        self.student.delete()
+        self.assertEqual(self.titles('anita'), [])
+
+    def test_has_admin_in_one_query(self):
+        with self.assertNumQueries(2):   # match, entries + has_admin
+            results = search('green', kinds=['school'])
+        self.assertEqual([entry.has_admin for entry in results], [True, False])
+
+    def test_school_admin_only_searches_own_school(self):
+        other = Student.objects.create(
+            first_name='Priya', last_name='Rao', gender='female', date_of_birth=date(2012, 1, 1),
+            student_class='8', division='A', roll_number='2', academic_year='2024-2025',
+            gr_number='GR2001', school_board='CBSE', school_email='priya.rao@example.com',
+            enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+            emergency_mobile='9000000004', school=self.riverdale,
+        )
+        self.client.force_login(User.objects.get(username='admin'))
+        response = self.client.get(reverse('global_search'), {'q': 'priya'})
+        self.assertEqual([r['id'] for r in response.json()['results']], [self.student.id])
+        self.assertNotIn(other.id, [r['id'] for r in response.json()['results']])
+
+
+    def test_backfill_migration_matches_live_builders(self):
+        teacher_user = User.objects.create_user(username='teacher', password='pw', role='THINKING_COACH')
+        Teacher.objects.create(
+            user=teacher_user, school=self.greenwood, employee_id='EMP7', full_name='Meera Joshi',
+            designation='head-teacher', date_of_birth=date(1990, 1, 1), joining_date=date(2020, 1, 1),
+            official_email='meera@example.com', mobile_number='9000000005',
+        )
+        Parent.objects.create(
+            user=User.objects.create_user(username='parent', password='pw', role='PARENT'),
+            full_name='Ravi Sharma', email='ravi@example.com', mobile_number='9000000006',
+        )
+        fields = ['kind', 'object_id', 'title', 'subtitle', 'keywords', 'school_id']
+
+        rebuild_search_index()
+        live = list(SearchEntry.objects.order_by('kind', 'object_id').values_list(*fields))
+
+        migration = import_module('accounts.migrations.0007_backfill_search_entries')
+        state = MigrationExecutor(connection).loader.project_state(('accounts', '0007_backfill_search_entries'))
+        migration.backfill_search_entries(state.apps, None)
+        backfilled = list(SearchEntry.objects.order_by('kind', 'object_id').values_list(*fields))
+
+        self.assertEqual(len(live), 5)
+        self.assertEqual(backfilled, live)
+
+class RejectingBackend(BaseEmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionRefusedError('SMTP server refused the connection')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxRetentionTests(TestCase):
+    """Temporary passwords do not outlive delivery (or giving up on it)."""
+
+    def queue(self):
+        return queue_email('Welcome', 'Login: a@example.com\nPassword: s3cret', ['a@example.com'])
+
+    def test_body_is_blanked_once_sent(self):
+        email = self.queue()
+        self.assertEqual(send_once('sender'), (1, 0))
+
+        self.assertIn('s3cret', mail.outbox[0].body)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), (OutboxEmail.SENT, ''))
+
+    def test_body_is_blanked_when_failed_for_good(self):
+        email = self.queue()
+        OutboxEmail.objects.filter(pk=email.pk).update(attempts=email.max_attempts - 1)
+
+        self.assertEqual(send_once('sender', connection=RejectingBackend()), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), (OutboxEmail.FAILED, ''))
+
+    def test_purge_drops_old_sent_and_failed_messages(self):
+        old = timezone.now() - timedelta(days=30)
+        sent, failed, pending = self.queue(), self.queue(), self.queue()
+        OutboxEmail.objects.filter(pk=sent.pk).update(status=OutboxEmail.SENT, sent_at=old)
+        OutboxEmail.objects.filter(pk=failed.pk).update(status=OutboxEmail.FAILED, send_after=old)
+        OutboxEmail.objects.filter(pk=pending.pk).update(send_after=old)
+
+        self.assertEqual(purge_finished(timedelta(days=7)), 2)
+        self.assertEqual(list(OutboxEmail.objects.values_list('pk', flat=True)), [pending.pk])
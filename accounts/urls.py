@@ -4,4 +4,5 @@ from . import views
 
 urlpatterns = [
     path('login/', views.login_view, name='login'),
+    path('search/', views.global_search, name='global_search'),
 ]
\ No newline at end of file
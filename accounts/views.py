@@ -1,6 +1,8 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login
+from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
 
 # Create your views here.
 
@@ -38,4 +40,52 @@ def login_view(request):
             messages.error(request, "Invalid credentials")
             return redirect('login')
 
-    return render(request, 'accounts/login.html')    
\ No newline at end of file
+    return render(request, 'accounts/login.html')    
+
+
+# Kinds each role may search; school-bound roles only see their schools
+SEARCH_KINDS = {
+    'SUPER_ADMIN':         None,
+    'PROGRAM_COORDINATOR': ['school', 'student', 'teacher'],
+    'SCHOOL_ADMIN':        ['student', 'teacher'],
+}
+MAX_SEARCH_LIMIT = 50
+
+
+@login_required
+def global_search(request):
+    """
+    Search API across schools, students, teachers and parents, best
+    matches first:  GET /search/?q=<words>&kind=<kind>&limit=<n>
+    Every word is matched as a prefix of a name, code, GR number, email, …
+    """
+    from schools.models import School
+    from .search import SEARCH_LIMIT, as_dict, search
+
+    role = request.user.role
+    if role not in SEARCH_KINDS:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    kinds      = SEARCH_KINDS[role]
+    school_ids = None
+    if role == 'PROGRAM_COORDINATOR':
+        school_ids = list(School.objects.filter(program_coordinators__user=request.user).values_list('id', flat=True))
+    elif role == 'SCHOOL_ADMIN':
+        school_ids = list(School.objects.filter(
+            school_admins__user=request.user, school_admins__is_active=True,
+        ).values_list('id', flat=True))
+
+    kind = request.GET.get('kind')
+    if kind:
+        if kinds is not None and kind not in kinds:
+            return JsonResponse({'results': []})
+        kinds = [kind]
+
+    try:
+        limit = min(max(int(request.GET.get('limit', SEARCH_LIMIT)), 1), MAX_SEARCH_LIMIT)
+    except ValueError:
+        limit = SEARCH_LIMIT
+
+    entries = search(request.GET.get('q', ''), kinds=kinds, school_ids=school_ids, limit=limit)
+    with_url = role == 'SUPER_ADMIN'
+    return JsonResponse({'results': [as_dict(entry, with_url=with_url) for entry in entries]})
@@ -0,0 +1,176 @@
+"""
+Per-Assessment Score Statistics
+===============================
+Keeps AssessmentStat rows (sum, count, 1–10 histogram per assessment,
+school and competency) in step with ScoreEntry:
+
+  - competencies.signals feeds every save / delete through apply_score_deltas
+  - bulk writes that skip signals (api_save_scores) call it directly
+  - rebuild_assessment_stats() recomputes from ScoreEntry (used when a
+    mapping's competency changes, and by `manage.py rebuild_assessment_stats`)
+
+Deltas are applied with F() expressions, so concurrent writers in
+different processes never lose an update.
+"""
+
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import AssessmentCompetency, AssessmentStat, ScoreEntry
+
+from student.models import Student
+
+
+def _bucket(score):
+    return f'bucket_{score}'
+
+
+def apply_score_deltas(changes):
+    """
+    changes: iterable of (student_id, assessment_competency_id, old_score,
+    new_score); None means "no score" on either side.
+    One lookup per side (students, mappings) + one UPDATE per touched
+    (assessment, school, competency).
+    """
+    changes = [c for c in changes if c[2] != c[3]]
+    if not changes:
+        return
+
+    school_of  = dict(
+        Student.objects.filter(id__in={c[0] for c in changes}).values_list('id', 'school_id')
+    )
+    mapping_of = {
+        ac_id: (assessment_id, competency_id)
+        for ac_id, assessment_id, competency_id in
+        AssessmentCompetency.objects
+        .filter(id__in={c[1] for c in changes})
+        .values_list('id', 'assessment_id', 'competency_id')
+    }
+
+    # { (assessment_id, school_id, competency_id): { field: delta } }
+    deltas = defaultdict(lambda: defaultdict(int))
+    for student_id, ac_id, old, new in changes:
+        if ac_id not in mapping_of or student_id not in school_of:
+            continue
+        assessment_id, competency_id = mapping_of[ac_id]
+        delta = deltas[(assessment_id, school_of[student_id], competency_id)]
+        if old is not None:
+            delta['score_sum']   -= old
+            delta['score_count'] -= 1
+            delta[_bucket(old)]  -= 1
+        if new is not None:
+            delta['score_sum']   += new
+            delta['score_count'] += 1
+            delta[_bucket(new)]  += 1
+
+    for (assessment_id, school_id, competency_id), delta in deltas.items():
+        updates = {field: F(field) + n for field, n in delta.items() if n}
+        if not updates:
+            continue
+
+        updated = AssessmentStat.objects.filter(
+            assessment_id=assessment_id, school_id=school_id, competency_id=competency_id
+        ).update(updated_at=timezone.now(), **updates)
+
+        # No row yet: build it from ScoreEntry (already includes this write).
+        # Pure removals never create rows — they may come from a cascade
+        # that is deleting the assessment itself.
+        if not updated and delta['score_count'] > 0:
+            _create_stat(assessment_id, school_id, competency_id)
+
+
+def _create_stat(assessment_id, school_id, competency_id):
+    counts = (
+        ScoreEntry.objects
+        .filter(
+            assessment_competency__assessment_id=assessment_id,
+            assessment_competency__competency_id=competency_id,
+            student__school_id=school_id,
+            score__isnull=False,
+        )
+        .values_list('score')
+        .annotate(n=Count('id'))
+    )
+    stat = AssessmentStat(assessment_id=assessment_id, school_id=school_id, competency_id=competency_id)
+    for score, n in counts:
+        _add(stat, score, n)
+
+    try:
+        with transaction.atomic():
+            stat.save()
+    except IntegrityError:
+        pass   # created concurrently, from the same source of truth
+
+
+def _add(stat, score, n):
+    stat.score_sum   += score * n
+    stat.score_count += n
+    setattr(stat, _bucket(score), getattr(stat, _bucket(score)) + n)
+
+
+def rebuild_assessment_stats(assessment_ids=None):
+    """
+    Recomputes AssessmentStat from ScoreEntry for the given assessments
+    (all if None) in one aggregate query. Returns the number of rows.
+    """
+    entries = ScoreEntry.objects.filter(score__isnull=False)
+    stats   = AssessmentStat.objects.all()
+    if assessment_ids is not None:
+        entries = entries.filter(assessment_competency__assessment_id__in=assessment_ids)
+        stats   = stats.filter(assessment_id__in=assessment_ids)
+
+    rows = {}
+    for assessment_id, school_id, competency_id, score, n in (
+        entries
+        .values_list(
+            'assessment_competency__assessment_id',
+            'student__school_id',
+            'assessment_competency__competency_id',
+            'score',
+        )
+        .annotate(n=Count('id'))
+    ):
+        key  = (assessment_id, school_id, competency_id)
+        stat = rows.get(key)
+        if stat is None:
+            stat = rows[key] = AssessmentStat(
+                assessment_id=assessment_id, school_id=school_id, competency_id=competency_id
+            )
+        _add(stat, score, n)
+
+    with transaction.atomic():
+        stats.delete()
+        AssessmentStat.objects.bulk_create(rows.values())
+    return len(rows)
+
+
+def assessment_summary(assessment_id, school=None):
+    """
+    Totals over an assessment's competencies (one school, or all schools):
+    { count, sum, class_avg, min, max, histogram } — reads only the
+    AssessmentStat rows of that assessment.
+    """
+    stats = AssessmentStat.objects.filter(assessment_id=assessment_id)
+    if school is not None:
+        stats = stats.filter(school=school)
+
+    total     = AssessmentStat()
+    histogram = [0] * 10
+    for stat in stats:
+        total.score_sum   += stat.score_sum
+        total.score_count += stat.score_count
+        histogram = [a + b for a, b in zip(histogram, stat.histogram)]
+    for score, n in enumerate(histogram, 1):
+        setattr(total, _bucket(score), n)
+
+    return {
+        'count':     total.score_count,
+        'sum':       total.score_sum,
+        'class_avg': round(total.average, 1) if total.average is not None else None,
+        'min':       total.min_score,
+        'max':       total.max_score,
+        'histogram': histogram,
+    }
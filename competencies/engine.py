@@ -5,10 +5,16 @@ Implements the full scoring + profiling logic as documented in SKILL_PASSPORT_LO
 """
 
 from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
 from .models import (
     Project, Assessment, AssessmentCompetency,
-    ScoreEntry, Profile, ProjectReport
+    ScoreEntry, Profile, ProjectReport, AnnualPassport
 )
+from .profile_matrix import get_profile_matrix
 
 # --- Constants ---
 SECONDARY_COMPETENCY_WEIGHT = 0.10
@@ -16,6 +22,11 @@ MIN_PRIMARY_FOR_UNLOCK      = 2
 TOP_PROFILES_COUNT          = 3
 TOP_COMPETENCIES_COUNT      = 5
 
+REPORT_FIELDS = [
+    'top_3_profiles', 'top_5_competencies', 'skills_to_work_on',
+    'all_competency_scores', 'is_outdated', 'generated_at',
+]
+
 
 # ─────────────────────────────────────────────
 # STEP 1: Collect final competency scores
@@ -46,7 +57,7 @@ def _scores_for_single_project(student, project):
     """
     For a single project (or plugin), collect all ScoreEntry records and
     return { competency_id: average_score } (averaging if same competency
-    appears in multiple assessments).
+    appears in multiple assessments), in competency id order.
     """
     entries = (
         ScoreEntry.objects
@@ -55,29 +66,63 @@ def _scores_for_single_project(student, project):
             assessment_competency__assessment__project=project,
             score__isnull=False
         )
-        .select_related('assessment_competency__competency')
+        .order_by('assessment_competency__competency_id')
+        .values_list('assessment_competency__competency_id', 'score')
     )
 
     scores_by_comp = defaultdict(list)
-    for entry in entries:
-        comp_id = entry.assessment_competency.competency_id
-        scores_by_comp[comp_id].append(entry.score)
+    for comp_id, score in entries:
+        scores_by_comp[comp_id].append(score)
+
+    return _average_scores(scores_by_comp)
+
 
+def _average_scores(scores_by_comp):
+    """{ competency_id: [scores] } → { competency_id: average_score }"""
     return {
         comp_id: sum(scores) / len(scores)
         for comp_id, scores in scores_by_comp.items()
     }
 
 
+def _cohort_scores_by_project(student_ids, project_ids):
+    """
+    One query for every score of a cohort across several projects.
+    Returns { student_id: { project_id: { competency_id: [scores] } } },
+    competencies in id order — the same order _scores_for_single_project
+    gives, so ties rank alike in single and batch reports.
+    """
+    entries = (
+        ScoreEntry.objects
+        .filter(
+            student_id__in=student_ids,
+            assessment_competency__assessment__project_id__in=project_ids,
+            score__isnull=False
+        )
+        .order_by('assessment_competency__competency_id')
+        .values_list(
+            'student_id',
+            'assessment_competency__assessment__project_id',
+            'assessment_competency__competency_id',
+            'score',
+        )
+    )
+
+    grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for student_id, project_id, comp_id, score in entries:
+        grouped[student_id][project_id][comp_id].append(score)
+    return grouped
+
+
 def _merge_scores(project_scores, plugin_scores):
     """
-    Merge project + plugin scores:
+    Merge project + plugin scores (in competency id order):
       - Both have it → average
       - Only one has it → use that
     """
     all_comp_ids = set(project_scores) | set(plugin_scores)
     merged = {}
-    for comp_id in all_comp_ids:
+    for comp_id in sorted(all_comp_ids):
         in_project = comp_id in project_scores
         in_plugin  = comp_id in plugin_scores
         if in_project and in_plugin:
@@ -93,9 +138,11 @@ def _merge_scores(project_scores, plugin_scores):
 # STEP 2–4: Profiling Engine
 # ─────────────────────────────────────────────
 
-def run_profiling_engine(competency_scores):
+def run_profiling_engine(competency_scores, profiles=None):
     """
     competency_scores: { competency_id: score }
+    profiles: optional CompiledProfile sequence (see profile_matrix) so batch
+              callers score a whole cohort against one matrix snapshot.
 
     Returns list of dicts sorted by score desc:
     [
@@ -107,11 +154,11 @@ def run_profiling_engine(competency_scores):
       },
       ...
     ]
-    Only includes unlocked profiles.
+    Only includes unlocked profiles. Pure in-memory once the compiled
+    profile matrix is warm — no DB queries.
     """
-    profiles = Profile.objects.prefetch_related(
-        'primary_competencies', 'secondary_competencies'
-    ).all()
+    if profiles is None:
+        profiles = get_profile_matrix().profiles
 
     results = []
     for profile in profiles:
@@ -125,26 +172,24 @@ def run_profiling_engine(competency_scores):
 
 def _calculate_profile_score(profile, competency_scores):
     """
+    profile: CompiledProfile
     Returns profile score dict or None if profile is locked.
     """
-    primary_comps   = list(profile.primary_competencies.all())
-    secondary_comps = list(profile.secondary_competencies.all())
-
     # Step 1: Unlock check — need >= MIN_PRIMARY_FOR_UNLOCK assessed
-    assessed_primaries = [c for c in primary_comps if c.id in competency_scores]
+    assessed_primaries = [cid for cid in profile.primary_ids if cid in competency_scores]
     if len(assessed_primaries) < MIN_PRIMARY_FOR_UNLOCK:
         return None
 
     # Step 2: Weightage
-    secondary_total = len(secondary_comps) * SECONDARY_COMPETENCY_WEIGHT
+    secondary_total = len(profile.secondary_ids) * SECONDARY_COMPETENCY_WEIGHT
     remaining       = 1.0 - secondary_total
     primary_weight  = remaining / len(assessed_primaries) if assessed_primaries else 0
 
     weightage = {}
-    for c in assessed_primaries:
-        weightage[c.id] = primary_weight
-    for c in secondary_comps:
-        weightage[c.id] = SECONDARY_COMPETENCY_WEIGHT
+    for cid in assessed_primaries:
+        weightage[cid] = primary_weight
+    for cid in profile.secondary_ids:
+        weightage[cid] = SECONDARY_COMPETENCY_WEIGHT
 
     # Step 3: Profile score
     score = 0.0
@@ -177,15 +222,24 @@ def build_report_data(student, project):
     if not competency_scores:
         return None
 
-    profile_results = run_profiling_engine(competency_scores)
+    comp_objs = Competency.objects.in_bulk(list(competency_scores.keys()))
+    return _build_report_payload(competency_scores, comp_objs)
+
+
+def _build_report_payload(competency_scores, comp_objs, profile_results=None):
+    """
+    In-memory part of build_report_data: profiling + ranking for one
+    student's { competency_id: score }. comp_objs is { id: Competency }.
+    profile_results: run_profiling_engine output if the caller already has
+    it (batch callers profile a whole cohort at once).
+    """
+    if profile_results is None:
+        profile_results = run_profiling_engine(competency_scores)
 
     # Top 3 profiles
     top_3 = profile_results[:TOP_PROFILES_COUNT]
 
     # All competency scores with names
-    comp_ids  = list(competency_scores.keys())
-    comp_objs = {c.id: c for c in Competency.objects.filter(id__in=comp_ids)}
-
     all_comp_scores = [
         {
             'competency_id':   comp_id,
@@ -243,10 +297,135 @@ def generate_project_report(student, project):
     return report, None
 
 
+def generate_project_reports_bulk(students, project):
+    """
+    Batch version of generate_project_report for a whole cohort
+    (e.g. a class) and one project.
+
+    Runs a constant number of queries regardless of cohort size:
+    one for the plugin, one for every score of the cohort (project +
+    plugin), one set for profiles, one for competencies, one for
+    existing reports, then bulk_update / bulk_create.
+
+    students: iterable of Student objects or student ids.
+    Returns (reports, errors) where errors is { student_id: message }.
+    """
+    from .models import Competency
+
+    if project.project_type == 'Plug In' and project.linked_project:
+        project = project.linked_project
+
+    student_ids = [getattr(s, 'pk', s) for s in students]
+    if not student_ids:
+        return [], {}
+
+    plugin      = project.plugins.filter(status='Active').first()
+    project_ids = [project.id] + ([plugin.id] if plugin else [])
+
+    grouped = _cohort_scores_by_project(student_ids, project_ids)
+
+    scores_by_student = {}
+    for student_id, by_project in grouped.items():
+        project_scores = _average_scores(by_project.get(project.id, {}))
+        if plugin:
+            plugin_scores = _average_scores(by_project.get(plugin.id, {}))
+            project_scores = _merge_scores(project_scores, plugin_scores)
+        scores_by_student[student_id] = project_scores
+
+    top_profiles = _cohort_top_profiles(scores_by_student)
+    comp_ids     = {c for scores in scores_by_student.values() for c in scores}
+    comp_objs    = Competency.objects.in_bulk(list(comp_ids))
+
+    existing = {
+        r.student_id: r
+        for r in ProjectReport.objects.filter(project=project, student_id__in=student_ids)
+    }
+
+    now       = timezone.now()
+    to_create = []
+    to_update = []
+    errors    = {}
+    for student_id in student_ids:
+        competency_scores = scores_by_student.get(student_id)
+        if not competency_scores:
+            errors[student_id] = "No scores found for this student in this project."
+            continue
+
+        data   = _build_report_payload(competency_scores, comp_objs, top_profiles[student_id])
+        report = existing.get(student_id)
+        if report is None:
+            report = ProjectReport(student_id=student_id, project=project)
+            to_create.append(report)
+        else:
+            to_update.append(report)
+
+        report.top_3_profiles        = data['top_3_profiles']
+        report.top_5_competencies    = data['top_5_competencies']
+        report.skills_to_work_on     = data['skills_to_work_on']
+        report.all_competency_scores = data['all_competency_scores']
+        report.is_outdated           = False
+        report.generated_at          = now   # bulk_update skips auto_now
+
+    with transaction.atomic():
+        if to_update:
+            ProjectReport.objects.bulk_update(to_update, REPORT_FIELDS)
+        if to_create:
+            ProjectReport.objects.bulk_create(to_create)
+
+    return to_update + to_create, errors
+
+
+def _cohort_top_profiles(scores_by_student):
+    """
+    { student_id: top TOP_PROFILES_COUNT profile results } for a cohort,
+    against one profile matrix snapshot — in a few matrix products when
+    NumPy is installed (see vectorized), else student by student.
+    """
+    from .vectorized import np, top_profiles_bulk
+
+    matrix = get_profile_matrix()
+    if np is not None and scores_by_student:
+        return top_profiles_bulk(scores_by_student, TOP_PROFILES_COUNT, matrix)
+    return {
+        student_id: run_profiling_engine(scores, matrix.profiles)[:TOP_PROFILES_COUNT]
+        for student_id, scores in scores_by_student.items()
+    }
+
+
 # ─────────────────────────────────────────────
 # Annual Skill Passport
 # ─────────────────────────────────────────────
 
+def _annual_project_plan():
+    """
+    The projects that feed the Annual Passport, latest first:
+    [ (project_id, plugin_id or None) ] for every Active project with a
+    sequence_number, ordered by -sequence_number (newest first within one
+    sequence number). plugin_id is the project's first Active Plug-In
+    (newest first, as project.plugins.first() picks).
+
+    One query over Project.
+    """
+    rows = list(
+        Project.objects
+        .filter(status='Active')
+        .order_by('-sequence_number', '-created_at')
+        .values_list('id', 'sequence_number', 'linked_project_id', 'created_at')
+    )
+
+    plugin_of = {}
+    plugins   = [r for r in rows if r[2] is not None]
+    plugins.sort(key=lambda r: r[3], reverse=True)
+    for plugin_id, _, parent_id, _ in plugins:
+        plugin_of.setdefault(parent_id, plugin_id)
+
+    return [
+        (project_id, plugin_of.get(project_id))
+        for project_id, sequence_number, _, _ in rows
+        if sequence_number is not None
+    ]
+
+
 def get_annual_passport_scores(student):
     """
     Annual Passport: per competency, take the score from the latest project
@@ -254,21 +433,53 @@ def get_annual_passport_scores(student):
 
     Returns { competency_id: score }
     """
-    # Get all projects with sequence_number, ordered latest first
-    projects = Project.objects.filter(
-        sequence_number__isnull=False,
-        status='Active'
-    ).order_by('-sequence_number')
+    return get_annual_passport_scores_bulk([student]).get(student.pk, {})
+
+
+def get_annual_passport_scores_bulk(students, plan=None):
+    """
+    Annual Passport scores for a whole cohort in two queries (projects +
+    every ScoreEntry of the cohort), instead of walking each project.
+
+    students: iterable of Student objects or student ids.
+    plan: optional _annual_project_plan() result to reuse across batches.
+    Returns { student_id: { competency_id: score } }
+    """
+    student_ids = [getattr(s, 'pk', s) for s in students]
+    if not student_ids:
+        return {}
+
+    if plan is None:
+        plan = _annual_project_plan()
+    project_ids = {pid for pair in plan for pid in pair if pid is not None}
+    grouped     = _cohort_scores_by_project(student_ids, project_ids) if project_ids else {}
+
+    return {
+        student_id: {
+            comp_id: score
+            for comp_id, (score, _) in _annual_sources(grouped.get(student_id, {}), plan).items()
+        }
+        for student_id in student_ids
+    }
 
-    annual_scores = {}
-    for project in projects:
-        scores = get_competency_scores_for_project(student, project)
+
+def _annual_sources(by_project, plan):
+    """
+    by_project: { project_id: { competency_id: [scores] } } for one student
+    Returns { competency_id: (score, source_project_id) }, latest project first.
+    """
+    sources = {}
+    for project_id, plugin_id in plan:
+        # Same rules as get_competency_scores_for_project, per project
+        scores = _average_scores(by_project.get(project_id, {}))
+        if plugin_id is not None:
+            plugin_scores = _average_scores(by_project.get(plugin_id, {}))
+            scores = _merge_scores(scores, plugin_scores)
         for comp_id, score in scores.items():
-            if comp_id not in annual_scores:
+            if comp_id not in sources:
                 # First time we see this competency = latest project (desc order)
-                annual_scores[comp_id] = score
-
-    return annual_scores
+                sources[comp_id] = (score, project_id)
+    return sources
 
 
 def generate_annual_passport(student):
@@ -283,26 +494,160 @@ def generate_annual_passport(student):
     if not competency_scores:
         return None
 
-    profile_results = run_profiling_engine(competency_scores)
-    top_3           = profile_results[:TOP_PROFILES_COUNT]
+    comp_objs = Competency.objects.in_bulk(list(competency_scores.keys()))
+    return _build_report_payload(competency_scores, comp_objs)
 
-    comp_ids  = list(competency_scores.keys())
-    comp_objs = {c.id: c for c in Competency.objects.filter(id__in=comp_ids)}
 
-    all_comp_scores = [
-        {
-            'competency_id':   comp_id,
-            'competency_code': comp_objs[comp_id].code if comp_id in comp_objs else '',
-            'competency_name': comp_objs[comp_id].name if comp_id in comp_objs else '',
-            'score':           round(score, 2),
-        }
-        for comp_id, score in competency_scores.items()
+# ─────────────────────────────────────────────
+# Stored Annual Passport (incremental refresh)
+# ─────────────────────────────────────────────
+
+def mark_annual_passports_dirty(projects_by_student):
+    """
+    Flags stored passports for a refresh because scores changed.
+    projects_by_student: { student_id: {project_id} } — the projects (or
+    plug-ins) whose scores changed for each student. Two queries.
+    """
+    passports = list(
+        AnnualPassport.objects
+        .filter(student_id__in=list(projects_by_student))
+        .only('id', 'student_id', 'is_dirty', 'dirty_project_ids')
+    )
+
+    to_update = []
+    for passport in passports:
+        if passport.is_dirty and not passport.dirty_project_ids:
+            continue   # already waiting for a full rebuild
+        project_ids = projects_by_student[passport.student_id]
+        passport.dirty_project_ids = sorted(set(passport.dirty_project_ids) | set(project_ids))
+        passport.is_dirty          = True
+        to_update.append(passport)
+
+    if to_update:
+        AnnualPassport.objects.bulk_update(to_update, ['is_dirty', 'dirty_project_ids'])
+
+
+def get_annual_passport(student, plan=None):
+    """
+    Returns the student's stored AnnualPassport, refreshing it first if
+    scores or the project plan changed since it was generated.
+    Returns None if the student has no scores at all.
+
+    Clean passport: two queries (project plan + the row).
+    """
+    if plan is None:
+        plan = _annual_project_plan()
+    plan_rows = [list(pair) for pair in plan]
+
+    passport = AnnualPassport.objects.filter(student=student).first()
+    if passport and not passport.is_dirty and passport.project_plan == plan_rows:
+        return passport
+
+    return refresh_annual_passport(student, plan)
+
+
+def refresh_annual_passport(student, plan=None):
+    """
+    Rebuilds the stored passport. If only some projects changed (and the
+    project plan is the same), only the competencies those projects can
+    affect are recomputed; the profile ranking is then re-run.
+    """
+    from .models import Competency
+
+    if plan is None:
+        plan = _annual_project_plan()
+    plan_rows  = [list(pair) for pair in plan]
+    student_id = getattr(student, 'pk', student)
+
+    with transaction.atomic():
+        passport = AnnualPassport.objects.select_for_update().filter(student_id=student_id).first()
+
+        if passport and passport.is_dirty and passport.dirty_project_ids and passport.project_plan == plan_rows:
+            sources = _incremental_annual_sources(student_id, passport, plan)
+        else:
+            project_ids = {pid for pair in plan for pid in pair if pid is not None}
+            grouped     = _cohort_scores_by_project([student_id], project_ids) if project_ids else {}
+            sources     = _annual_sources(grouped.get(student_id, {}), plan)
+
+        if passport is None:
+            if not sources:
+                return None
+            passport = AnnualPassport(student_id=student_id)
+
+        competency_scores = {comp_id: score for comp_id, (score, _) in sources.items()}
+        comp_objs         = Competency.objects.in_bulk(list(competency_scores.keys()))
+        data              = _build_report_payload(competency_scores, comp_objs)
+
+        passport.competency_sources    = [[c, score, src] for c, (score, src) in sources.items()]
+        passport.project_plan          = plan_rows
+        passport.top_3_profiles        = data['top_3_profiles']
+        passport.top_5_competencies    = data['top_5_competencies']
+        passport.skills_to_work_on     = data['skills_to_work_on']
+        passport.all_competency_scores = data['all_competency_scores']
+        passport.is_dirty              = False
+        passport.dirty_project_ids     = []
+        passport.save()
+
+    return passport
+
+
+def refresh_annual_passports(students):
+    """Refreshes every stale passport in a cohort, sharing one project plan."""
+    plan = _annual_project_plan()
+    return [p for p in (get_annual_passport(s, plan) for s in students) if p is not None]
+
+
+def _incremental_annual_sources(student_id, passport, plan):
+    """
+    Recomputes only what the dirty projects can change:
+      - competencies whose source project is dirty → rebuilt from every project
+      - any other competency → a dirty project now scoring it wins only if
+        it is newer than the stored source
+    """
+    rank   = {project_id: i for i, (project_id, _) in enumerate(plan)}
+    dirty  = set(passport.dirty_project_ids)
+    stored = {c: (score, src) for c, score, src in passport.competency_sources}
+
+    affected = [
+        (project_id, plugin_id) for project_id, plugin_id in plan
+        if project_id in dirty or plugin_id in dirty
     ]
-    all_comp_scores.sort(key=lambda x: x['score'], reverse=True)
+    if not affected:
+        return stored
 
-    return {
-        'top_3_profiles':        top_3,
-        'top_5_competencies':    all_comp_scores[:TOP_COMPETENCIES_COUNT],
-        'skills_to_work_on':     sorted(all_comp_scores, key=lambda x: x['score'])[:3],
-        'all_competency_scores': all_comp_scores,
-    }
+    affected_projects = {project_id for project_id, _ in affected}
+    affected_ids      = {pid for pair in affected for pid in pair if pid is not None}
+    all_ids           = {pid for pair in plan for pid in pair if pid is not None}
+    stale             = {c for c, (_, src) in stored.items() if src in affected_projects}
+
+    entries = (
+        ScoreEntry.objects
+        .filter(
+            student_id=student_id,
+            assessment_competency__assessment__project_id__in=all_ids,
+            score__isnull=False
+        )
+        .filter(
+            Q(assessment_competency__competency_id__in=stale) |
+            Q(assessment_competency__assessment__project_id__in=affected_ids)
+        )
+        .values_list(
+            'assessment_competency__assessment__project_id',
+            'assessment_competency__competency_id',
+            'score',
+        )
+    )
+
+    by_project = defaultdict(lambda: defaultdict(list))
+    for project_id, comp_id, score in entries:
+        by_project[project_id][comp_id].append(score)
+    fresh = _annual_sources(by_project, plan)
+
+    sources = {c: value for c, value in stored.items() if c not in stale}
+    for comp_id, (score, src) in fresh.items():
+        current = sources.get(comp_id)
+        if current is None or rank[src] < rank[current[1]]:
+            sources[comp_id] = (score, src)
+
+    # Same order as a full rebuild: latest project first, then competency id
+    return dict(sorted(sources.items(), key=lambda item: (rank[item[1][1]], item[0])))
@@ -0,0 +1,221 @@
+"""
+Report Generation Job Queue
+===========================
+A small queue on top of the ReportJob table, so report generation runs
+outside the teacher's HTTP request. No Redis or broker needed — it works
+on the SQLite deployment and in tests.
+
+  enqueue_report_jobs()  — one Pending job per (student, project); a pair
+                           that is already waiting is not queued twice
+  claim_report_jobs()    — a worker atomically takes a batch of due jobs
+  run_report_jobs()      — generates the batch with generate_project_reports_bulk,
+                           one call per project; failures are retried with backoff
+  report_job_statuses()  — status polling for the UI
+
+Run one or more workers with `manage.py report_worker`; each claim is a
+conditional UPDATE, so workers in separate processes never share a job.
+"""
+
+import os
+import socket
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from .models import ReportJob
+
+
+RETRY_BASE_DELAY = timedelta(seconds=30)   # doubled on every retry
+STALE_AFTER      = timedelta(minutes=10)   # Running longer than this → worker died
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ─────────────────────────────────────────────
+# Enqueue
+# ─────────────────────────────────────────────
+
+def enqueue_report_jobs(students, project):
+    """
+    Queues report generation for a cohort and one project.
+
+    students: iterable of Student objects or student ids.
+    Returns the Pending jobs for these students (existing ones included).
+    """
+    # Reports live on the parent project, as in generate_project_report
+    if project.project_type == 'Plug In' and project.linked_project_id:
+        project = project.linked_project
+
+    student_ids = [getattr(s, 'pk', s) for s in students]
+    if not student_ids:
+        return []
+
+    ReportJob.objects.bulk_create(
+        [ReportJob(student_id=sid, project=project) for sid in student_ids],
+        ignore_conflicts=True,
+    )
+    return list(
+        ReportJob.objects.filter(
+            project=project, student_id__in=student_ids, status=ReportJob.PENDING
+        )
+    )
+
+
+# ─────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────
+
+def claim_report_jobs(worker, limit=50):
+    """
+    Moves up to `limit` due Pending jobs to Running for this worker and
+    returns them. Safe with several workers: the conditional UPDATE only
+    takes rows that are still Pending.
+    """
+    now = timezone.now()
+    _requeue_stale_jobs(now)
+
+    due_ids = list(
+        ReportJob.objects
+        .filter(status=ReportJob.PENDING, run_after__lte=now)
+        .values_list('id', flat=True)[:limit]
+    )
+    if not due_ids:
+        return []
+
+    token = f'{worker}:{uuid.uuid4().hex[:8]}'
+    ReportJob.objects.filter(id__in=due_ids, status=ReportJob.PENDING).update(
+        status=ReportJob.RUNNING,
+        claimed_by=token,
+        claimed_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(
+        ReportJob.objects
+        .filter(claimed_by=token, status=ReportJob.RUNNING)
+        .select_related('project', 'project__linked_project')
+    )
+
+
+def _requeue_stale_jobs(now):
+    stale = ReportJob.objects.filter(status=ReportJob.RUNNING, claimed_at__lt=now - STALE_AFTER)
+    newer = ReportJob.objects.filter(
+        status=ReportJob.PENDING,
+        student_id=OuterRef('student_id'),
+        project_id=OuterRef('project_id'),
+    )
+    with transaction.atomic():
+        # A newer Pending job already covers these pairs
+        stale.filter(Exists(newer)).delete()
+        # attempts counts claims: a job that keeps killing its worker is given up
+        stale.filter(attempts__gte=F('max_attempts')).update(
+            status=ReportJob.FAILED,
+            error='The worker stopped while generating this report',
+            finished_at=now,
+        )
+        stale.update(status=ReportJob.PENDING, claimed_by='', claimed_at=None)
+
+
+def run_report_jobs(jobs):
+    """
+    Processes claimed jobs, one generate_project_reports_bulk call per
+    project. Returns { status: count }.
+    """
+    from .engine import generate_project_reports_bulk
+
+    by_project = defaultdict(list)
+    for job in jobs:
+        by_project[job.project_id].append(job)
+
+    for project_jobs in by_project.values():
+        project = project_jobs[0].project
+        try:
+            _, errors = generate_project_reports_bulk(
+                [job.student_id for job in project_jobs], project
+            )
+        except Exception as exc:
+            _retry_or_fail(project_jobs, str(exc) or exc.__class__.__name__)
+            continue
+
+        now = timezone.now()
+        for job in project_jobs:
+            error = errors.get(job.student_id)
+            # "No scores" will not fix itself by retrying
+            job.status      = ReportJob.FAILED if error else ReportJob.DONE
+            job.error       = error or ''
+            job.finished_at = now
+        ReportJob.objects.bulk_update(project_jobs, ['status', 'error', 'finished_at'])
+
+    counts = defaultdict(int)
+    for job in jobs:
+        counts[job.status] += 1
+    return dict(counts)
+
+
+def _retry_or_fail(jobs, error):
+    now     = timezone.now()
+    waiting = set(
+        ReportJob.objects
+        .filter(
+            status=ReportJob.PENDING,
+            project_id__in={job.project_id for job in jobs},
+            student_id__in=[job.student_id for job in jobs],
+        )
+        .values_list('student_id', 'project_id')
+    )
+
+    for job in jobs:
+        job.error = error
+        if job.attempts >= job.max_attempts:
+            job.status      = ReportJob.FAILED
+            job.finished_at = now
+        elif (job.student_id, job.project_id) in waiting:
+            # A newer Pending job will regenerate this report anyway
+            job.status      = ReportJob.FAILED
+            job.error       = f'{error} (superseded by a newer job)'
+            job.finished_at = now
+        else:
+            job.status     = ReportJob.PENDING
+            job.claimed_by = ''
+            job.run_after  = now + RETRY_BASE_DELAY * (2 ** (job.attempts - 1))
+
+    ReportJob.objects.bulk_update(jobs, ['status', 'error', 'finished_at', 'claimed_by', 'run_after'])
+
+
+def work_once(worker=None, limit=50):
+    """Claims and runs one batch. Returns the number of jobs processed."""
+    jobs = claim_report_jobs(worker or worker_name(), limit)
+    if jobs:
+        run_report_jobs(jobs)
+    return len(jobs)
+
+
+# ─────────────────────────────────────────────
+# Status polling
+# ─────────────────────────────────────────────
+
+def report_job_statuses(job_ids, school=None):
+    """
+    Returns (jobs, counts) for the UI:
+      jobs   — [ { id, student_id, project_id, status, attempts, error } ]
+      counts — { 'Pending': n, 'Running': n, 'Done': n, 'Failed': n }
+    school limits the jobs to that school's students.
+    """
+    qs = ReportJob.objects.filter(id__in=job_ids)
+    if school is not None:
+        qs = qs.filter(student__school=school)
+
+    jobs = list(
+        qs.order_by('id')
+        .values('id', 'student_id', 'project_id', 'status', 'attempts', 'error')
+    )
+
+    counts = {status: 0 for status, _ in ReportJob.STATUS_CHOICES}
+    for job in jobs:
+        counts[job['status']] += 1
+    return jobs, counts
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from competencies.assessment_stats import rebuild_assessment_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-assessment score statistics (AssessmentStat) from ScoreEntry.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('assessment_ids', nargs='*', type=int,
+                            help='Only these assessments (default: all).')
+
+    def handle(self, *args, **options):
+        rows = rebuild_assessment_stats(options['assessment_ids'] or None)
+        self.stdout.write(f'Rebuilt {rows} statistics row(s).')
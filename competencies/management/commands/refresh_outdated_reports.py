@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from competencies.outdated import refresh_outdated_reports
+
+
+class Command(BaseCommand):
+    help = 'Regenerate outdated Skill Passport project reports in bulk (run from cron, or with --loop as a background worker).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Refresh at most this many reports per pass.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, refreshing every --interval seconds.')
+        parser.add_argument('--interval', type=int, default=60,
+                            help='Seconds between passes with --loop (default 60).')
+
+    def handle(self, *args, **options):
+        while True:
+            refreshed, failed = refresh_outdated_reports(limit=options['limit'])
+            if refreshed or failed:
+                self.stdout.write(f'Refreshed {refreshed} report(s), {failed} without scores.')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
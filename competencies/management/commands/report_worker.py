@@ -0,0 +1,47 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from competencies.jobs import work_once, worker_name
+from competencies.score_sync import RETENTION, purge_score_changes
+
+
+PURGE_INTERVAL = 3600   # seconds between purges of the score change log
+
+
+class Command(BaseCommand):
+    help = 'Process queued report generation jobs (ReportJob). Start several for parallelism.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Jobs claimed per batch (default 50).')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait when the queue is empty (default 2).')
+        parser.add_argument('--keep-hours', type=int, default=int(RETENTION.total_seconds() // 3600),
+                            help='Delete score change log rows older than this '
+                                 f'(default {int(RETENTION.total_seconds() // 3600)}).')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit instead of running forever.')
+
+    def handle(self, *args, **options):
+        worker     = worker_name()
+        keep       = timedelta(hours=options['keep_hours'])
+        last_purge = 0.0
+        self.stdout.write(f'Report worker {worker} started.')
+
+        while True:
+            if time.monotonic() - last_purge >= PURGE_INTERVAL:
+                purged = purge_score_changes(keep)
+                if purged:
+                    self.stdout.write(f'Purged {purged} score change(s).')
+                last_purge = time.monotonic()
+
+            processed = work_once(worker, options['batch_size'])
+            if processed:
+                self.stdout.write(f'Processed {processed} job(s).')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
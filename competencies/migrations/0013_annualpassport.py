@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0012_studentprojectfeedback'),
+        ('student', '0001_move_student_from_superadmin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnualPassport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('competency_sources', models.JSONField(default=list)),
+                ('project_plan', models.JSONField(default=list)),
+                ('top_3_profiles', models.JSONField(default=list)),
+                ('top_5_competencies', models.JSONField(default=list)),
+                ('skills_to_work_on', models.JSONField(default=list)),
+                ('all_competency_scores', models.JSONField(default=list)),
+                ('is_dirty', models.BooleanField(default=True)),
+                ('dirty_project_ids', models.JSONField(default=list)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='annual_passport', to='student.student')),
+            ],
+        ),
+    ]
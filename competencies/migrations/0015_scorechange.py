@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0014_reportjob'),
+        ('student', '0001_move_student_from_superadmin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('assessment', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='competencies.assessment')),
+                ('assessment_competency', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='competencies.assessmentcompetency')),
+                ('student', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='student.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['assessment', 'id'], name='competencie_assessm_1e344c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_stats(apps, schema_editor):
+    ScoreEntry     = apps.get_model('competencies', 'ScoreEntry')
+    AssessmentStat = apps.get_model('competencies', 'AssessmentStat')
+
+    rows = {}
+    for assessment_id, school_id, competency_id, score, n in (
+        ScoreEntry.objects
+        .filter(score__isnull=False)
+        .values_list(
+            'assessment_competency__assessment_id',
+            'student__school_id',
+            'assessment_competency__competency_id',
+            'score',
+        )
+        .annotate(n=Count('id'))
+    ):
+        key  = (assessment_id, school_id, competency_id)
+        stat = rows.get(key)
+        if stat is None:
+            stat = rows[key] = AssessmentStat(
+                assessment_id=assessment_id, school_id=school_id, competency_id=competency_id
+            )
+        stat.score_sum   += score * n
+        stat.score_count += n
+        setattr(stat, f'bucket_{score}', getattr(stat, f'bucket_{score}') + n)
+
+    AssessmentStat.objects.bulk_create(rows.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0015_scorechange'),
+        ('schools', '0003_class'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssessmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_sum', models.IntegerField(default=0)),
+                ('score_count', models.IntegerField(default=0)),
+                ('bucket_1', models.IntegerField(default=0)),
+                ('bucket_2', models.IntegerField(default=0)),
+                ('bucket_3', models.IntegerField(default=0)),
+                ('bucket_4', models.IntegerField(default=0)),
+                ('bucket_5', models.IntegerField(default=0)),
+                ('bucket_6', models.IntegerField(default=0)),
+                ('bucket_7', models.IntegerField(default=0)),
+                ('bucket_8', models.IntegerField(default=0)),
+                ('bucket_9', models.IntegerField(default=0)),
+                ('bucket_10', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assessment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='competencies.assessment')),
+                ('competency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assessment_stats', to='competencies.competency')),
+                ('school', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assessment_stats', to='schools.school')),
+            ],
+            options={
+                'unique_together': {('assessment', 'school', 'competency')},
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0016_assessmentstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectreport',
+            name='refresh_failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0017_projectreport_refresh_failed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileMatrixVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profile Matrix Version',
+            },
+        ),
+    ]
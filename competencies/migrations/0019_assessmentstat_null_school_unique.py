@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:15
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_no_school_stats(apps, schema_editor):
+    """
+    school=NULL rows were never deduplicated; each duplicate was built from
+    ScoreEntry on its own, so recount those groups instead of summing them.
+    """
+    ScoreEntry     = apps.get_model('competencies', 'ScoreEntry')
+    AssessmentStat = apps.get_model('competencies', 'AssessmentStat')
+
+    groups = (
+        AssessmentStat.objects.filter(school__isnull=True)
+        .values_list('assessment_id', 'competency_id')
+        .annotate(n=Count('id')).filter(n__gt=1)
+    )
+    for assessment_id, competency_id, _ in list(groups):
+        AssessmentStat.objects.filter(
+            assessment_id=assessment_id, competency_id=competency_id, school__isnull=True,
+        ).delete()
+        stat = AssessmentStat(assessment_id=assessment_id, competency_id=competency_id)
+        for score, n in (
+            ScoreEntry.objects
+            .filter(
+                assessment_competency__assessment_id=assessment_id,
+                assessment_competency__competency_id=competency_id,
+                student__school__isnull=True,
+                score__isnull=False,
+            )
+            .values_list('score')
+            .annotate(n=Count('id'))
+        ):
+            stat.score_sum   += score * n
+            stat.score_count += n
+            setattr(stat, f'bucket_{score}', getattr(stat, f'bucket_{score}') + n)
+        stat.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencies', '0018_profilematrixversion'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='assessmentstat',
+            unique_together=set(),
+        ),
+        migrations.RunPython(merge_duplicate_no_school_stats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='assessmentstat',
+            constraint=models.UniqueConstraint(condition=models.Q(('school__isnull', False)), fields=('assessment', 'school', 'competency'), name='unique_assessment_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='assessmentstat',
+            constraint=models.UniqueConstraint(condition=models.Q(('school__isnull', True)), fields=('assessment', 'competency'), name='unique_assessment_stat_no_school'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 STAGE_CHOICES = [
@@ -203,6 +204,19 @@ class ScoreEntry(models.Model):
         return f"{self.student} — {self.assessment_competency} — {self.score}"
 
 
+class ProfileMatrixVersion(models.Model):
+    """
+    Version stamp of the compiled profile matrix — one row (pk=1), see
+    competencies.profile_matrix. Bumped whenever a Profile or its
+    competency sets change, so every process recompiles its matrix.
+    """
+    version    = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Profile Matrix Version'
+
+
 class ProjectReport(models.Model):
     student               = models.ForeignKey('student.Student', on_delete=models.CASCADE, related_name='project_reports')
     project               = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='reports')
@@ -212,9 +226,163 @@ class ProjectReport(models.Model):
     all_competency_scores = models.JSONField(default=dict)
     generated_at          = models.DateTimeField(auto_now=True)
     is_outdated           = models.BooleanField(default=False)
+    refresh_failed_at     = models.DateTimeField(null=True, blank=True)   # last failed background refresh
 
     class Meta:
         unique_together = [('student', 'project')]
 
     def __str__(self):
         return f"{self.student} — {self.project} — Report"
+
+
+class AnnualPassport(models.Model):
+    """
+    Stored Annual Skill Passport (one per student) — the annual counterpart
+    of ProjectReport, refreshed incrementally by engine.refresh_annual_passport.
+    """
+    student               = models.OneToOneField('student.Student', on_delete=models.CASCADE, related_name='annual_passport')
+    # [[competency_id, score, source_project_id], ...] latest project first
+    competency_sources    = models.JSONField(default=list)
+    # [[project_id, plugin_id], ...] the project plan these scores were built from
+    project_plan          = models.JSONField(default=list)
+    top_3_profiles        = models.JSONField(default=list)
+    top_5_competencies    = models.JSONField(default=list)
+    skills_to_work_on     = models.JSONField(default=list)
+    all_competency_scores = models.JSONField(default=list)
+    is_dirty              = models.BooleanField(default=True)
+    # Projects (or plug-ins) whose scores changed since the last refresh
+    dirty_project_ids     = models.JSONField(default=list)
+    generated_at          = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.student} — Annual Passport"
+
+
+class ReportJob(models.Model):
+    """
+    DB-backed queue entry: (re)generate one student's ProjectReport.
+    Processed by `manage.py report_worker` — see competencies.jobs.
+    """
+    PENDING = 'Pending'
+    RUNNING = 'Running'
+    DONE    = 'Done'
+    FAILED  = 'Failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE,    'Done'),
+        (FAILED,  'Failed'),
+    ]
+
+    student      = models.ForeignKey('student.Student', on_delete=models.CASCADE, related_name='report_jobs')
+    project      = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='report_jobs')
+    status       = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    error        = models.TextField(blank=True)
+    run_after    = models.DateTimeField(default=timezone.now)
+    claimed_by   = models.CharField(max_length=100, blank=True)
+    claimed_at   = models.DateTimeField(null=True, blank=True)
+    finished_at  = models.DateTimeField(null=True, blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes  = [models.Index(fields=['status', 'run_after'])]
+        constraints = [
+            # Dedupe: at most one waiting job per (student, project)
+            models.UniqueConstraint(
+                fields=['student', 'project'],
+                condition=models.Q(status='Pending'),
+                name='unique_pending_report_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student} — {self.project} — {self.status}"
+
+
+class ScoreChange(models.Model):
+    """
+    Append-only change log of ScoreEntry writes. The auto-increment id is
+    the sync cursor for the score entry grid: a client that has seen up to
+    id N asks only for newer rows of its assessment.
+
+    No DB constraints on the references: rows are written while a cascade
+    may be deleting the assessment / mapping they point at.
+    """
+    assessment            = models.ForeignKey(Assessment, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    assessment_competency = models.ForeignKey(AssessmentCompetency, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    student               = models.ForeignKey('student.Student', on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    score                 = models.PositiveSmallIntegerField(null=True, blank=True)   # None also when deleted
+    changed_at            = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['assessment', 'id'])]
+
+    def __str__(self):
+        return f"#{self.id} — {self.student_id} — {self.assessment_competency_id} — {self.score}"
+
+
+class AssessmentStat(models.Model):
+    """
+    Running aggregate of ScoreEntry scores per (assessment, school,
+    competency), kept up to date on every score write by
+    competencies.assessment_stats — grid headers and dashboards read these
+    rows instead of scanning ScoreEntry.
+
+    Scores are integers 1–10, so the ten buckets are an exact histogram
+    and min / max come straight from it.
+    """
+    assessment  = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name='stats')
+    school      = models.ForeignKey('schools.School', on_delete=models.CASCADE, null=True, blank=True, related_name='assessment_stats')
+    competency  = models.ForeignKey(Competency, on_delete=models.CASCADE, related_name='assessment_stats')
+    score_sum   = models.IntegerField(default=0)
+    score_count = models.IntegerField(default=0)
+    bucket_1    = models.IntegerField(default=0)
+    bucket_2    = models.IntegerField(default=0)
+    bucket_3    = models.IntegerField(default=0)
+    bucket_4    = models.IntegerField(default=0)
+    bucket_5    = models.IntegerField(default=0)
+    bucket_6    = models.IntegerField(default=0)
+    bucket_7    = models.IntegerField(default=0)
+    bucket_8    = models.IntegerField(default=0)
+    bucket_9    = models.IntegerField(default=0)
+    bucket_10   = models.IntegerField(default=0)
+    updated_at  = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # NULLs never collide in a unique index, so students without a
+        # school (school=NULL) need their own constraint
+        constraints = [
+            models.UniqueConstraint(
+                fields=['assessment', 'school', 'competency'],
+                condition=models.Q(school__isnull=False),
+                name='unique_assessment_stat',
+            ),
+            models.UniqueConstraint(
+                fields=['assessment', 'competency'],
+                condition=models.Q(school__isnull=True),
+                name='unique_assessment_stat_no_school',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.assessment} — {self.school} — {self.competency}"
+
+    @property
+    def histogram(self):
+        """[count of 1s, count of 2s, …, count of 10s]"""
+        return [getattr(self, f'bucket_{score}') for score in range(1, 11)]
+
+    @property
+    def average(self):
+        return self.score_sum / self.score_count if self.score_count else None
+
+    @property
+    def min_score(self):
+        return next((score for score, n in enumerate(self.histogram, 1) if n), None)
+
+    @property
+    def max_score(self):
+        return next((score for score, n in reversed(list(enumerate(self.histogram, 1))) if n), None)
@@ -0,0 +1,175 @@
+"""
+Outdated Report Tracking
+========================
+A ProjectReport is a snapshot: once a score behind it changes, the report
+is stale. The write hooks in competencies.signals record which
+(student, project) reports a write touches; everything recorded inside one
+transaction is flushed on commit as a single UPDATE … SET is_outdated.
+The stored AnnualPassport of the same students is marked dirty too.
+
+Writes that bypass model signals (bulk_create, bulk_update, queryset
+update) call mark_scores_changed() directly.
+
+refresh_outdated_reports() — run by `manage.py refresh_outdated_reports` —
+then regenerates stale reports in bulk, one project cohort at a time.
+"""
+
+import threading
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import AssessmentCompetency, Project, ProjectReport
+
+
+_local = threading.local()
+
+
+class _OutdatedBatch:
+    """Everything recorded during one transaction, flushed once on commit."""
+
+    def __init__(self):
+        self.report_pairs      = set()               # (student_id, report_project_id)
+        self.report_projects   = set()               # every report of these projects
+        self.passport_projects = defaultdict(set)    # { student_id: {project_id} }
+        self.ac_projects       = {}                  # { ac_id: (project_id, parent_id) }
+
+    def is_pending(self):
+        return connection.in_atomic_block and any(
+            func == self.flush for _, func, _ in connection.run_on_commit
+        )
+
+    def flush(self):
+        if getattr(_local, 'batch', None) is self:
+            _local.batch = None
+        _mark_outdated(self.report_pairs, self.report_projects, self.passport_projects)
+
+
+def _current_batch():
+    batch = getattr(_local, 'batch', None)
+    if batch is None or not batch.is_pending():
+        batch = _OutdatedBatch()
+        _local.batch = batch
+        if connection.in_atomic_block:
+            transaction.on_commit(batch.flush)
+    return batch
+
+
+def _flush_if_autocommit(batch):
+    # No transaction in progress → nothing to wait for
+    if not connection.in_atomic_block:
+        batch.flush()
+
+
+# ─────────────────────────────────────────────
+# Recording changes
+# ─────────────────────────────────────────────
+
+def mark_scores_changed(pairs):
+    """
+    pairs: iterable of (student_id, assessment_competency_id) whose score
+    was written or deleted. Resolves each assessment competency to its
+    project (and, for a Plug-In, the parent project whose report it feeds)
+    once per batch.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return
+
+    batch   = _current_batch()
+    missing = {ac_id for _, ac_id in pairs if ac_id not in batch.ac_projects}
+    if missing:
+        rows = (
+            AssessmentCompetency.objects
+            .filter(id__in=missing)
+            .values_list('id', 'assessment__project_id', 'assessment__project__linked_project_id')
+        )
+        for ac_id, project_id, parent_id in rows:
+            batch.ac_projects[ac_id] = (project_id, parent_id)
+
+    for student_id, ac_id in pairs:
+        project_id, parent_id = batch.ac_projects.get(ac_id, (None, None))
+        if project_id is None:
+            continue
+        batch.report_pairs.add((student_id, project_id))
+        if parent_id is not None:
+            batch.report_pairs.add((student_id, parent_id))
+        batch.passport_projects[student_id].add(project_id)
+
+    _flush_if_autocommit(batch)
+
+
+def mark_projects_outdated(project_ids):
+    """Every report of these projects is stale (e.g. a Plug-In was re-linked)."""
+    project_ids = {pid for pid in project_ids if pid is not None}
+    if not project_ids:
+        return
+
+    batch = _current_batch()
+    batch.report_projects.update(project_ids)
+    _flush_if_autocommit(batch)
+
+
+def _mark_outdated(report_pairs, report_projects, passport_projects):
+    from .engine import mark_annual_passports_dirty
+
+    students_by_project = defaultdict(set)
+    for student_id, project_id in report_pairs:
+        if project_id not in report_projects:
+            students_by_project[project_id].add(student_id)
+
+    condition = Q(project_id__in=report_projects) if report_projects else Q(pk__in=[])
+    for project_id, student_ids in students_by_project.items():
+        condition |= Q(project_id=project_id, student_id__in=student_ids)
+
+    if report_projects or students_by_project:
+        ProjectReport.objects.filter(condition, is_outdated=False).update(is_outdated=True, refresh_failed_at=None)
+
+    if passport_projects:
+        mark_annual_passports_dirty(passport_projects)
+
+
+# ─────────────────────────────────────────────
+# Background refresher
+# ─────────────────────────────────────────────
+
+def refresh_outdated_reports(limit=None):
+    """
+    Regenerates outdated ProjectReports with generate_project_reports_bulk,
+    one call per project. limit caps how many reports are refreshed in one
+    run. Returns (refreshed, failed).
+
+    A report that cannot be regenerated (e.g. its scores were deleted)
+    stays outdated and gets refresh_failed_at; such reports are taken
+    last, oldest failure first, so they never hold up a limited run.
+    """
+    from .engine import generate_project_reports_bulk
+
+    outdated = (
+        ProjectReport.objects
+        .filter(is_outdated=True)
+        .order_by(F('refresh_failed_at').asc(nulls_first=True), 'project_id', 'student_id')
+        .values_list('project_id', 'student_id')
+    )
+    if limit:
+        outdated = outdated[:limit]
+
+    students_by_project = defaultdict(list)
+    for project_id, student_id in outdated:
+        students_by_project[project_id].append(student_id)
+
+    projects  = Project.objects.in_bulk(list(students_by_project))
+    refreshed = 0
+    failed    = 0
+    for project_id, student_ids in students_by_project.items():
+        reports, errors = generate_project_reports_bulk(student_ids, projects[project_id])
+        refreshed += len(reports)
+        failed    += len(errors)
+        if errors:
+            ProjectReport.objects.filter(project_id=project_id, student_id__in=list(errors)).update(
+                refresh_failed_at=timezone.now(),
+            )
+
+    return refreshed, failed
@@ -0,0 +1,148 @@
+"""
+Compiled Profile Weight Matrix
+==============================
+The 15 Profiles and their primary / secondary competencies change rarely
+(superadmin → Profiles & Competencies), but the profiling engine needs
+them for every report. This module compiles them once per process into a
+plain in-memory structure so scoring does no DB work at all.
+
+Invalidation:
+  - Every compiled matrix carries a version stamp.
+  - The current stamp is the ProfileMatrixVersion row (pk=1), so a change
+    saved in one gunicorn worker invalidates the matrix in every other
+    worker too — no shared cache backend needed.
+  - competencies.signals bumps the stamp whenever a Profile or its
+    primary / secondary M2M sets change.
+  - A process re-reads the stamp at most every VERSION_CHECK_INTERVAL;
+    its own changes take effect at once.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.db.models import F
+
+from .models import Profile, ProfileMatrixVersion
+
+
+VERSION_PK             = 1
+VERSION_CHECK_INTERVAL = 2.0   # seconds a warm matrix is used without re-reading the stamp
+
+CompiledProfile = namedtuple(
+    'CompiledProfile',
+    ['id', 'name', 'number', 'primary_ids', 'secondary_ids'],
+)
+
+
+class ProfileMatrix:
+    """
+    Immutable snapshot of all Profiles.
+
+    profiles           — CompiledProfile tuple, in Profile ordering (number)
+    competency_ids     — every competency used by any profile (column order)
+    competency_index   — { competency_id: column }
+    primary_incidence  — profile × competency 0/1 rows (1 = primary)
+    secondary_incidence— profile × competency 0/1 rows (1 = secondary)
+    secondary_counts   — number of secondary competencies per profile
+
+    The scalar engine reads only profiles; the incidence rows, counts and
+    column index are what vectorized.score_profiles multiplies against.
+    """
+
+    def __init__(self, profiles, version):
+        self.version  = version
+        self.profiles = tuple(profiles)
+
+        comp_ids = set()
+        for p in self.profiles:
+            comp_ids.update(p.primary_ids)
+            comp_ids.update(p.secondary_ids)
+        self.competency_ids   = tuple(sorted(comp_ids))
+        self.competency_index = {cid: i for i, cid in enumerate(self.competency_ids)}
+
+        self.primary_incidence = tuple(
+            tuple(1 if cid in p.primary_ids else 0 for cid in self.competency_ids)
+            for p in self.profiles
+        )
+        self.secondary_incidence = tuple(
+            tuple(1 if cid in p.secondary_ids else 0 for cid in self.competency_ids)
+            for p in self.profiles
+        )
+        self.secondary_counts = tuple(len(p.secondary_ids) for p in self.profiles)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __repr__(self):
+        return f"<ProfileMatrix v{self.version}: {len(self.profiles)} profiles × {len(self.competency_ids)} competencies>"
+
+
+_compiled   = None
+_checked_at = 0.0   # time.monotonic() of the last stamp read that matched _compiled
+_lock       = threading.Lock()
+
+
+def get_profile_matrix():
+    """
+    Returns the current ProfileMatrix, compiling it if this process has
+    none yet or its version stamp is stale. Zero DB queries when warm and
+    checked within the last VERSION_CHECK_INTERVAL, one small read otherwise.
+    """
+    global _compiled, _checked_at
+
+    compiled = _compiled
+    if compiled is not None and time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL:
+        return compiled
+
+    version = _current_version()
+    if compiled is not None and compiled.version == version:
+        _checked_at = time.monotonic()
+        return compiled
+
+    with _lock:
+        compiled = _compiled
+        if compiled is None or compiled.version != version:
+            # Stamp with the version read *before* loading, so a change
+            # committed mid-compile still forces a recompile next time.
+            compiled  = _compile(version)
+            _compiled = compiled
+        _checked_at = time.monotonic()
+
+    return compiled
+
+
+def invalidate_profile_matrix():
+    """Drop the compiled matrix in every process (bumps the version stamp)."""
+    global _compiled
+    _compiled = None
+    updated = ProfileMatrixVersion.objects.filter(pk=VERSION_PK).update(version=F('version') + 1)
+    if not updated:
+        ProfileMatrixVersion.objects.get_or_create(pk=VERSION_PK, defaults={'version': 1})
+
+
+def _current_version():
+    version = ProfileMatrixVersion.objects.filter(pk=VERSION_PK).values_list('version', flat=True).first()
+    return version or 0
+
+
+def _compile(version):
+    # Same prefetch (and therefore the same Competency ordering) the engine
+    # used to run per call — keeps weightage order and float sums identical.
+    profiles = Profile.objects.prefetch_related(
+        'primary_competencies', 'secondary_competencies'
+    ).all()
+
+    return ProfileMatrix(
+        [
+            CompiledProfile(
+                id=p.id,
+                name=p.name,
+                number=p.number,
+                primary_ids=tuple(c.id for c in p.primary_competencies.all()),
+                secondary_ids=tuple(c.id for c in p.secondary_competencies.all()),
+            )
+            for p in profiles
+        ],
+        version,
+    )
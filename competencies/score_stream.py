@@ -0,0 +1,135 @@
+"""
+Live Score Stream (Server-Sent Events, ASGI only)
+=================================================
+Pushes score-cell changes and class-average updates for an assessment to
+every open score entry grid.
+
+One broadcaster task per (assessment, school) per process reads the
+ScoreChange log (see score_sync) and fans each change out to in-memory
+queues — so a connection that is only waiting costs an idle coroutine and
+a queue, not a DB query. Changes saved by any process (WSGI or ASGI) are
+picked up because the broadcaster reads the shared change log.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Avg, Count
+
+from .models import ScoreEntry
+from .score_sync import changes_since, cursor_expired, latest_cursor
+
+
+POLL_INTERVAL      = 1.0    # seconds between change-log checks per channel
+HEARTBEAT_INTERVAL = 15.0   # keeps proxies from closing idle streams
+QUEUE_SIZE         = 50     # events buffered per client before it must resync
+
+
+class _Channel:
+    def __init__(self, key, assessment_id, students_qs, cursor):
+        self.key           = key
+        self.assessment_id = assessment_id
+        self.students_qs   = students_qs
+        self.cursor        = cursor
+        self.queues        = set()
+        self.task          = None
+
+
+_channels = {}
+
+
+def _stats(assessment_id, students_qs):
+    """Same numbers as the grid header (api_score_entry_data), over the grid's students."""
+    totals = ScoreEntry.objects.filter(
+        assessment_competency__assessment_id=assessment_id,
+        student__in=students_qs,
+        score__isnull=False,
+    ).aggregate(scored=Count('student_id', distinct=True), avg=Avg('score'))
+    return {
+        'total_students': students_qs.count(),
+        'scored_count':   totals['scored'],
+        'class_avg':      round(totals['avg'], 1) if totals['avg'] is not None else None,
+    }
+
+
+def _format(event, data, event_id=None):
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def _changes_event(assessment_id, students_qs, since, latest):
+    cursor, scores = await sync_to_async(changes_since)(
+        assessment_id, since, students_qs.values('id'), latest=latest
+    )
+    stats = await sync_to_async(_stats)(assessment_id, students_qs)
+    return cursor, _format('scores', {'cursor': cursor, 'scores': scores, 'stats': stats}, cursor)
+
+
+async def _broadcast(channel):
+    while channel.queues:
+        await asyncio.sleep(POLL_INTERVAL)
+
+        latest = await sync_to_async(latest_cursor)(channel.assessment_id)
+        if latest <= channel.cursor:
+            continue
+
+        channel.cursor, event = await _changes_event(
+            channel.assessment_id, channel.students_qs, channel.cursor, latest
+        )
+        for queue in list(channel.queues):
+            if queue.full():
+                # Too far behind to catch up event by event: reload the grid
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_format('resync', {'cursor': channel.cursor}))
+            else:
+                queue.put_nowait(event)
+
+
+async def score_events(assessment_id, scope_key, students_qs, since=None):
+    """
+    Async iterator of SSE-formatted strings for one client.
+
+    scope_key:   school id of the grid's students (None = every school);
+                 clients with the same scope share one broadcaster
+    students_qs: the students of the grid, for scoping cells and stats
+    since:       the client's cursor; missed changes are sent first
+    """
+    key     = (assessment_id, scope_key)
+    channel = _channels.get(key)
+    if channel is None:
+        cursor  = await sync_to_async(latest_cursor)(assessment_id)
+        channel = _channels.setdefault(key, _Channel(key, assessment_id, students_qs, cursor))
+
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    channel.queues.add(queue)
+    if channel.task is None or channel.task.done():
+        channel.task = asyncio.create_task(_broadcast(channel))
+
+    try:
+        yield _format('ready', {'cursor': channel.cursor}, channel.cursor)
+
+        if since is not None and since < channel.cursor:
+            if await sync_to_async(cursor_expired)(since):
+                # Missed changes were purged from the log: reload the grid
+                yield _format('resync', {'cursor': channel.cursor})
+            else:
+                _, event = await _changes_event(assessment_id, students_qs, since, channel.cursor)
+                yield event
+
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+    finally:
+        channel.queues.discard(queue)
+        if not channel.queues:
+            if channel.task:
+                channel.task.cancel()
+            if _channels.get(key) is channel:
+                del _channels[key]
@@ -0,0 +1,115 @@
+"""
+Score Entry Delta Sync
+======================
+Every ScoreEntry write appends a ScoreChange row (competencies.signals,
+or record_score_changes() for bulk writes). The newest ScoreChange id of
+an assessment is its cursor:
+
+  - api_score_entry_data returns the cursor with the full grid
+  - the grid then asks for changes since that cursor; if nothing is newer
+    the answer is a bare 304, otherwise only the changed cells
+
+The log is only needed to bring open grids up to date, so
+purge_score_changes() (run by `manage.py report_worker`) drops rows older
+than the retention window. A grid whose cursor is older than the oldest
+kept row may have missed purged changes: cursor_expired() tells the
+views to make it reload instead.
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import AssessmentCompetency, ScoreChange
+
+
+RETENTION = timedelta(days=2)
+
+
+def record_score_changes(rows):
+    """
+    rows: iterable of (student_id, assessment_competency_id, score); score
+    is None for a cleared or deleted cell. One lookup + one INSERT.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    assessment_of = dict(
+        AssessmentCompetency.objects
+        .filter(id__in={ac_id for _, ac_id, _ in rows})
+        .values_list('id', 'assessment_id')
+    )
+    ScoreChange.objects.bulk_create([
+        ScoreChange(
+            assessment_id=assessment_of[ac_id],
+            assessment_competency_id=ac_id,
+            student_id=student_id,
+            score=score,
+        )
+        for student_id, ac_id, score in rows
+        if ac_id in assessment_of
+    ])
+
+
+def latest_cursor(assessment_id):
+    """Newest change id for an assessment (0 if it has none). Index-only."""
+    return (
+        ScoreChange.objects
+        .filter(assessment_id=assessment_id)
+        .order_by('-id')
+        .values_list('id', flat=True)
+        .first()
+    ) or 0
+
+
+def current_cursor():
+    """
+    Newest change id of any assessment — the cursor a freshly loaded grid
+    starts from, so every later change of its assessment is newer.
+    """
+    return ScoreChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def cursor_expired(cursor):
+    """True if changes after `cursor` may already have been purged."""
+    oldest = ScoreChange.objects.order_by('id').values_list('id', flat=True).first()
+    return oldest is not None and cursor < oldest - 1
+
+
+def purge_score_changes(older_than=RETENTION):
+    """
+    Deletes changes logged before `older_than` ago. The newest row is always
+    kept, so cursor_expired() still knows where the log starts. Returns the
+    number deleted.
+    """
+    newest = current_cursor()
+    deleted, _ = ScoreChange.objects.filter(
+        changed_at__lt=timezone.now() - older_than, id__lt=newest,
+    ).delete()
+    return deleted
+
+
+def changes_since(assessment_id, cursor, student_ids=None, latest=None):
+    """
+    Returns (new_cursor, { 'studentid__acid': score }) with only the final
+    state of every cell changed after `cursor`.
+
+    student_ids limits the cells to those students (e.g. a teacher's school);
+    the cursor still advances past other students' changes.
+    latest: a latest_cursor() value the caller already has.
+    """
+    if latest is None:
+        latest = latest_cursor(assessment_id)
+
+    qs = ScoreChange.objects.filter(assessment_id=assessment_id, id__gt=cursor, id__lte=latest)
+    if student_ids is not None:
+        qs = qs.filter(student_id__in=student_ids)
+
+    scores = {}
+    for student_id, ac_id, score in qs.order_by('id').values_list(
+        'student_id', 'assessment_competency_id', 'score'
+    ):
+        scores[f"{student_id}__{ac_id}"] = score
+
+    return latest, scores
@@ -0,0 +1,153 @@
+"""
+Signal handlers for the competencies app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.activity import (
+    assessment_feedback_events, project_feedback_events, record_events, score_events,
+)
+
+from .assessment_stats import apply_score_deltas, rebuild_assessment_stats
+from .models import (
+    AssessmentCompetency, Competency, Profile, Project, ScoreEntry,
+    StudentAssessmentFeedback, StudentProjectFeedback,
+)
+from .outdated import mark_projects_outdated, mark_scores_changed
+from .profile_matrix import invalidate_profile_matrix
+from .score_sync import record_score_changes
+
+
+# ─────────────────────────────────────────────
+# Compiled profile matrix invalidation
+# ─────────────────────────────────────────────
+
+@receiver(m2m_changed, sender=Profile.primary_competencies.through)
+@receiver(m2m_changed, sender=Profile.secondary_competencies.through)
+def profile_competencies_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_profile_matrix)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Competency)
+def profile_changed(sender, **kwargs):
+    # Deleting a Competency cascades its M2M rows without m2m_changed.
+    transaction.on_commit(invalidate_profile_matrix)
+
+
+# ─────────────────────────────────────────────
+# ScoreEntry writes
+# ─────────────────────────────────────────────
+# One receiver per signal feeds every consumer — outdated reports and
+# passports, the delta sync log, the parent activity feed and the
+# per-assessment statistics — from the same old / new score, so none of
+# them depends on the order handlers are registered in.
+
+@receiver(post_init, sender=ScoreEntry)
+def score_entry_loaded(sender, instance, **kwargs):
+    # Score as last read from / written to the DB — the "old" side of a delta.
+    # Deferred loads leave it out rather than triggering a query.
+    instance._stored_score = instance.__dict__.get('score')
+
+
+@receiver(post_save, sender=ScoreEntry)
+def score_entry_saved(sender, instance, created, **kwargs):
+    student_id, ac_id = instance.student_id, instance.assessment_competency_id
+    old, new          = (None if created else instance._stored_score), instance.score
+    instance._stored_score = new
+
+    mark_scores_changed([(student_id, ac_id)])
+    record_score_changes([(student_id, ac_id, new)])
+    if new is not None and new != old:
+        record_events(score_events([(student_id, ac_id, new)]))
+    apply_score_deltas([(student_id, ac_id, old, new)])
+
+
+@receiver(post_delete, sender=ScoreEntry)
+def score_entry_deleted(sender, instance, **kwargs):
+    # Also fires for every entry cascaded away with its AssessmentCompetency
+    student_id, ac_id = instance.student_id, instance.assessment_competency_id
+
+    mark_scores_changed([(student_id, ac_id)])
+    record_score_changes([(student_id, ac_id, None)])
+    apply_score_deltas([(student_id, ac_id, instance._stored_score, None)])
+
+
+# ─────────────────────────────────────────────
+# Outdated report tracking
+# ─────────────────────────────────────────────
+
+@receiver(post_save, sender=AssessmentCompetency)
+def assessment_competency_saved(sender, instance, created, **kwargs):
+    # A new mapping has no scores yet; an edited one may now point at a
+    # different competency, so every score on it moves.
+    if created:
+        return
+    student_ids = ScoreEntry.objects.filter(assessment_competency=instance).values_list('student_id', flat=True)
+    mark_scores_changed([(student_id, instance.id) for student_id in student_ids])
+
+
+@receiver(pre_save, sender=Project)
+def project_linkage_snapshot(sender, instance, **kwargs):
+    instance._previous_linkage = None
+    if instance.pk:
+        instance._previous_linkage = (
+            Project.objects.filter(pk=instance.pk)
+            .values_list('linked_project_id', 'status')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Project)
+def project_linkage_changed(sender, instance, created, **kwargs):
+    # A Plug-In's scores are merged into its parent's report: re-linking it,
+    # or (de)activating it, changes every report of the old and new parent.
+    previous = getattr(instance, '_previous_linkage', None)
+    if previous is None:
+        if instance.linked_project_id and instance.status == 'Active':
+            mark_projects_outdated([instance.linked_project_id])
+        return
+
+    old_parent_id, old_status = previous
+    if old_parent_id != instance.linked_project_id or old_status != instance.status:
+        mark_projects_outdated([old_parent_id, instance.linked_project_id])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    if instance.linked_project_id:
+        mark_projects_outdated([instance.linked_project_id])
+
+
+# ─────────────────────────────────────────────
+# Parent activity feed (accounts.activity)
+# ─────────────────────────────────────────────
+
+@receiver(post_init, sender=StudentAssessmentFeedback)
+@receiver(post_init, sender=StudentProjectFeedback)
+def feedback_loaded(sender, instance, **kwargs):
+    instance._stored_feedback = instance.__dict__.get('feedback')
+
+
+@receiver(post_save, sender=StudentAssessmentFeedback)
+@receiver(post_save, sender=StudentProjectFeedback)
+def feedback_activity(sender, instance, created, **kwargs):
+    if instance.feedback and (created or instance.feedback != instance._stored_feedback):
+        build = assessment_feedback_events if sender is StudentAssessmentFeedback else project_feedback_events
+        record_events(build(instance))
+    instance._stored_feedback = instance.feedback
+
+
+# ─────────────────────────────────────────────
+# Per-assessment statistics
+# ─────────────────────────────────────────────
+
+@receiver(post_save, sender=AssessmentCompetency)
+def assessment_competency_stats(sender, instance, created, **kwargs):
+    # The mapping may now point at another competency: recount its assessment
+    if not created:
+        transaction.on_commit(lambda: rebuild_assessment_stats([instance.assessment_id]))
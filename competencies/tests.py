@@ -1,3 +1,515 @@
+import random
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import ActivityEvent
+from schools.models import School
+from student.models import Student
+
+from .assessment_stats import _create_stat, apply_score_deltas, assessment_summary
+from .engine import (
+    REPORT_FIELDS, TOP_PROFILES_COUNT, _build_report_payload, generate_annual_passport, generate_project_report,
+    generate_project_reports_bulk, get_annual_passport_scores_bulk, get_competency_scores_for_project,
+    refresh_annual_passport, refresh_annual_passports, run_profiling_engine,
+)
+from .jobs import STALE_AFTER, claim_report_jobs
+from .models import (
+    AnnualPassport, Assessment, AssessmentCompetency, AssessmentStat, Competency, Profile, Project, ProjectReport,
+    ReportJob, ScoreChange, ScoreEntry, SubPillar,
+)
+from . import outdated, profile_matrix
+from .outdated import refresh_outdated_reports
+from .profile_matrix import get_profile_matrix, invalidate_profile_matrix
+from .score_sync import purge_score_changes
+from .vectorized import np, build_score_matrix, run_profiling_engine_bulk
+
+
+
+def make_school():
+    return School.objects.create(
+        school_name='School', school_code='SC1', city='Pune', state='MH', pincode='411001',
+    )
+
+
+def make_student(i, school):
+    return Student.objects.create(
+        first_name=f'Student{i}', last_name='Test', gender='male', date_of_birth=date(2012, 1, 1),
+        student_class='8', division='A', roll_number=str(i), academic_year='2024-2025',
+        gr_number=f'GR{i}', school_board='CBSE', school_email=f'student{i}@example.com',
+        enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+        emergency_mobile='9000000002', school=school,
+    )
+
+
+@unittest.skipIf(np is None, 'NumPy not installed')
+class VectorizedProfilingParityTests(TestCase):
+    """The NumPy path must reproduce run_profiling_engine exactly."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(2024)
+        sub_pillar = SubPillar.objects.order_by('sp_number').first()
+        cls.competencies = [
+            Competency.objects.create(
+                sub_pillar=sub_pillar, code=f'T{i}', name=f'Test competency {i}', stage='Middle',
+            )
+            for i in range(24)
+        ]
+        for profile in Profile.objects.all():
+            picks = rnd.sample(cls.competencies, 6)
+            profile.primary_competencies.set(picks[:rnd.choice([2, 3])])
+            secondary = picks[3:3 + rnd.choice([2, 3])]
+            if profile.number == 1:
+                # Overlap case: a competency that is both primary and secondary
+                secondary = secondary + picks[:1]
+            profile.secondary_competencies.set(secondary)
+
+    def setUp(self):
+        # M2M signals invalidate on commit, which TestCase never reaches
+        invalidate_profile_matrix()
+
+    def _random_scores(self, rnd, n_students):
+        cohort = {}
+        for sid in range(n_students):
+            scores = {}
+            for comp in self.competencies:
+                roll = rnd.random()
+                if roll < 0.35:
+                    continue
+                elif roll < 0.7:
+                    scores[comp.id] = rnd.randint(1, 10)
+                elif roll < 0.9:
+                    # Averaged across assessments
+                    scores[comp.id] = sum(rnd.randint(1, 10) for _ in range(3)) / 3
+                else:
+                    # Project averaged with plug-in
+                    scores[comp.id] = (rnd.randint(1, 10) / 2 + rnd.randint(1, 10)) / 2
+            cohort[sid] = scores
+        return cohort
+
+    def test_full_results_match_scalar_engine(self):
+        cohort = self._random_scores(random.Random(7), 300)
+        keys, comp_ids, values, mask = build_score_matrix(cohort)
+
+        bulk = run_profiling_engine_bulk(values, mask, comp_ids)
+
+        for key, results in zip(keys, bulk):
+            self.assertEqual(results, run_profiling_engine(cohort[key]))
+
+    def test_top_profiles_match_scalar_engine(self):
+        cohort = self._random_scores(random.Random(11), 100)
+        keys, comp_ids, values, mask = build_score_matrix(cohort)
+
+        bulk = run_profiling_engine_bulk(values, mask, comp_ids, top_n=TOP_PROFILES_COUNT)
+
+        for key, results in zip(keys, bulk):
+            self.assertEqual(results, run_profiling_engine(cohort[key])[:TOP_PROFILES_COUNT])
+
+    def test_locked_and_empty_students(self):
+        cohort = {'empty': {}, 'one': {self.competencies[0].id: 9}}
+        keys, comp_ids, values, mask = build_score_matrix(
+            cohort, competency_ids=[c.id for c in self.competencies]
+        )
+
+        bulk = run_profiling_engine_bulk(values, mask, comp_ids)
+
+        self.assertEqual(bulk[0], [])
+        self.assertEqual(bulk[1], run_profiling_engine(cohort['one']))
+
+
+class RefreshOutdatedReportsTests(TestCase):
+    """A report that cannot be regenerated must not block later ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = make_school()
+        cls.students = [make_student(i, school) for i in range(3)]
+        competency = Competency.objects.create(
+            sub_pillar=SubPillar.objects.order_by('sp_number').first(), code='R1',
+            name='Refresh competency', stage='Middle',
+        )
+        cls.project = Project.objects.create(
+            title='Project', project_type='Life Form', grade='Middle', status='Active',
+        )
+        assessment = Assessment.objects.create(project=cls.project, name='Assessment')
+        ac = AssessmentCompetency.objects.create(assessment=assessment, competency=competency)
+        # The first student (the head of the queue) has no scores
+        for student in cls.students[1:]:
+            ScoreEntry.objects.create(student=student, assessment_competency=ac, score=7)
+        for student in cls.students:
+            ProjectReport.objects.update_or_create(
+                student=student, project=cls.project, defaults={'is_outdated': True},
+            )
+
+    def setUp(self):
+        invalidate_profile_matrix()
+
+    def test_failing_head_row_does_not_block_limited_runs(self):
+        self.assertEqual(refresh_outdated_reports(limit=1), (0, 1))
+        self.assertEqual(refresh_outdated_reports(limit=1), (1, 0))
+        self.assertEqual(refresh_outdated_reports(limit=1), (1, 0))
+
+        outdated = ProjectReport.objects.filter(project=self.project, is_outdated=True)
+        self.assertEqual([r.student_id for r in outdated], [self.students[0].id])
+        self.assertIsNotNone(outdated[0].refresh_failed_at)
+
+
+class StaleReportJobTests(TestCase):
+    """A job whose worker keeps dying is retried up to max_attempts, then failed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        school  = make_school()
+        project = Project.objects.create(title='Project', project_type='Life Form', grade='Middle', status='Active')
+        stale_since = timezone.now() - STALE_AFTER * 2
+        cls.retried, cls.exhausted = [
+            ReportJob.objects.create(
+                student=make_student(i, school), project=project, status=ReportJob.RUNNING,
+                attempts=attempts, claimed_by='dead-worker', claimed_at=stale_since,
+            )
+            for i, attempts in enumerate([1, 3])
+        ]
+
+    def test_stale_jobs_count_attempts(self):
+        claimed = claim_report_jobs('worker')
+
+        self.assertEqual([job.id for job in claimed], [self.retried.id])
+        self.assertEqual(claimed[0].attempts, 2)
+        self.exhausted.refresh_from_db()
+        self.assertEqual(self.exhausted.status, ReportJob.FAILED)
+        self.assertIsNotNone(self.exhausted.finished_at)
+
+
+class AssessmentStatNoSchoolTests(TestCase):
+    """Students without a school share one AssessmentStat row per competency."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(i, None) for i in range(2)]
+        cls.competency = Competency.objects.create(
+            sub_pillar=SubPillar.objects.order_by('sp_number').first(), code='S1',
+            name='Stat competency', stage='Middle',
+        )
+        project = Project.objects.create(title='Project', project_type='Life Form', grade='Middle', status='Active')
+        cls.assessment = Assessment.objects.create(project=project, name='Assessment')
+        cls.ac = AssessmentCompetency.objects.create(assessment=cls.assessment, competency=cls.competency)
+
+    def test_same_delta_twice_keeps_one_row(self):
+        # Written without signals, each write reporting its own delta
+        for student in self.students:
+            ScoreEntry.objects.bulk_create([ScoreEntry(student=student, assessment_competency=self.ac, score=7)])
+            apply_score_deltas([(student.id, self.ac.id, None, 7)])
+        # A concurrent writer that also found no row creates it again
+        _create_stat(self.assessment.id, None, self.competency.id)
+
+        stats = AssessmentStat.objects.filter(assessment=self.assessment, school__isnull=True)
+        self.assertEqual(stats.count(), 1)
+        self.assertEqual(assessment_summary(self.assessment.id)['count'], 2)
+
+
+class ScoreChangeRetentionTests(TestCase):
+    """The score change log is pruned; grids behind the pruned part reload."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(i, None) for i in range(3)]
+        competency = Competency.objects.create(
+            sub_pillar=SubPillar.objects.order_by('sp_number').first(), code='S1',
+            name='Sync competency', stage='Middle',
+        )
+        project = Project.objects.create(title='Project', project_type='Life Form', grade='Middle', status='Active')
+        cls.assessment = Assessment.objects.create(project=project, name='Assessment')
+        cls.ac = AssessmentCompetency.objects.create(assessment=cls.assessment, competency=competency)
+        cls.teacher = get_user_model().objects.create_user(username='coach', password='pw', role='THINKING_COACH')
+
+    def setUp(self):
+        for student in self.students:
+            ScoreEntry.objects.create(student=student, assessment_competency=self.ac, score=5)
+        self.ids = list(ScoreChange.objects.order_by('id').values_list('id', flat=True))
+
+    def age(self, ids, days):
+        ScoreChange.objects.filter(id__in=ids).update(changed_at=timezone.now() - timedelta(days=days))
+
+    def changes(self, since):
+        self.client.force_login(self.teacher)
+        return self.client.get(reverse('teacher:api_score_entry_changes'),
+                               {'assessment_id': self.assessment.id, 'since': since})
+
+    def test_purge_keeps_recent_rows_and_the_newest(self):
+        self.age(self.ids, 30)
+        self.assertEqual(purge_score_changes(timedelta(days=2)), 2)
+        self.assertEqual(list(ScoreChange.objects.values_list('id', flat=True)), self.ids[-1:])
+
+    def test_cursor_older_than_the_log_gets_410(self):
+        self.age(self.ids[:2], 30)
+        purge_score_changes(timedelta(days=2))
+
+        self.assertEqual(self.changes(self.ids[0] - 1).status_code, 410)
+        response = self.changes(self.ids[1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['scores']), 1)
+
+
+class EngineTestCase(TestCase):
+    """
+    A small year of projects scored by four students (the last has no
+    scores), with every Profile drawn from the same six competencies:
+
+      Early   sequence 1, two assessments that both score C0 and C1
+      Core    sequence 2, with two Active Plug-Ins (the newer one counts)
+      Late    sequence 2 as well, created after Core
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(5)
+        sub_pillar = SubPillar.objects.order_by('sp_number').first()
+        cls.competencies = [
+            Competency.objects.create(sub_pillar=sub_pillar, code=f'E{i}', name=f'Engine {i}', stage='Middle')
+            for i in range(6)
+        ]
+        for profile in Profile.objects.all():
+            picks = rnd.sample(cls.competencies, 5)
+            profile.primary_competencies.set(picks[:3])
+            profile.secondary_competencies.set(picks[3:])
+
+        school = make_school()
+        cls.students = [make_student(i, school) for i in range(4)]
+
+        created = timezone.now() - timedelta(days=30)
+        cls.acs = {}
+
+        def project(title, sequence=None, parent=None, maps=()):
+            nonlocal created
+            created += timedelta(days=1)
+            obj = Project.objects.create(
+                title=title, project_type='Plug In' if parent else 'Life Form', grade='Middle',
+                status='Active', sequence_number=sequence, linked_project=parent,
+            )
+            Project.objects.filter(pk=obj.pk).update(created_at=created)
+            for n, comp_indexes in enumerate(maps):
+                assessment = Assessment.objects.create(project=obj, name=f'{title} {n}')
+                cls.acs[assessment.name] = [
+                    AssessmentCompetency.objects.create(assessment=assessment, competency=cls.competencies[i])
+                    for i in comp_indexes
+                ]
+            return obj
+
+        cls.early  = project('Early', 1, maps=[(0, 1, 2), (0, 1)])
+        cls.core   = project('Core', 2, maps=[(0, 3)])
+        cls.old_plugin = project('Old Plug', parent=cls.core, maps=[(4, 5)])
+        cls.plugin = project('Plug', parent=cls.core, maps=[(3, 4)])
+        cls.late   = project('Late', 2, maps=[(3, 5)])
+
+        for student in cls.students[:3]:
+            for acs in cls.acs.values():
+                for ac in acs:
+                    if rnd.random() < 0.8:
+                        cls.score(student, ac, rnd.randint(1, 10))
+
+    @staticmethod
+    def score(student, ac, value):
+        return ScoreEntry.objects.update_or_create(
+            student=student, assessment_competency=ac, defaults={'score': value},
+        )[0]
+
+    def setUp(self):
+        invalidate_profile_matrix()
+
+
+def per_project_annual_scores(student):
+    """The per-project walk get_annual_passport_scores used to do."""
+    annual = {}
+    projects = Project.objects.filter(
+        sequence_number__isnull=False, status='Active',
+    ).order_by('-sequence_number', '-created_at')
+    for project in projects:
+        for comp_id, score in get_competency_scores_for_project(student, project).items():
+            annual.setdefault(comp_id, score)
+    return annual
+
+
+class AnnualPassportParityTests(EngineTestCase):
+    """The two-query annual passport matches the per-project walk."""
+
+    def test_scores_match_per_project_path(self):
+        bulk = get_annual_passport_scores_bulk(self.students)
+
+        for student in self.students:
+            self.assertEqual(list(bulk[student.id].items()), list(per_project_annual_scores(student).items()))
+        self.assertEqual(bulk[self.students[3].id], {})
+
+    def test_passport_matches_per_project_path(self):
+        for student in self.students:
+            scores = per_project_annual_scores(student)
+            expected = _build_report_payload(scores, Competency.objects.in_bulk(list(scores))) if scores else None
+            self.assertEqual(generate_annual_passport(student), expected)
+
+    def test_latest_project_plugin_and_assessment_rules(self):
+        student, c = self.students[0], self.competencies
+        self.score(student, self.acs['Early 0'][1], 4)
+        self.score(student, self.acs['Early 1'][1], 7)   # C1 in two assessments → averaged
+        self.score(student, self.acs['Core 0'][1], 1)
+        self.score(student, self.acs['Late 0'][0], 9)    # C3: Late is newer than Core in sequence 2
+        self.score(student, self.acs['Plug 0'][1], 8)
+        self.score(student, self.acs['Old Plug 0'][0], 2)   # C4: only the newer Plug-In counts
+
+        scores = get_annual_passport_scores_bulk([student])[student.id]
+
+        self.assertEqual(scores[c[1].id], 5.5)
+        self.assertEqual(scores[c[3].id], 9)
+        self.assertEqual(scores[c[4].id], 8)
+        self.assertEqual(list(scores.items()), list(per_project_annual_scores(student).items()))
+
+
+PASSPORT_FIELDS = [
+    'competency_sources', 'top_3_profiles', 'top_5_competencies', 'skills_to_work_on', 'all_competency_scores',
+]
+
+
+class AnnualPassportRefreshTests(EngineTestCase):
+    """Score writes mark only their students' passports; an incremental refresh equals a rebuild."""
+
+    def setUp(self):
+        super().setUp()
+        # setUpTestData's writes left a batch waiting for a commit that never
+        # comes; start a fresh one so captureOnCommitCallbacks can flush it
+        outdated._local.batch = None
+        refresh_annual_passports(self.students)
+
+    def passport(self, student):
+        return AnnualPassport.objects.get(student=student)
+
+    def fields(self, passport):
+        return {field: getattr(passport, field) for field in PASSPORT_FIELDS}
+
+    def full_recompute(self, student):
+        AnnualPassport.objects.filter(student=student).update(is_dirty=True, dirty_project_ids=[])
+        return self.fields(refresh_annual_passport(student))
+
+    def test_score_write_marks_only_affected_passports(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.score(self.students[0], self.acs['Plug 0'][0], 3)
+
+        self.assertEqual(
+            (self.passport(self.students[0]).is_dirty, self.passport(self.students[0]).dirty_project_ids),
+            (True, [self.plugin.id]),
+        )
+        for student in self.students[1:3]:
+            self.assertFalse(self.passport(student).is_dirty)
+        self.assertFalse(AnnualPassport.objects.filter(student=self.students[3]).exists())
+
+    def test_incremental_refresh_matches_full_recompute(self):
+        rnd = random.Random(3)
+        acs = [ac for acs in self.acs.values() for ac in acs]
+        for _ in range(30):
+            student = rnd.choice(self.students[:3])
+            with self.captureOnCommitCallbacks(execute=True):
+                for ac in rnd.sample(acs, 2):
+                    self.score(student, ac, rnd.randint(1, 10))
+            self.assertTrue(self.passport(student).dirty_project_ids)
+
+            incremental = self.fields(refresh_annual_passport(student))
+            self.assertEqual(incremental, self.full_recompute(student))
+
+    def test_incremental_refresh_after_a_score_is_deleted(self):
+        student = self.students[0]
+        source_ac = self.acs['Late 0'][0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.score(student, source_ac, 9)
+        refresh_annual_passport(student)
+
+        # Deleting C3's source score in Late falls back to Core (and its Plug-In)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.score(student, self.acs['Core 0'][1], 2)
+        refresh_annual_passport(student)
+        with self.captureOnCommitCallbacks(execute=True):
+            ScoreEntry.objects.get(student=student, assessment_competency=source_ac).delete()
+        self.assertEqual(self.passport(student).dirty_project_ids, [self.late.id])
+
+        incremental = self.fields(refresh_annual_passport(student))
+        sources = {c: src for c, _, src in incremental['competency_sources']}
+        self.assertEqual(sources[self.competencies[3].id], self.core.id)
+        self.assertEqual(incremental, self.full_recompute(student))
+
+
+class ProjectReportsBulkTests(EngineTestCase):
+    """Batch reports equal per-student ones, in a fixed number of queries."""
+
+    def report_fields(self, project):
+        return {
+            report.student_id: {field: getattr(report, field) for field in REPORT_FIELDS if field != 'generated_at'}
+            for report in ProjectReport.objects.filter(project=project)
+        }
+
+    def test_reports_match_generate_project_report(self):
+        for project in (self.early, self.core, self.late):
+            reports, errors = generate_project_reports_bulk(self.students, project)
+            bulk = self.report_fields(project)
+
+            ProjectReport.objects.filter(project=project).delete()
+            single_errors = {}
+            for student in self.students:
+                report, error = generate_project_report(student, project)
+                if error:
+                    single_errors[student.id] = error
+
+            self.assertEqual(bulk, self.report_fields(project))
+            self.assertEqual(errors, single_errors)
+            self.assertEqual(len(reports), len(bulk))
+        self.assertIn(self.students[3].id, errors)
+
+    @mock.patch.object(profile_matrix, 'VERSION_CHECK_INTERVAL', 3600)
+    def test_query_count_does_not_grow_with_the_cohort(self):
+        school = self.students[0].school
+        cohort = [make_student(i, school) for i in range(10, 40)]
+        ScoreEntry.objects.bulk_create([
+            ScoreEntry(student=student, assessment_competency=ac, score=(student.id + ac.id) % 10 + 1)
+            for student in cohort
+            for name in ('Core 0', 'Plug 0')
+            for ac in self.acs[name]
+        ])
+        get_profile_matrix()
+
+        # plug-in, scores, competencies, existing reports, savepoint + bulk write + release
+        for students in (self.students[:2], cohort):
+            with self.assertNumQueries(7):
+                generate_project_reports_bulk(students, self.core)   # creates
+            with self.assertNumQueries(7):
+                generate_project_reports_bulk(students, self.core)   # updates
+
+
+class ScoreEntrySignalTests(TestCase):
+    """Every consumer of a model save sees the same old and new score."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_student(0, make_school())
+        competency = Competency.objects.create(
+            sub_pillar=SubPillar.objects.order_by('sp_number').first(), code='G1',
+            name='Signal competency', stage='Middle',
+        )
+        project = Project.objects.create(title='Project', project_type='Life Form', grade='Middle', status='Active')
+        cls.assessment = Assessment.objects.create(project=project, name='Assessment')
+        cls.ac = AssessmentCompetency.objects.create(assessment=cls.assessment, competency=competency)
+
+    def test_saves_and_delete(self):
+        entry = ScoreEntry.objects.create(student=self.student, assessment_competency=self.ac, score=5)
+        entry.score = 7
+        entry.save()
+        entry.save()   # unchanged: no new activity, no statistics delta
+
+        self.assertEqual(list(ScoreChange.objects.values_list('score', flat=True)), [5, 7, 7])
+        self.assertEqual(ActivityEvent.objects.filter(kind=ActivityEvent.SCORE).count(), 2)
+        summary = assessment_summary(self.assessment.id)
+        self.assertEqual((summary['count'], summary['sum']), (1, 7))
 
-# Create your tests here.
+        ScoreEntry.objects.get(pk=entry.pk).delete()
+        self.assertEqual(assessment_summary(self.assessment.id)['count'], 0)
+        self.assertEqual(ScoreChange.objects.order_by('-id').values_list('score', flat=True).first(), None)
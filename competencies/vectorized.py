@@ -0,0 +1,201 @@
+"""
+neoRiSE Skill Passport — Vectorized Profiling (optional, needs NumPy)
+=====================================================================
+Cohort analytics need top profiles for thousands of students × projects.
+Instead of calling _calculate_profile_score profile-by-profile and
+student-by-student, this scores a whole students × competencies matrix
+against the ProfileMatrix incidence rows with a few matrix products.
+
+Results are identical to engine.run_profiling_engine. The weights are
+computed with the same float operations; the weighted sums are not, so a
+score that lands on a .xx5 rounding boundary is recomputed the scalar
+way before round(score, 2) — Python's round, not np.round (which rounds
+differently at .xx5). generate_project_reports_bulk uses this path when
+NumPy is installed.
+"""
+
+from .engine import (
+    MIN_PRIMARY_FOR_UNLOCK,
+    SECONDARY_COMPETENCY_WEIGHT,
+    TOP_PROFILES_COUNT,
+    _calculate_profile_score,
+)
+from .profile_matrix import get_profile_matrix
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+# How close to a .xx5 rounding boundary (in hundredths) a matrix-product
+# score must be to be recomputed in the scalar engine's summation order
+ROUNDING_TOLERANCE = 1e-6
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('The vectorized profiling path requires NumPy (pip install numpy).')
+
+
+# ─────────────────────────────────────────────
+# Input: { student: { competency_id: score } } → matrix
+# ─────────────────────────────────────────────
+
+def build_score_matrix(scores_by_student, competency_ids=None):
+    """
+    scores_by_student: { student_key: { competency_id: score } }
+                       (e.g. per-project or annual passport scores)
+
+    Returns (student_keys, competency_ids, values, mask):
+      values — float64 (n_students, n_competencies), NaN where missing
+      mask   — bool, True where the competency was assessed
+    """
+    _require_numpy()
+
+    student_keys = list(scores_by_student)
+    if competency_ids is None:
+        competency_ids = sorted({c for scores in scores_by_student.values() for c in scores})
+    col = {cid: j for j, cid in enumerate(competency_ids)}
+
+    values = np.full((len(student_keys), len(competency_ids)), np.nan, dtype=np.float64)
+    for i, key in enumerate(student_keys):
+        for cid, score in scores_by_student[key].items():
+            j = col.get(cid)
+            if j is not None:
+                values[i, j] = score
+
+    return student_keys, list(competency_ids), values, ~np.isnan(values)
+
+
+# ─────────────────────────────────────────────
+# Profiling over the whole matrix
+# ─────────────────────────────────────────────
+
+def _incidence(matrix, competency_ids):
+    """
+    The matrix's profile × competency incidence rows, re-indexed to the
+    score matrix columns: (primary, secondary), float64 0/1 arrays of shape
+    (n_profiles, n_columns). Competencies no profile uses stay all-zero.
+    """
+    n_profiles = len(matrix.profiles)
+    index      = np.array([matrix.competency_index.get(cid, -1) for cid in competency_ids], dtype=np.intp)
+    known      = index >= 0
+
+    primary   = np.zeros((n_profiles, len(competency_ids)), dtype=np.float64)
+    secondary = np.zeros((n_profiles, len(competency_ids)), dtype=np.float64)
+    if n_profiles and matrix.competency_ids:
+        primary[:, known]   = np.array(matrix.primary_incidence, dtype=np.float64)[:, index[known]]
+        secondary[:, known] = np.array(matrix.secondary_incidence, dtype=np.float64)[:, index[known]]
+    return primary, secondary
+
+
+def score_profiles(values, mask, competency_ids, matrix=None):
+    """
+    values, mask: (n_students, n_competencies) as from build_score_matrix
+    competency_ids: column → competency id
+    matrix: ProfileMatrix (default: the current one)
+
+    With P / S the primary / secondary incidence matrices and W the
+    primary weight, every profile score is
+        W · Σ assessed primaries that are not secondary + 0.10 · Σ assessed secondaries
+    — three matrix products over the whole cohort.
+
+    Returns (profiles, unlocked, primary_weight, raw_scores):
+      unlocked       — bool  (n_students, n_profiles)
+      primary_weight — float (n_students, n_profiles), 0 where locked
+      raw_scores     — float (n_students, n_profiles), unrounded, 0 where locked;
+                       summed in a different order than the scalar engine,
+                       so it may differ from it in the last bits
+    """
+    _require_numpy()
+
+    if matrix is None:
+        matrix = get_profile_matrix()
+
+    primary, secondary = _incidence(matrix, competency_ids)
+    present            = np.where(mask, values, 0.0)
+
+    # Step 1: Unlock — assessed primaries per student and profile
+    n_assessed = mask.astype(np.float64) @ primary.T
+    unlocked   = n_assessed >= MIN_PRIMARY_FOR_UNLOCK
+
+    # Step 2: Weightage — same float ops as the scalar engine
+    remaining = 1.0 - np.array(matrix.secondary_counts, dtype=np.float64) * SECONDARY_COMPETENCY_WEIGHT
+    weight    = np.divide(
+        remaining, n_assessed,
+        out=np.zeros_like(n_assessed),
+        where=unlocked,
+    )
+
+    # Step 3: Score — a primary that is also secondary carries the secondary weight
+    raw_scores = (
+        weight * (present @ (primary * (1.0 - secondary)).T)
+        + SECONDARY_COMPETENCY_WEIGHT * (present @ secondary.T)
+    )
+
+    return matrix.profiles, unlocked, weight, np.where(unlocked, raw_scores, 0.0)
+
+
+def run_profiling_engine_bulk(values, mask, competency_ids, top_n=None, matrix=None):
+    """
+    Vectorized equivalent of calling engine.run_profiling_engine once per
+    matrix row. Returns one result list per student (same dicts, same
+    order); top_n trims each list (e.g. TOP_PROFILES_COUNT).
+    """
+    profiles, unlocked, primary_weight, raw_scores = score_profiles(
+        values, mask, competency_ids, matrix
+    )
+    col = {cid: j for j, cid in enumerate(competency_ids)}
+
+    # round(score, 2) only depends on the summation order when the score is
+    # (within float error) on a .xx5 boundary: score those few the scalar way
+    scaled     = raw_scores * 100
+    borderline = np.abs(scaled - np.floor(scaled) - 0.5) < ROUNDING_TOLERANCE
+
+    results = []
+    for i in range(values.shape[0]):
+        ranked = []
+        for k in np.flatnonzero(unlocked[i]).tolist():
+            if borderline[i, k]:
+                scores = {cid: float(values[i, j]) for j, cid in enumerate(competency_ids) if mask[i, j]}
+                score  = _calculate_profile_score(profiles[k], scores)['score']
+            else:
+                score = round(float(raw_scores[i, k]), 2)
+            ranked.append((score, k))
+        # Stable sort on score only — same tie order as the scalar engine
+        ranked.sort(key=lambda x: x[0], reverse=True)
+        if top_n is not None:
+            ranked = ranked[:top_n]
+
+        row = []
+        for score, k in ranked:
+            profile = profiles[k]
+            weight  = float(primary_weight[i, k])
+
+            weightage = {}
+            for cid in profile.primary_ids:
+                j = col.get(cid)
+                if j is not None and mask[i, j]:
+                    weightage[cid] = weight
+            for cid in profile.secondary_ids:
+                weightage[cid] = SECONDARY_COMPETENCY_WEIGHT
+
+            row.append({
+                'profile_id':   profile.id,
+                'profile_name': profile.name,
+                'profile_number': profile.number,
+                'score':        score,
+                'weightage':    weightage,
+            })
+        results.append(row)
+
+    return results
+
+
+def top_profiles_bulk(scores_by_student, top_n=TOP_PROFILES_COUNT, matrix=None):
+    """
+    { student_key: { competency_id: score } } → { student_key: top_n results }
+    """
+    student_keys, competency_ids, values, mask = build_score_matrix(scores_by_student)
+    results = run_profiling_engine_bulk(values, mask, competency_ids, top_n=top_n, matrix=matrix)
+    return dict(zip(student_keys, results))
@@ -5,7 +5,9 @@ app_name = 'coordinator'
 
 urlpatterns = [
     path('dashboard/', views.coordinator_dashboard, name='coordinator_dashboard'),
+    path('dashboard/activity/', views.activity_feed, name='activity_feed'),
     path('school-list/', views.school_list, name='school_list'),
+    path('school-list/rows/', views.school_list_rows, name='school_list_rows'),
     path('profile/', views.coordinator_profile, name='coordinator_profile'),
     path('change-password/', views.coordinator_change_password, name='coordinator_change_password'),
     path('logout/', views.coordinator_logout, name='coordinator_logout'),
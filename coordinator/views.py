@@ -4,11 +4,14 @@ from django.contrib import messages
 from django.contrib.auth import logout, update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from django.db.models import Count
-from schools.models import School, Class
+from schools.models import School
 from teacher.models import Teacher
 from student.models import Student
+from accounts.activity import feed
+from accounts.listing import rows_response, school_directory
 from django.utils import timezone
-from operator import attrgetter
+from django.http import JsonResponse
+from django.template.loader import render_to_string
 import json
 
 
@@ -55,35 +58,8 @@ def coordinator_dashboard(request):
         if school.student_count > max_students:
             max_students = school.student_count
 
-    # Recent Activities — merge recent teachers, students, classes from assigned schools
-    recent_teachers = Teacher.objects.filter(school_id__in=assigned_school_ids).order_by('-created_at')[:5]
-    recent_students = Student.objects.filter(school_id__in=assigned_school_ids).order_by('-created_at')[:5]
-    recent_classes = Class.objects.filter(school_id__in=assigned_school_ids).order_by('-created_at')[:5]
-
-    activities = []
-    for t in recent_teachers:
-        t.activity_type = 'teacher'
-        t.title = f'New Teacher Added'
-        t.description = f'{t.full_name} joined as {t.get_designation_display() if hasattr(t, "get_designation_display") else t.designation}'
-        t.school_name = t.school.school_name if t.school else '—'
-        activities.append(t)
-
-    for s in recent_students:
-        s.activity_type = 'student'
-        s.title = f'New Student Enrolled'
-        s.description = f'{s.first_name} {s.last_name} enrolled in Class {s.student_class or "—"}'
-        s.school_name = s.school.school_name if s.school else '—'
-        activities.append(s)
-
-    for c in recent_classes:
-        c.activity_type = 'class'
-        c.title = f'New Class Created'
-        c.description = f'{c.class_name} — {c.academic_year}'
-        c.school_name = c.school.school_name if c.school else '—'
-        activities.append(c)
-
-    activities.sort(key=attrgetter('created_at'), reverse=True)
-    recent_activities = activities[:5]
+    # Recent Activities — new teachers, students, classes of assigned schools
+    recent_activities, activities_next = feed(_school_scopes(assigned_school_ids))
 
     context = {
         'total_schools': total_schools,
@@ -94,10 +70,30 @@ def coordinator_dashboard(request):
         'school_summary': school_summary,
         'max_students': max_students,
         'recent_activities': recent_activities,
+        'activities_next': activities_next,
     }
     return render(request, 'coordinator/dashboard.html', context)
 
 
+def _school_scopes(school_ids):
+    from accounts.activity import school_scope
+    return [school_scope(school_id) for school_id in school_ids]
+
+
+@login_required
+@user_passes_test(is_coordinator)
+def activity_feed(request):
+    """Next page of the dashboard's activity feed ("load more")."""
+    try:
+        school_ids = request.user.program_coordinator.schools_assigned.values_list('id', flat=True)
+    except Exception:
+        school_ids = []
+
+    events, next_cursor = feed(_school_scopes(school_ids), before=request.GET.get('before'))
+    html = render_to_string('coordinator/includes/activity_items.html', {'recent_activities': events})
+    return JsonResponse({'html': html, 'next': next_cursor})
+
+
 @login_required
 @user_passes_test(is_coordinator)
 def coordinator_profile(request):
@@ -200,12 +196,19 @@ def coordinator_logout(request):
 @login_required
 @user_passes_test(is_coordinator)
 def school_list(request):
-    """School list view"""
-    # Fetch all schools from the database
-    schools = School.objects.all().order_by('-created_at')
+    """School list view (first page; school_list_rows serves the rest)"""
+    listing = school_directory().page(request.GET)
 
     context = {
-        'schools': schools,
+        'schools': listing.rows,
+        'listing': listing,
     }
 
     return render(request, 'coordinator/school-list.html', context)
+
+
+@login_required
+@user_passes_test(is_coordinator)
+def school_list_rows(request):
+    """JSON rows of the school list (search, filter, sort, next page)"""
+    return rows_response(request, school_directory(), 'coordinator/includes/school_rows.html', 'schools')
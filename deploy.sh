@@ -14,6 +14,40 @@ python manage.py migrate
 echo "👉 Collecting static files..."
 python manage.py collectstatic --noinput
 
+# Background workers: one systemd service per queue, (re)written and
+# restarted on every deploy so they run the code just pulled
+run_worker() {
+    name=$1
+    shift
+    cat > "/etc/systemd/system/enpower-$name.service" <<UNIT
+[Unit]
+Description=ENpower Skill Lab — $name
+After=network.target
+
+[Service]
+WorkingDirectory=/home/enpower-skill-lab
+ExecStart=/home/enpower-skill-lab/venv/bin/python manage.py $*
+Restart=always
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+UNIT
+    systemctl daemon-reload
+    systemctl enable --quiet "enpower-$name"
+    systemctl restart "enpower-$name"
+}
+
+echo "👉 Restarting the outbox email sender..."
+run_worker send-outbox send_outbox
+
+echo "👉 Restarting the bulk import worker..."
+run_worker import-worker import_worker
+
+echo "👉 Restarting the report workers..."
+run_worker report-worker report_worker
+run_worker refresh-outdated-reports refresh_outdated_reports --loop
+
 echo "👉 Restarting Gunicorn..."
 systemctl restart gunicorn
 
@@ -3,6 +3,13 @@ ASGI config for enpower_skill_lab project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Needed for the live score stream (teacher/api/score-stream/, Server-Sent
+Events): under ASGI an open stream is an idle coroutine, so one worker
+holds hundreds of them. Serve it with an ASGI server, e.g.
+    gunicorn enpower_skill_lab.asgi:application -k uvicorn.workers.UvicornWorker
+(or route only /teacher/api/score-stream/ to it). Under WSGI the endpoint
+answers 501 and the grid falls back to polling.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -160,6 +160,10 @@ AUTH_USER_MODEL = 'accounts.User'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploaded bulk-import files, kept outside MEDIA_ROOT (they hold personal
+# data and must not be publicly served) until the import job finishes
+BULK_IMPORT_ROOT = os.path.join(BASE_DIR, 'import_uploads')
+
 # Email Configuration - Mailtrap (Testing)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'sandbox.smtp.mailtrap.io'
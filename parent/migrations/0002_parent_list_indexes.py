@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parent', '0001_move_parent_from_superadmin'),
+        ('student', '0002_student_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parent',
+            index=models.Index(fields=['created_at', 'id'], name='parents_created_0e721a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parent',
+            index=models.Index(fields=['full_name', 'id'], name='parents_full_na_1b44e0_idx'),
+        ),
+    ]
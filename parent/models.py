@@ -167,15 +167,24 @@ class Parent(models.Model):
         verbose_name = 'Parent'
         verbose_name_plural = 'Parents'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pages of the parent list (accounts.listing)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['full_name', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.parent_id}"
 
+    @staticmethod
+    def generate_parent_id():
+        import random
+        import string
+        return 'P' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+
     def save(self, *args, **kwargs):
         if not self.parent_id:
-            import random
-            import string
-            self.parent_id = 'P' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+            self.parent_id = self.generate_parent_id()
         super().save(*args, **kwargs)
 
     @property
@@ -1,3 +1,88 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.activity import FEED_PAGE_SIZE, record_events, student_scope
+from accounts.models import ActivityEvent
+from schools.models import Class, School
+from student.models import Student
+from teacher.models import Teacher
+
+from .models import Parent
+
+
+User = get_user_model()
+
+DASHBOARD_QUERIES = 6
+
+
+class ParentDashboardQueryTests(TestCase):
+    """The dashboard's query count must not grow with the number of children."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='parent', password='pw', role='PARENT')
+        cls.parent = Parent.objects.create(
+            user=cls.user, full_name='Test Parent', relation_to_student='mother',
+            mobile_number='9000000000', email='parent@example.com', residential_address='1 Road',
+            city='Pune', state='MH', pin_code='411001', emergency_name='E',
+            emergency_relation='father', emergency_phone='9000000001',
+        )
+
+    def add_child(self, n, with_teacher_profile=True):
+        school = School.objects.create(
+            school_name=f'School {n}', school_code=f'SC{n}', city='Pune', state='MH', pincode='411001',
+        )
+        coach = User.objects.create_user(
+            username=f'coach{n}', password='pw', role='TEACHER', first_name='Coach', last_name=str(n),
+        )
+        if with_teacher_profile:
+            Teacher.objects.create(
+                user=coach, school=school, employee_id=f'EMP{n}', full_name=f'Teacher {n}',
+                date_of_birth=date(1990, 1, 1), joining_date=date(2020, 1, 1),
+                official_email=f'teacher{n}@example.com',
+            )
+        Class.objects.create(
+            school=school, grade='8', division='A', academic_year='2024-2025', thinking_coach=coach,
+        )
+        child = Student.objects.create(
+            first_name=f'Child{n}', last_name='Test', gender='male', date_of_birth=date(2012, 1, 1),
+            student_class='8', division='A', roll_number=str(n), academic_year='2024-2025',
+            gr_number=f'GR{n}', school_board='CBSE', school_email=f'child{n}@example.com',
+            enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+            emergency_mobile='9000000002', school=school,
+        )
+        self.parent.students.add(child)
+        # More events than one page, so every child gets a "load more" cursor
+        record_events([
+            ActivityEvent(scope=student_scope(child.id), kind=ActivityEvent.SCORE, title=f'Score {i}')
+            for i in range(FEED_PAGE_SIZE + 2)
+        ])
+        return child
+
+    def get_dashboard(self):
+        self.client.force_login(self.user)
+        # session, user, parent, children, classes + coaches, activities
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            response = self.client.get(reverse('parent_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_is_constant_in_children(self):
+        self.add_child(1)
+        self.get_dashboard()
+
+        self.add_child(2)
+        self.add_child(3, with_teacher_profile=False)
+        response = self.get_dashboard()
 
-# Create your tests here.
+        children = response.context['children']
+        self.assertEqual(
+            {c['first_name']: c['coach'] for c in children},
+            {'Child1': 'Teacher 1', 'Child2': 'Teacher 2', 'Child3': 'Coach 3'},
+        )
+        for child in children:
+            self.assertEqual(len(child['activities']), FEED_PAGE_SIZE)
+            self.assertIsNotNone(child['activities_next'])
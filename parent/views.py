@@ -4,11 +4,10 @@ from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from django.http import JsonResponse
-from django.utils.timesince import timesince
+from django.db.models import Q
 from .models import Parent
 from schools.models import Class
-from teacher.models import Teacher
-from competencies.models import ScoreEntry, StudentAssessmentFeedback, StudentProjectFeedback
+from accounts.activity import as_dict, feed, feeds, student_scope
 import json
 
 
@@ -20,88 +19,25 @@ def is_parent(user):
 @login_required
 @user_passes_test(is_parent)
 def parent_dashboard(request):
-    """Parent dashboard view"""
+    """
+    Parent dashboard view. Children, their classes and coaches, and their
+    activity feeds are each loaded in one query for all children, so the
+    page costs the same whether a parent has one child or five.
+    """
     children_data = []
 
     try:
         parent = Parent.objects.get(user=request.user)
-        children = parent.students.filter(is_active=True)
+        children = list(parent.students.filter(is_active=True).select_related('school'))
+        coaches = _coach_names(children)
+        activity = feeds(student_scope(child.id) for child in children)
 
         for child in children:
-            # Find thinking coach via Class model
-            coach_name = '—'
-            child_class = Class.objects.filter(
-                school=child.school,
-                grade=child.student_class,
-                division=child.division,
-                is_active=True,
-            ).select_related('thinking_coach').first()
-
-            if child_class and child_class.thinking_coach:
-                try:
-                    teacher = Teacher.objects.get(user=child_class.thinking_coach)
-                    coach_name = teacher.full_name
-                except Teacher.DoesNotExist:
-                    coach_name = child_class.thinking_coach.get_full_name() or child_class.thinking_coach.username
-
             # Build initials for avatar
-            names = child.first_name.split()
             initials = (child.first_name[0] + child.last_name[0]).upper() if child.last_name else child.first_name[:2].upper()
 
-            # Build recent activities for this child
-            activities = []
-
-            # Score entries
-            scores = ScoreEntry.objects.filter(student=child).select_related(
-                'assessment_competency__competency',
-                'assessment_competency__assessment',
-            ).order_by('-updated_at')[:5]
-            for s in scores:
-                comp_name = s.assessment_competency.competency.name if s.assessment_competency.competency else 'Unknown'
-                assess_name = s.assessment_competency.assessment.name if s.assessment_competency.assessment else ''
-                activities.append({
-                    'type': 'score',
-                    'icon': 'assignment_turned_in',
-                    'color': 'blue',
-                    'title': f'Score Recorded — {comp_name}',
-                    'description': f'{assess_name} · Score: {s.score}/10',
-                    'time': timesince(s.updated_at) + ' ago',
-                    'timestamp': s.updated_at.isoformat(),
-                })
-
-            # Assessment feedback
-            feedbacks = StudentAssessmentFeedback.objects.filter(student=child).select_related(
-                'assessment',
-            ).order_by('-updated_at')[:3]
-            for f in feedbacks:
-                activities.append({
-                    'type': 'feedback',
-                    'icon': 'comment',
-                    'color': 'purple',
-                    'title': f'Assessment Feedback',
-                    'description': f'{f.assessment.name} — {f.feedback[:80]}' if f.feedback else f.assessment.name,
-                    'time': timesince(f.updated_at) + ' ago',
-                    'timestamp': f.updated_at.isoformat(),
-                })
-
-            # Project feedback
-            proj_feedbacks = StudentProjectFeedback.objects.filter(student=child).select_related(
-                'project',
-            ).order_by('-updated_at')[:3]
-            for pf in proj_feedbacks:
-                activities.append({
-                    'type': 'project_feedback',
-                    'icon': 'rate_review',
-                    'color': 'orange',
-                    'title': f'Project Feedback — {pf.project.title}',
-                    'description': pf.feedback[:80] if pf.feedback else 'Feedback received',
-                    'time': timesince(pf.updated_at) + ' ago',
-                    'timestamp': pf.updated_at.isoformat(),
-                })
-
-            # Sort by timestamp desc, limit to 5
-            activities.sort(key=lambda x: x['timestamp'], reverse=True)
-            activities = activities[:5]
+            # Recent activities — scores and feedback recorded for this child
+            events, activities_next = activity[student_scope(child.id)]
 
             children_data.append({
                 'id': child.id,
@@ -110,10 +46,11 @@ def parent_dashboard(request):
                 'grade': f'Grade {child.student_class}',
                 'grade_section': f'Grade {child.student_class} - Section {child.division}',
                 'school': child.school.school_name if child.school else '—',
-                'coach': coach_name,
+                'coach': coaches.get(child.id, '—'),
                 'initials': initials,
                 'gender': getattr(child, 'gender', 'male'),
-                'activities': activities,
+                'activities': [as_dict(event) for event in events],
+                'activities_next': activities_next,
             })
     except Parent.DoesNotExist:
         pass
@@ -126,6 +63,51 @@ def parent_dashboard(request):
     return render(request, 'parent/dashboard.html', context)
 
 
+def _coach_names(children):
+    """
+    { child id: thinking coach name } from the children's active classes
+    (same school, grade and division) — one query, coaches joined in.
+    """
+    keys = {(child.school_id, child.student_class, child.division) for child in children if child.school_id}
+    if not keys:
+        return {}
+
+    match = Q()
+    for school_id, grade, division in keys:
+        match |= Q(school_id=school_id, grade=grade, division=division)
+
+    classes = {}
+    for cls in (Class.objects.filter(match, is_active=True)
+                .select_related('thinking_coach__teacher_profile')
+                .order_by('school', 'grade', 'division', 'id')):
+        classes.setdefault((cls.school_id, cls.grade, cls.division), cls)
+
+    names = {}
+    for child in children:
+        cls = classes.get((child.school_id, child.student_class, child.division))
+        if not cls or not cls.thinking_coach:
+            continue
+        coach = cls.thinking_coach
+        teacher = getattr(coach, 'teacher_profile', None)
+        names[child.id] = teacher.full_name if teacher else (coach.get_full_name() or coach.username)
+    return names
+
+
+@login_required
+@user_passes_test(is_parent)
+def child_activity(request, student_id):
+    """Next page of a child's activity feed ("load more")."""
+    parent = get_object_or_404(Parent, user=request.user)
+    if not parent.students.filter(id=student_id, is_active=True).exists():
+        return JsonResponse({'error': 'Student not found'}, status=404)
+
+    events, next_cursor = feed(student_scope(student_id), before=request.GET.get('before'))
+    return JsonResponse({
+        'activities': [as_dict(event) for event in events],
+        'next': next_cursor,
+    })
+
+
 @login_required
 @user_passes_test(is_parent)
 def parent_profile(request):
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_admin', '0002_schooladmin_last_password_change'),
+        ('schools', '0004_school_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schooladmin',
+            index=models.Index(fields=['created_at', 'id'], name='school_admi_created_3577eb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schooladmin',
+            index=models.Index(fields=['full_name', 'id'], name='school_admi_full_na_86495d_idx'),
+        ),
+    ]
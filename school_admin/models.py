@@ -188,6 +188,9 @@ class SchoolAdmin(models.Model):
             models.Index(fields=['email']),
             models.Index(fields=['school']),
             models.Index(fields=['account_status']),
+            # Keyset pages of the school admin list (accounts.listing)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['full_name', 'id']),
         ]
 
     def __str__(self):
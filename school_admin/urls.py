@@ -9,6 +9,7 @@ urlpatterns = [
     path('change-password/', views.school_admin_change_password, name='school_admin_change_password'),
     path('onboard-student/', views.school_admin_onboard_student, name='school_admin_onboard_student'),
     path('students/', views.school_admin_student_list, name='school_admin_student_list'),
+    path('students/rows/', views.school_admin_student_rows, name='school_admin_student_rows'),
     path('onboard-parent/', views.school_admin_onboard_parent, name='school_admin_onboard_parent'),
     path('parents/', views.school_admin_parent_list, name='school_admin_parent_list'),
 ]
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import logout
 from django.contrib import messages
+from django.http import JsonResponse
 
 # Check if user is school admin
 def is_school_admin(user):
@@ -171,7 +172,7 @@ def school_admin_onboard_student(request):
         try:
             from student.models import Student
             from django.contrib.auth import get_user_model
-            from django.core.mail import send_mail
+            from accounts.outbox import queue_email
             from django.conf import settings
             import uuid
             from datetime import date
@@ -319,14 +320,13 @@ Best regards,
 ENpower Skill Lab Team
                 """
 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
-                messages.success(request, f'Student {student.full_name} added successfully! Credentials sent to {email}')
+                messages.success(request, f'Student {student.full_name} added successfully! Credentials will be emailed to {email}')
             except Exception as mail_error:
                 messages.warning(request, f'Student added but email failed: {str(mail_error)}. Password: {temp_password}')
 
@@ -346,10 +346,8 @@ ENpower Skill Lab Team
 @login_required
 @user_passes_test(is_school_admin)
 def school_admin_student_list(request):
-    """View to display list of students for the school admin's school"""
-    from student.models import Student
+    """View to display list of students for the school admin's school (first page; school_admin_student_rows serves the rest)"""
     from .models import SchoolAdmin
-    import random
 
     # Get the school admin's school
     try:
@@ -363,22 +361,55 @@ def school_admin_student_list(request):
         messages.error(request, 'No school assigned to your account. Please contact the administrator.')
         return redirect('school_admin_dashboard')
 
-    # Get all students for this school only
-    students = Student.objects.filter(school=school).order_by('-created_at')
-
-    # Add badge colors for students without photos
-    badge_colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899', '#a855f7']
-    for student in students:
-        student.badge_color = random.choice(badge_colors)
+    # Students of this school only, one keyset page at a time
+    listing = _student_directory(school).page(request.GET)
 
     context = {
-        'students': students,
+        'students': listing.rows,
+        'listing': listing,
         'school': school,
         'page_title': 'Student List',
     }
     return render(request, 'school_admin/students-list.html', context)
 
 
+@login_required
+@user_passes_test(is_school_admin)
+def school_admin_student_rows(request):
+    """JSON rows of the school's student list (search, filter, sort, next page)"""
+    from accounts.listing import rows_response
+    from .models import SchoolAdmin
+
+    school_admin_profile = SchoolAdmin.objects.select_related('school').filter(user=request.user).first()
+    if not school_admin_profile or not school_admin_profile.school:
+        return JsonResponse({'error': 'No school assigned to your account.'}, status=403)
+
+    return rows_response(
+        request, _student_directory(school_admin_profile.school),
+        'school_admin/includes/student_rows.html', 'students',
+    )
+
+
+def _student_directory(school):
+    from accounts.listing import DirectoryList, ListFilter, badge_color
+    from student.models import Student
+
+    def student_badges(students):
+        # Badge colors for students without photos
+        badge_colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899', '#a855f7']
+        for student in students:
+            student.badge_color = badge_color(student.first_name, badge_colors)
+
+    return DirectoryList(
+        Student.objects.filter(school=school),
+        sorts={'created': 'created_at', 'name': 'first_name', 'class': 'student_class'},
+        default_sort='-created',
+        search=['first_name', 'last_name', 'gr_number', 'skill_lab_reg_id', 'school_email'],
+        filters=[ListFilter('status', 'attendance_status', 'All statuses', Student.ATTENDANCE_STATUS_CHOICES)],
+        decorate=student_badges,
+    )
+
+
 @login_required
 def school_admin_onboard_parent(request):
     """View for school admin to onboard new parents to their school"""
@@ -387,7 +418,7 @@ def school_admin_onboard_parent(request):
     from parent.models import Parent
     from student.models import Student
     from django.contrib.auth import get_user_model
-    from django.core.mail import send_mail
+    from accounts.outbox import queue_email
     from django.conf import settings
     import secrets
     import string
@@ -542,14 +573,13 @@ Best regards,
 ENpower Skill Lab Team
                 """
 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
-                messages.success(request, f'Parent "{parent.full_name}" onboarded successfully! Credentials sent to {email}')
+                messages.success(request, f'Parent "{parent.full_name}" onboarded successfully! Credentials will be emailed to {email}')
             except Exception as mail_error:
                 messages.warning(request, f'Parent added but email failed: {str(mail_error)}. Password: {temp_password}')
 
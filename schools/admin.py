@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import School, Class
+from superadmin.platform_counters import rebuild_platform_counters
 
 
 @admin.register(School)
@@ -126,11 +127,13 @@ class SchoolAdmin(admin.ModelAdmin):
     
     def mark_as_active(self, request, queryset):
         updated = queryset.update(is_active=True)
+        rebuild_platform_counters()   # update() skips the counter signals
         self.message_user(request, f'{updated} school(s) marked as active.')
     mark_as_active.short_description = "Mark selected schools as active"
     
     def mark_as_inactive(self, request, queryset):
         updated = queryset.update(is_active=False)
+        rebuild_platform_counters()
         self.message_user(request, f'{updated} school(s) marked as inactive.')
     mark_as_inactive.short_description = "Mark selected schools as inactive"
     
@@ -607,6 +607,8 @@ class School(models.Model):
             models.Index(fields=['school_code']),
             models.Index(fields=['school_name']),
             models.Index(fields=['city', 'state']),
+            # Keyset pages of the school lists (accounts.listing)
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
@@ -0,0 +1,117 @@
+// Keyset-Paginated Directory Lists
+//
+// Search, filters and sorting run on the server (accounts.listing); the
+// table holds the first page and appends the next one from the list's
+// JSON rows endpoint ({html, next, total}) when the bottom scrolls into view.
+//
+// Markup: a [data-keyset-list] element with data-url (rows endpoint),
+// data-next (cursor after the first page), data-sort, data-noun and
+// data-empty-text, holding the toolbar ([data-list-param] inputs and
+// [data-list-count]), a table with th[data-sort] headers, and a
+// .keyset-sentinel below the table.
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-keyset-list]').forEach(initKeysetList);
+});
+
+function initKeysetList(root) {
+    const tbody = root.querySelector('tbody');
+    const sentinel = root.querySelector('.keyset-sentinel');
+    const countLabel = root.querySelector('[data-list-count]');
+    let next = root.dataset.next || '';
+    let loading = false;
+    let request = 0;   // only the newest request may update the table
+
+    function listParams(cursor) {
+        const params = new URLSearchParams();
+        root.querySelectorAll('[data-list-param]').forEach(input => {
+            if (input.value.trim()) params.set(input.dataset.listParam, input.value.trim());
+        });
+        if (root.dataset.sort) params.set('sort', root.dataset.sort);
+        if (cursor) params.set('after', cursor);
+        return params;
+    }
+
+    function emptyRow() {
+        const columns = root.querySelectorAll('thead th').length || 1;
+        return `<tr><td colspan="${columns}" class="text-center text-muted py-5">${root.dataset.emptyText || 'No results found'}</td></tr>`;
+    }
+
+    function load(reset) {
+        if (!reset && (loading || !next)) return;
+        const params = listParams(reset ? '' : next);
+        const current = ++request;
+        loading = true;
+        root.classList.add('is-loading');
+
+        fetch(`${root.dataset.url}?${params}`, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(res => res.json())
+        .then(data => {
+            if (current !== request) return;
+            if (reset) {
+                tbody.innerHTML = data.html.trim() ? data.html : emptyRow();
+                // Keep the query in the address bar so reload / back keep it
+                history.replaceState(null, '', `${window.location.pathname}?${params}`);
+            } else {
+                tbody.insertAdjacentHTML('beforeend', data.html);
+            }
+            if (data.total !== null && countLabel) {
+                countLabel.textContent = `${data.total} ${root.dataset.noun || ''}`.trim();
+            }
+            next = data.next || '';
+            finish();
+        })
+        .catch(() => { if (current === request) finish(); });
+    }
+
+    function finish() {
+        loading = false;
+        root.classList.remove('is-loading');
+        // Re-observe: fires again at once if the sentinel is still on screen
+        observer.unobserve(sentinel);
+        if (next) observer.observe(sentinel);
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) load(false);
+    }, { rootMargin: '200px' });
+    if (next) observer.observe(sentinel);
+
+    // Search (debounced) and filters restart from the first page
+    let searchTimer = null;
+    root.querySelectorAll('[data-list-param]').forEach(input => {
+        if (input.tagName === 'SELECT') {
+            input.addEventListener('change', () => load(true));
+        } else {
+            input.addEventListener('input', () => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => load(true), 300);
+            });
+        }
+    });
+
+    // Sortable headers: click toggles ascending / descending
+    const headers = root.querySelectorAll('th[data-sort]');
+    function markSorted() {
+        headers.forEach(th => {
+            let icon = th.querySelector('.keyset-sort-icon');
+            if (!icon) {
+                icon = document.createElement('span');
+                icon.className = 'material-symbols-outlined keyset-sort-icon';
+                th.appendChild(icon);
+            }
+            const sort = root.dataset.sort || '';
+            const active = sort.replace(/^-/, '') === th.dataset.sort;
+            th.classList.toggle('sorted', active);
+            icon.textContent = active && sort.startsWith('-') ? 'arrow_downward' : 'arrow_upward';
+        });
+    }
+    headers.forEach(th => {
+        th.addEventListener('click', () => {
+            root.dataset.sort = root.dataset.sort === th.dataset.sort ? `-${th.dataset.sort}` : th.dataset.sort;
+            markSorted();
+            load(true);
+        });
+    });
+    markSorted();
+}
@@ -18,6 +18,30 @@ function initCoordDashboard() {
     
     // Initialize quick action buttons
     initQuickActions();
+
+    // Activity feed "load more"
+    initActivityLoadMore();
+}
+
+// Appends the next keyset page of the activity feed
+function initActivityLoadMore() {
+    const button = document.getElementById('activityLoadMore');
+    if (!button) return;
+    button.addEventListener('click', () => {
+        button.disabled = true;
+        fetch(`${button.dataset.url}?before=${encodeURIComponent(button.dataset.next)}`)
+        .then(res => res.json())
+        .then(data => {
+            document.getElementById('activityList').insertAdjacentHTML('beforeend', data.html);
+            if (data.next) {
+                button.dataset.next = data.next;
+                button.disabled = false;
+            } else {
+                button.remove();
+            }
+        })
+        .catch(() => { button.disabled = false; });
+    });
 }
 
 // Animate stat cards with a stagger effect
@@ -168,6 +168,12 @@ class Student(models.Model):
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pages of the student lists (accounts.listing)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['school', 'created_at', 'id']),
+            models.Index(fields=['first_name', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.gr_number}"
@@ -55,12 +55,15 @@ def student_reports(request):
 @user_passes_test(is_student)
 def student_reports(request):
     from competencies.models import ProjectReport
+    from competencies.engine import get_annual_passport
     student = getattr(request.user, 'student_profile', None) or getattr(request.user, 'student', None)
     reports = []
+    annual_passport = None
     if student:
         reports = ProjectReport.objects.filter(student=student).select_related('project').order_by('-project__sequence_number', '-generated_at')
+        annual_passport = get_annual_passport(student)
 
-    return render(request, 'student/reports.html', {'reports': reports})
+    return render(request, 'student/reports.html', {'reports': reports, 'annual_passport': annual_passport})
 
 
 @login_required
@@ -1,25 +1,53 @@
 """
-Bulk CSV Import for all user roles.
-Handles: sample CSV download, CSV parsing, user creation with error tracking.
+Bulk CSV / Excel Import for all user roles.
+Handles: sample CSV and workbook download, CSV and .xlsx parsing, user
+creation with error tracking.
+
+Uploads are queued as ImportJobs and imported by a worker (see
+import_jobs): the file is read incrementally and imported in chunks of
+IMPORT_CHUNK_SIZE rows. A workbook may hold one sheet per role (named
+after the role, e.g. "Students"); each role's import reads its own sheet.
+.xlsx support needs openpyxl.
 """
 import csv
 import io
+import itertools
 import json
 import secrets
 import string
-from datetime import datetime
+import zipfile
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, time
 
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.conf import settings
-from django.db import transaction
-
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.apps import apps
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+
+from accounts.activity import record_events, student_events, teacher_events
+from accounts.search import index_objects
+from accounts.outbox import build_email, queue_emails
 from schools.models import School
 
+from .hashing import PasswordHashPool
+from .platform_counters import count_created
+
+try:
+    import openpyxl
+except ImportError:  # openpyxl is optional; only .xlsx uploads need it
+    openpyxl = None
+
 User = get_user_model()
 
+IMPORT_CHUNK_SIZE = 500   # rows validated and written per transaction
+UPLOAD_EXTENSIONS = ('.csv', '.xlsx')
+
 
 def is_superadmin(user):
     return user.is_authenticated and user.role == "SUPER_ADMIN"
@@ -322,6 +350,30 @@ def download_sample_csv(request, role):
     return response
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def download_sample_workbook(request):
+    """One .xlsx with a sheet per role, from the same SAMPLE_DATA."""
+    if openpyxl is None:
+        return JsonResponse({'error': 'Excel support is not installed on the server'}, status=501)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    for role, data in SAMPLE_DATA.items():
+        sheet = workbook.create_sheet(f'{ROLE_LABELS[role]}s')
+        sheet.append(data['headers'])
+        for row in data['rows']:
+            sheet.append(row)
+
+    output = io.BytesIO()
+    workbook.save(output)
+    response = HttpResponse(
+        output.getvalue(),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+    response['Content-Disposition'] = 'attachment; filename="sample_import.xlsx"'
+    return response
+
+
 # ============================================================
 # BULK IMPORT PROCESSOR
 # ============================================================
@@ -329,6 +381,21 @@ def download_sample_csv(request, role):
 @login_required
 @user_passes_test(is_superadmin)
 def bulk_import(request, role):
+    """
+    Checks the upload's header row and queues it as an ImportJob; the
+    rows are imported by `manage.py import_worker`. The client polls
+    bulk_import_status with the returned job id. A file uploaded before
+    gets its earlier job back (finished, or resumed where it stopped),
+    unless that job had failed rows or rerun=1 is posted — then the file
+    is imported again.
+
+    With dry_run=1 the job only validates the file — every check a real
+    import makes, with the same lookups — and reports which rows would
+    succeed or fail, without hashing passwords, creating accounts or
+    queueing mail.
+    """
+    from .import_jobs import enqueue_import
+
     if request.method != 'POST':
         return JsonResponse({'error': 'POST required'}, status=405)
 
@@ -339,50 +406,505 @@ def bulk_import(request, role):
     if not csv_file:
         return JsonResponse({'error': 'No file uploaded'}, status=400)
 
-    if not csv_file.name.endswith('.csv'):
-        return JsonResponse({'error': 'Please upload a CSV file'}, status=400)
+    if not csv_file.name.lower().endswith(UPLOAD_EXTENSIONS):
+        return JsonResponse({'error': 'Please upload a CSV or Excel (.xlsx) file'}, status=400)
 
     try:
-        decoded = csv_file.read().decode('utf-8-sig')
-        reader = csv.DictReader(io.StringIO(decoded))
-        rows = list(reader)
-    except Exception as e:
-        return JsonResponse({'error': f'Error reading CSV: {str(e)}'}, status=400)
+        with open_upload(csv_file, csv_file.name, role):
+            pass   # header check only
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    dry_run = request.POST.get('dry_run', '').lower() in ('1', 'true', 'yes', 'on')
+    rerun   = request.POST.get('rerun', '').lower() in ('1', 'true', 'yes', 'on')
+
+    csv_file.seek(0)
+    job, created = enqueue_import(role, csv_file, request.user, dry_run=dry_run, rerun=rerun)
+    return JsonResponse({
+        'job_id': job.id,
+        'status': job.status,
+        'dry_run': job.dry_run,
+        'resumed': not created,   # same file as an earlier upload
+        'status_url': reverse('bulk_import_status', args=[job.id]),
+    })
+
+
+@login_required
+@user_passes_test(is_superadmin)
+def bulk_import_status(request, job_id):
+    """Progress of a queued import; polled by the upload modal."""
+    from .import_jobs import import_job_status
+    from .models import ImportJob
+
+    job = get_object_or_404(ImportJob, id=job_id)
+    status = import_job_status(job)
+    status['results_url'] = reverse('bulk_import_results', args=[job.id])
+    return JsonResponse(status)
 
-    if not rows:
-        return JsonResponse({'error': 'CSV file is empty'}, status=400)
+
+@login_required
+@user_passes_test(is_superadmin)
+def bulk_import_results(request, job_id):
+    """Every row's outcome as a CSV download, streamed from the database."""
+    from .models import ImportJob
+
+    job = get_object_or_404(ImportJob, id=job_id)
+    rows = job.rows.order_by('row_number').values_list('row_number', 'name', 'status', 'reason')
+
+    class Echo:
+        def write(self, value):
+            return value
+
+    writer = csv.writer(Echo())
+    lines = itertools.chain(
+        [writer.writerow(['row', 'name', 'status', 'reason'])],
+        (writer.writerow(row) for row in rows.iterator(chunk_size=2000)),
+    )
+    response = StreamingHttpResponse(lines, content_type='text/csv')
+    base_name = job.file_name.rsplit('.', 1)[0]
+    suffix = 'validation' if job.dry_run else 'results'
+    response['Content-Disposition'] = f'attachment; filename="{base_name}_{suffix}.csv"'
+    return response
+
+
+# ============================================================
+# UPLOAD READERS — CSV and Excel
+# ============================================================
+
+READ_ERRORS = (UnicodeDecodeError, csv.Error, zipfile.BadZipFile)
+
+
+def _check_headers(headers, role, kind='CSV file'):
+    if not headers:
+        raise ValueError(f'{kind} is empty')
 
     # Validate headers
     expected = set(SAMPLE_DATA[role]['headers'])
-    actual = set(rows[0].keys())
-    missing = expected - actual
+    missing = expected - set(headers)
     if missing:
-        return JsonResponse({'error': f'Missing columns: {", ".join(sorted(missing))}'}, status=400)
+        raise ValueError(f'Missing columns: {", ".join(sorted(missing))}')
+
+
+def open_csv(fileobj, role):
+    """
+    Opens an uploaded CSV for streaming: it is decoded incrementally as the
+    reader asks for lines, never read whole. Checks the header row against
+    SAMPLE_DATA. Returns (stream, rows); raises ValueError with a message
+    for the user.
+    """
+    try:
+        stream = io.TextIOWrapper(getattr(fileobj, 'file', fileobj), encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(stream)
+        headers = reader.fieldnames
+        first_row = next(reader, None) if headers else None
+    except Exception as e:
+        raise ValueError(f'Error reading CSV: {str(e)}')
+
+    _check_headers(headers, role)
+    if first_row is None:
+        raise ValueError('CSV file is empty')
+
+    return stream, itertools.chain([first_row], reader)
+
+
+def _sheet_key(name):
+    key = name.strip().lower().replace('-', ' ').replace('_', ' ')
+    return ' '.join(key.split())
+
+
+def _role_sheet(workbook, role):
+    """
+    The sheet for `role`: named after the role key or label, singular or
+    plural ("student", "Students", "School Admins"...). A workbook with a
+    single sheet is used whatever its name.
+    """
+    names = set()
+    for name in (role, ROLE_LABELS[role]):
+        key = _sheet_key(name)
+        names.update([key, key + 's'])
+
+    for sheet in workbook.worksheets:
+        if _sheet_key(sheet.title) in names:
+            return sheet
+    if len(workbook.worksheets) == 1:
+        return workbook.worksheets[0]
+    raise ValueError(f'No "{ROLE_LABELS[role]}s" sheet in the workbook')
+
+
+def _cell_text(value):
+    """Excel cell → the text a CSV export would have held."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if value.time() == time(0):
+            return value.date().isoformat()
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))   # phone / pin code cells typed as numbers
+    return str(value)
+
+
+def _sheet_rows(sheet):
+    """The sheet's data rows as dicts, skipping blank rows like DictReader."""
+    rows = sheet.iter_rows(values_only=True)
+    headers = [_cell_text(cell).strip() for cell in next(rows, ())]
+    for values in rows:
+        if all(value is None or value == '' for value in values):
+            continue
+        yield {
+            header: _cell_text(value)
+            for header, value in zip(headers, values)
+            if header
+        }
+
+
+def open_xlsx(fileobj, role):
+    """
+    Opens the role's sheet of an uploaded workbook in openpyxl's read-only
+    mode: rows are parsed from the zip as they are iterated, so the sheet
+    is never loaded whole. Returns (workbook, rows); raises ValueError
+    with a message for the user.
+    """
+    if openpyxl is None:
+        raise ValueError('Excel uploads are not supported on this server; please upload a CSV file')
+
+    try:
+        workbook = openpyxl.load_workbook(
+            getattr(fileobj, 'file', fileobj), read_only=True, data_only=True
+        )
+    except Exception as e:
+        raise ValueError(f'Error reading Excel file: {str(e)}')
+
+    try:
+        sheet = _role_sheet(workbook, role)
+        header_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        _check_headers([_cell_text(cell).strip() for cell in header_row], role, kind='Sheet')
+        rows = _sheet_rows(sheet)
+        first_row = next(rows, None)
+    except ValueError:
+        workbook.close()
+        raise
+    except Exception as e:
+        workbook.close()
+        raise ValueError(f'Error reading Excel file: {str(e)}')
+
+    if first_row is None:
+        workbook.close()
+        raise ValueError('Sheet is empty')
+
+    return workbook, itertools.chain([first_row], rows)
+
+
+def is_xlsx(file_name):
+    return file_name.lower().endswith('.xlsx')
+
+
+@contextmanager
+def open_upload(fileobj, file_name, role):
+    """
+    Yields the upload's data rows as dicts keyed by the SAMPLE_DATA
+    headers, for a CSV or the role's sheet of an .xlsx. The file object
+    itself is left open.
+    """
+    if is_xlsx(file_name):
+        workbook, rows = open_xlsx(fileobj, role)
+        try:
+            yield rows
+        finally:
+            workbook.close()
+    else:
+        stream, rows = open_csv(fileobj, role)
+        try:
+            yield rows
+        finally:
+            stream.detach()
+
+
+def count_rows(fileobj, file_name, role):
+    """Data rows in an upload (quoted line breaks included), without a DB query."""
+    if is_xlsx(file_name):
+        with open_upload(fileobj, file_name, role) as rows:
+            return sum(1 for _ in rows)
+
+    stream = io.TextIOWrapper(getattr(fileobj, 'file', fileobj), encoding='utf-8-sig', newline='')
+    try:
+        return max(sum(1 for row in csv.reader(stream) if row) - 1, 0)
+    finally:
+        stream.detach()
+
+
+def _iter_chunks(rows, size=IMPORT_CHUNK_SIZE):
+    """Yields lists of (row_number, row) holding at most `size` rows each."""
+    chunk = []
+    for i, row in enumerate(rows, 1):
+        # Strip whitespace from all values (extra cells land under None)
+        row = {k: (v.strip() if v else '') for k, v in row.items() if k is not None}
+        chunk.append((i, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_upload(fileobj, file_name, role, created_by, total, save_chunk,
+                  start_after=0, dry_run=False):
+    """
+    Imports an uploaded CSV or workbook sheet IMPORT_CHUNK_SIZE rows at a
+    time, so memory stays flat however many rows the file has. Each chunk
+    is one transaction that also calls save_chunk(results, last_row, percent):
+
+      results  — [(row_number, display_name, error)], error None on success
+      last_row — the chunk's last row number: the resume checkpoint
+      percent  — last_row as a share of the file's `total` rows
+
+    Rows up to start_after were committed by an earlier run and are only
+    read (for in-file duplicate detection), never written again.
+
+    dry_run runs the same validation and preflight but writes no accounts:
+    results report what the import would do.
+
+    Raises ValueError if the file becomes unreadable part way; the chunks
+    before it are already imported.
+    """
+    lookups = ImportLookups(role)
+    total = total or 1
+    last_row = 0
+
+    with open_upload(fileobj, file_name, role) as rows, PasswordHashPool() as hash_pool:
+        try:
+            for chunk in _iter_chunks(rows):
+                last_row = chunk[-1][0]
+                done = [(n, row) for n, row in chunk if n <= start_after]
+                chunk = [(n, row) for n, row in chunk if n > start_after]
+                lookups.track_duplicates(done)
+                if not chunk:
+                    continue
+
+                with transaction.atomic():
+                    errors = _import_chunk(chunk, role, created_by, lookups, hash_pool, dry_run)
+                    results = [
+                        (row_number, _get_display_name(row, role), errors.get(row_number))
+                        for row_number, row in chunk
+                    ]
+                    save_chunk(results, last_row, min(99, last_row * 100 // total))
+        except READ_ERRORS as e:
+            raise ValueError(f'Error reading file after row {last_row}: {str(e)}')
+
+
+# ============================================================
+# BATCH INSERT
+# ============================================================
+
+def _write_accounts(accounts, role, hash_pool):
+    """
+    Inserts the validated accounts of one chunk — one bulk_create for the
+    users, one for the profiles, one for their welcome emails in the
+    outbox — in a single transaction.
+
+    accounts:  [(row_number, NewAccount)]
+    hash_pool: PasswordHashPool that hashes the chunk's passwords in parallel
+    Returns { row_number: error } for rows that could not be written.
+    """
+    if not accounts:
+        return {}
+
+    hashes = hash_pool.hash([account.password for _, account in accounts])
+    for (_, account), encoded in zip(accounts, hashes):
+        account.user.password = encoded
+
+    profile_model = apps.get_model(PROFILE_MODELS[role])
+    try:
+        with transaction.atomic():
+            _insert_accounts([account for _, account in accounts], profile_model)
+        return {}
+    except DatabaseError:
+        pass
+
+    # A value was taken since the preflight, or a unique column it does not
+    # check clashed: retry row by row so the failure lands on its own row.
+    errors = {}
+    for row_number, account in accounts:
+        try:
+            with transaction.atomic():
+                _insert_accounts([account], profile_model)
+        except DatabaseError as e:
+            errors[row_number] = str(e)
+    return errors
+
+
+def _insert_accounts(accounts, profile_model):
+    users = [account.user for account in accounts]
+    for user in users:
+        user.pk = None   # from an earlier, rolled back attempt
+    User.objects.bulk_create(users)
+
+    if any(user.pk is None for user in users):
+        # Backend that cannot return ids from a bulk insert
+        ids = dict(
+            User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id')
+        )
+        for user in users:
+            user.pk = ids[user.username]
+
+    profiles = []
+    for account in accounts:
+        account.profile.pk = None
+        account.profile.user = account.user
+        profiles.append(account.profile)
+    profile_model.objects.bulk_create(profiles)
+    # bulk_create skips post_save: update the counters, activity feeds and search index here
+    count_created(profile_model, profiles)
+    record_events(_activity_events(profiles))
+    index_objects(profiles)
+    queue_emails([_welcome_email(account) for account in accounts])
+
+
+# ============================================================
+# PREFLIGHT — set-based lookups per chunk
+# ============================================================
+
+# Role profile model per role; its email field has the CSV column's name
+PROFILE_MODELS = {
+    'school_admin': 'school_admin.SchoolAdmin',
+    'teacher': 'teacher.Teacher',
+    'student': 'student.Student',
+    'parent': 'parent.Parent',
+    'coordinator': 'coordinator.ProgramCoordinator',
+}
+
+# Login email column per role (it becomes the username)
+EMAIL_COLUMNS = {
+    'school_admin': 'email',
+    'teacher': 'official_email',
+    'student': 'school_email',
+    'parent': 'email',
+    'coordinator': 'official_email',
+}
+
+# Other columns that may appear only once in a file
+UNIQUE_COLUMNS = {
+    'student': ['gr_number'],
+    'school_admin': ['school_name'],   # one admin per school
+}
 
-    # Process each row
-    results = []
-    success_count = 0
-    fail_count = 0
 
+class ImportLookups:
+    """
+    Everything the row processors used to query row by row, resolved for a
+    whole chunk with a few IN queries, so per-row validation is dictionary
+    lookups:
+
+      existing_emails     — emails already taken (as username or profile email)
+      existing_gr_numbers — student GR numbers already taken
+      schools             — lower(school_name) → School
+      schools_with_admin  — ids of schools that have an active SchoolAdmin
+
+    Duplicates within the file are tracked across chunks: the first row
+    with a value wins, later rows with the same value fail.
+    """
+
+    def __init__(self, role):
+        self.role = role
+        self.existing_emails = set()
+        self.existing_gr_numbers = set()
+        self.schools = {}
+        self.schools_with_admin = set()
+        self.first_seen = {}    # (column, value) → row number
+        self.duplicates = {}    # row number → error (current chunk)
+
+    def track_duplicates(self, chunk):
+        """Records the chunk's unique values; later repeats become duplicates."""
+        unique_columns = [EMAIL_COLUMNS[self.role]] + UNIQUE_COLUMNS.get(self.role, [])
+
+        self.duplicates = {}
+        for row_number, row in chunk:
+            for column in unique_columns:
+                value = row.get(column)
+                if not value:
+                    continue
+                key = (column, value.lower() if column == 'school_name' else value)
+                first = self.first_seen.setdefault(key, row_number)
+                if first != row_number and row_number not in self.duplicates:
+                    self.duplicates[row_number] = f'{column} "{value}" is a duplicate of row {first}'
+
+    def resolve(self, chunk):
+        email_column = EMAIL_COLUMNS[self.role]
+        self.track_duplicates(chunk)
+
+        emails = {row[email_column] for _, row in chunk if row.get(email_column)}
+        profile_model = apps.get_model(PROFILE_MODELS[self.role])
+        self.existing_emails = set(
+            User.objects.filter(username__in=emails).values_list('username', flat=True)
+        ) | set(
+            profile_model.objects
+            .filter(**{f'{email_column}__in': emails})
+            .values_list(email_column, flat=True)
+        )
+
+        if self.role == 'student':
+            from student.models import Student
+            gr_numbers = {row['gr_number'] for _, row in chunk if row.get('gr_number')}
+            self.existing_gr_numbers = set(
+                Student.objects.filter(gr_number__in=gr_numbers).values_list('gr_number', flat=True)
+            )
+
+        names = {row['school_name'].lower() for _, row in chunk if row.get('school_name')}
+        self.schools = {}
+        if names:
+            # Same match as school_name__iexact(…).first() under School's
+            # -created_at ordering: ascending, so the newest school wins a tie
+            for school in (School.objects.annotate(name_lower=Lower('school_name'))
+                           .filter(name_lower__in=names).order_by('created_at', 'pk')):
+                self.schools[school.name_lower] = school
+
+        if self.role == 'school_admin':
+            from school_admin.models import SchoolAdmin
+            self.schools_with_admin = set(
+                SchoolAdmin.objects
+                .filter(school__in=self.schools.values(), is_active=True)
+                .values_list('school_id', flat=True)
+            )
+
+    def check_duplicate(self, row_number):
+        error = self.duplicates.get(row_number)
+        if error:
+            raise ValueError(error)
+
+    def check_email(self, email):
+        if email in self.existing_emails:
+            raise ValueError(f'Email "{email}" already exists')
+
+    def school(self, school_name):
+        school = self.schools.get(school_name.lower())
+        if not school:
+            raise ValueError(f'School "{school_name}" not found')
+        return school
+
+
+def _import_chunk(chunk, role, created_by, lookups, hash_pool, dry_run=False):
+    """
+    Validates and writes one chunk of (row_number, row); a dry run stops
+    after validation.
+    Returns { row_number: error } for the rows that failed.
+    """
     processor = ROLE_PROCESSORS[role]
+    lookups.resolve(chunk)
 
-    for i, row in enumerate(rows):
-        # Strip whitespace from all values
-        row = {k: (v.strip() if v else '') for k, v in row.items()}
+    errors = {}
+    accounts = []
+    for row_number, row in chunk:
         try:
-            processor(row, request.user)
-            success_count += 1
-            results.append({'row': i + 1, 'name': _get_display_name(row, role), 'status': 'success'})
+            lookups.check_duplicate(row_number)
+            accounts.append((row_number, processor(row, created_by, lookups)))
         except Exception as e:
-            fail_count += 1
-            results.append({'row': i + 1, 'name': _get_display_name(row, role), 'status': 'failed', 'reason': str(e)})
+            errors[row_number] = str(e)
 
-    return JsonResponse({
-        'total': len(rows),
-        'success': success_count,
-        'failed': fail_count,
-        'results': results,
-    })
+    if not dry_run:
+        errors.update(_write_accounts(accounts, role, hash_pool))
+    return errors
 
 
 def _get_display_name(row, role):
@@ -394,8 +916,22 @@ def _get_display_name(row, role):
 # ============================================================
 # PER-ROLE PROCESSORS
 # ============================================================
+# Each validates one row and returns a NewAccount with the User and role
+# profile built but not saved; _write_accounts inserts a whole chunk.
+
+NewAccount = namedtuple('NewAccount', ['user', 'profile', 'password', 'name', 'role_label'])
+
 
-def _process_school_admin(row, created_by):
+def _new_user(email, **fields):
+    """An unsaved User as create_user would build it (password set later)."""
+    return User(
+        username=User.normalize_username(email),
+        email=User.objects.normalize_email(email),
+        **fields,
+    )
+
+
+def _process_school_admin(row, created_by, lookups):
     from school_admin.models import SchoolAdmin
 
     full_name = row.get('full_name', '')
@@ -415,49 +951,45 @@ def _process_school_admin(row, created_by):
     if not school_name:
         raise ValueError('school_name is required')
 
-    school = School.objects.filter(school_name__iexact=school_name).first()
-    if not school:
-        raise ValueError(f'School "{school_name}" not found')
+    school = lookups.school(school_name)
 
-    if SchoolAdmin.objects.filter(school=school, is_active=True).exists():
+    if school.pk in lookups.schools_with_admin:
         raise ValueError(f'School "{school_name}" already has an active admin')
 
-    if User.objects.filter(username=email).exists():
-        raise ValueError(f'Email "{email}" already exists')
+    lookups.check_email(email)
 
     password = generate_password()
     name_parts = full_name.split(' ', 1)
 
-    with transaction.atomic():
-        user = User.objects.create_user(
-            username=email, email=email, password=password,
-            first_name=name_parts[0],
-            last_name=name_parts[1] if len(name_parts) > 1 else '',
-            role='SCHOOL_ADMIN',
-        )
-
-        SchoolAdmin.objects.create(
-            user=user,
-            full_name=full_name,
-            email=email,
-            phone=phone,
-            gender=gender.lower(),
-            school=school,
-            date_of_birth=_parse_date(row.get('date_of_birth')),
-            address=_opt(row.get('address')),
-            city=_opt(row.get('city')),
-            state=_opt(row.get('state')),
-            pincode=_opt(row.get('pincode')),
-            account_status='pending',
-            is_active=True,
-            temporary_password=password,
-            created_by=created_by,
-        )
-
-    _send_welcome_email(email, full_name, password, 'School Admin')
-
-
-def _process_teacher(row, created_by):
+    user = _new_user(
+        email,
+        first_name=name_parts[0],
+        last_name=name_parts[1] if len(name_parts) > 1 else '',
+        role='SCHOOL_ADMIN',
+    )
+
+    profile = SchoolAdmin(
+        user=user,
+        full_name=full_name,
+        email=email,
+        phone=phone,
+        gender=gender.lower(),
+        school=school,
+        date_of_birth=_parse_date(row.get('date_of_birth')),
+        address=_opt(row.get('address')),
+        city=_opt(row.get('city')),
+        state=_opt(row.get('state')),
+        pincode=_opt(row.get('pincode')),
+        account_status='pending',
+        is_active=True,
+        temporary_password=password,
+        created_by=created_by,
+    )
+
+    return NewAccount(user, profile, password, full_name, 'School Admin')
+
+
+def _process_teacher(row, created_by, lookups):
     from teacher.models import Teacher
 
     required = ['full_name', 'gender', 'date_of_birth', 'designation', 'qualification',
@@ -470,106 +1002,102 @@ def _process_teacher(row, created_by):
             raise ValueError(f'{field} is required')
 
     email = row['official_email']
-    if User.objects.filter(username=email).exists():
-        raise ValueError(f'Email "{email}" already exists')
+    lookups.check_email(email)
 
     school = None
     school_name = row.get('school_name', '')
     if school_name:
-        school = School.objects.filter(school_name__iexact=school_name).first()
-        if not school:
-            raise ValueError(f'School "{school_name}" not found')
+        school = lookups.school(school_name)
 
     password = generate_password()
     name_parts = row['full_name'].split(' ', 1)
     year = datetime.now().year
     emp_id = f"EMP{year}{''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))}"
 
-    with transaction.atomic():
-        user = User.objects.create_user(
-            username=email, email=email, password=password,
-            first_name=name_parts[0],
-            last_name=name_parts[1] if len(name_parts) > 1 else '',
-            role='THINKING_COACH',
-        )
-
-        Teacher.objects.create(
-            user=user,
-            school=school,
-            employee_id=emp_id,
-            # A. Basic Information
-            full_name=row['full_name'],
-            gender=row['gender'].lower(),
-            date_of_birth=_parse_date(row['date_of_birth']),
-            blood_group=_opt(row.get('blood_group')),
-            nationality=row.get('nationality') or 'Indian',
-            aadhar_number=_opt(row.get('aadhar_number')),
-            pan_number=(_opt(row.get('pan_number')) or '').upper() or None,
-            # B. Professional Details
-            designation=row['designation'],
-            qualification=row['qualification'],
-            specialization=_opt(row.get('specialization')),
-            total_experience=row['total_experience'],
-            skill_training_experience=_opt(row.get('skill_training_experience')),
-            previous_organizations=_opt(row.get('previous_organizations')),
-            certifications=_opt(row.get('certifications')),
-            languages_known=_opt(row.get('languages_known')),
-            grades_taught=_opt(row.get('grades_taught')),
-            training_style=_opt(row.get('training_style')),
-            # C. Contact Information
-            mobile_number=row['mobile_number'],
-            alternate_number=_opt(row.get('alternate_number')),
-            official_email=email,
-            personal_email=_opt(row.get('personal_email')),
-            # D. Address Details
-            current_address=row['current_address'],
-            permanent_address=_opt(row.get('permanent_address')),
-            city=row['city'],
-            state=row['state'],
-            pin_code=row['pin_code'],
-            # E. Skill Lab Work Details
-            skill_lab_center=_opt(row.get('skill_lab_center')),
-            branch_location=_opt(row.get('branch_location')),
-            batch_timings=_opt(row.get('batch_timings')),
-            weekly_timetable=_opt(row.get('weekly_timetable')),
-            student_groups=_opt(row.get('student_groups')),
-            modules_assigned=_opt(row.get('modules_assigned')),
-            active_classes=_opt(row.get('active_classes')),
-            total_students=_opt_int(row.get('total_students'), 0),
-            dashboard_role=_opt(row.get('dashboard_role')),
-            joining_date=_parse_date(row['joining_date']),
-            contract_end_date=_parse_date(row.get('contract_end_date')),
-            employment_type=row['employment_type'],
-            # F. Emergency Information
-            emergency_contact_name=row['emergency_contact_name'],
-            emergency_relation=row['emergency_relation'],
-            emergency_mobile=row['emergency_mobile'],
-            emergency_secondary=_opt(row.get('emergency_secondary')),
-            health_notes=_opt(row.get('health_notes')),
-            # G. Compliance & Documentation
-            id_proof_submitted=_opt(row.get('id_proof_submitted')),
-            address_proof_submitted=_opt(row.get('address_proof_submitted')),
-            police_verification=_opt(row.get('police_verification')),
-            contract_uploaded=_opt(row.get('contract_uploaded')),
-            pan_aadhar_linked=_opt(row.get('pan_aadhar_linked')),
-            bank_details_submitted=_opt(row.get('bank_details_submitted')),
-            # H. Bank Details
-            bank_name=_opt(row.get('bank_name')),
-            branch_name=_opt(row.get('branch_name')),
-            bank_account_number=_opt(row.get('bank_account_number')),
-            ifsc_code=(_opt(row.get('ifsc_code')) or '').upper() or None,
-            # I. Additional Optional Data
-            hobbies=_opt(row.get('hobbies')),
-            strength_areas=_opt(row.get('strength_areas')),
-            improvement_areas=_opt(row.get('improvement_areas')),
-            training_resources=_opt(row.get('training_resources')),
-            achievements=_opt(row.get('achievements')),
-        )
-
-    _send_welcome_email(email, row['full_name'], password, 'Thinking Coach')
-
-
-def _process_student(row, created_by):
+    user = _new_user(
+        email,
+        first_name=name_parts[0],
+        last_name=name_parts[1] if len(name_parts) > 1 else '',
+        role='THINKING_COACH',
+    )
+
+    profile = Teacher(
+        user=user,
+        school=school,
+        employee_id=emp_id,
+        # A. Basic Information
+        full_name=row['full_name'],
+        gender=row['gender'].lower(),
+        date_of_birth=_parse_date(row['date_of_birth']),
+        blood_group=_opt(row.get('blood_group')),
+        nationality=row.get('nationality') or 'Indian',
+        aadhar_number=_opt(row.get('aadhar_number')),
+        pan_number=(_opt(row.get('pan_number')) or '').upper() or None,
+        # B. Professional Details
+        designation=row['designation'],
+        qualification=row['qualification'],
+        specialization=_opt(row.get('specialization')),
+        total_experience=row['total_experience'],
+        skill_training_experience=_opt(row.get('skill_training_experience')),
+        previous_organizations=_opt(row.get('previous_organizations')),
+        certifications=_opt(row.get('certifications')),
+        languages_known=_opt(row.get('languages_known')),
+        grades_taught=_opt(row.get('grades_taught')),
+        training_style=_opt(row.get('training_style')),
+        # C. Contact Information
+        mobile_number=row['mobile_number'],
+        alternate_number=_opt(row.get('alternate_number')),
+        official_email=email,
+        personal_email=_opt(row.get('personal_email')),
+        # D. Address Details
+        current_address=row['current_address'],
+        permanent_address=_opt(row.get('permanent_address')),
+        city=row['city'],
+        state=row['state'],
+        pin_code=row['pin_code'],
+        # E. Skill Lab Work Details
+        skill_lab_center=_opt(row.get('skill_lab_center')),
+        branch_location=_opt(row.get('branch_location')),
+        batch_timings=_opt(row.get('batch_timings')),
+        weekly_timetable=_opt(row.get('weekly_timetable')),
+        student_groups=_opt(row.get('student_groups')),
+        modules_assigned=_opt(row.get('modules_assigned')),
+        active_classes=_opt(row.get('active_classes')),
+        total_students=_opt_int(row.get('total_students'), 0),
+        dashboard_role=_opt(row.get('dashboard_role')),
+        joining_date=_parse_date(row['joining_date']),
+        contract_end_date=_parse_date(row.get('contract_end_date')),
+        employment_type=row['employment_type'],
+        # F. Emergency Information
+        emergency_contact_name=row['emergency_contact_name'],
+        emergency_relation=row['emergency_relation'],
+        emergency_mobile=row['emergency_mobile'],
+        emergency_secondary=_opt(row.get('emergency_secondary')),
+        health_notes=_opt(row.get('health_notes')),
+        # G. Compliance & Documentation
+        id_proof_submitted=_opt(row.get('id_proof_submitted')),
+        address_proof_submitted=_opt(row.get('address_proof_submitted')),
+        police_verification=_opt(row.get('police_verification')),
+        contract_uploaded=_opt(row.get('contract_uploaded')),
+        pan_aadhar_linked=_opt(row.get('pan_aadhar_linked')),
+        bank_details_submitted=_opt(row.get('bank_details_submitted')),
+        # H. Bank Details
+        bank_name=_opt(row.get('bank_name')),
+        branch_name=_opt(row.get('branch_name')),
+        bank_account_number=_opt(row.get('bank_account_number')),
+        ifsc_code=(_opt(row.get('ifsc_code')) or '').upper() or None,
+        # I. Additional Optional Data
+        hobbies=_opt(row.get('hobbies')),
+        strength_areas=_opt(row.get('strength_areas')),
+        improvement_areas=_opt(row.get('improvement_areas')),
+        training_resources=_opt(row.get('training_resources')),
+        achievements=_opt(row.get('achievements')),
+    )
+
+    return NewAccount(user, profile, password, row['full_name'], 'Thinking Coach')
+
+
+def _process_student(row, created_by, lookups):
     from student.models import Student
 
     required = ['first_name', 'last_name', 'gender', 'date_of_birth', 'school_board',
@@ -584,102 +1112,98 @@ def _process_student(row, created_by):
     email = row['school_email']
     gr_number = row['gr_number']
 
-    if User.objects.filter(username=email).exists():
-        raise ValueError(f'Email "{email}" already exists')
+    lookups.check_email(email)
 
-    if Student.objects.filter(gr_number=gr_number).exists():
+    if gr_number in lookups.existing_gr_numbers:
         raise ValueError(f'GR Number "{gr_number}" already exists')
 
     school = None
     school_name = row.get('school_name', '')
     if school_name:
-        school = School.objects.filter(school_name__iexact=school_name).first()
-        if not school:
-            raise ValueError(f'School "{school_name}" not found')
+        school = lookups.school(school_name)
 
     password = generate_password()
     year = datetime.now().year
     reg_id = f"SKILL{year}{''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))}"
 
-    with transaction.atomic():
-        user = User.objects.create_user(
-            username=email, email=email, password=password,
-            first_name=row['first_name'],
-            last_name=row['last_name'],
-            role='STUDENT',
-        )
-
-        Student.objects.create(
-            user=user,
-            school=school,
-            # A. Basic Information
-            first_name=row['first_name'],
-            middle_name=_opt(row.get('middle_name')),
-            last_name=row['last_name'],
-            gender=row['gender'].lower(),
-            date_of_birth=_parse_date(row['date_of_birth']),
-            nationality=row.get('nationality') or 'Indian',
-            mother_tongue=_opt(row.get('mother_tongue')),
-            blood_group=_opt(row.get('blood_group')),
-            aadhar_number=_opt(row.get('aadhar_number')),
-            # B. Academic Details
-            school_name=school.school_name if school else (school_name or None),
-            school_branch=_opt(row.get('school_branch')),
-            student_class=row['student_class'],
-            division=row['division'],
-            roll_number=row['roll_number'],
-            academic_year=row['academic_year'],
-            gr_number=gr_number,
-            previous_school=_opt(row.get('previous_school')),
-            stream=_opt(row.get('stream')),
-            school_board=row['school_board'],
-            # C. Contact Details
-            student_mobile=_opt(row.get('student_mobile')),
-            school_email=email,
-            personal_email=_opt(row.get('personal_email')),
-            address=_opt(row.get('address')),
-            # D. Skill Lab Details
-            skill_lab_reg_id=reg_id,
-            enrollment_date=_parse_date(row['enrollment_date']),
-            skills_enrolled=_opt(row.get('skills_enrolled')),
-            current_skill_level=_opt(row.get('current_skill_level')),
-            assigned_trainer=_opt(row.get('assigned_trainer')),
-            batch_timing=_opt(row.get('batch_timing')),
-            learning_style=_opt(row.get('learning_style')),
-            interests_aptitude=_opt(row.get('interests_aptitude')),
-            preferred_language=_opt(row.get('preferred_language')),
-            practice_hours=_opt_int(row.get('practice_hours'), 0),
-            certificates_earned=_opt(row.get('certificates_earned')),
-            badges_earned=_opt(row.get('badges_earned')),
-            # E. Health & Safety
-            medical_conditions=_opt(row.get('medical_conditions')),
-            allergies=_opt(row.get('allergies')),
-            emergency_instructions=_opt(row.get('emergency_instructions')),
-            doctor_name=_opt(row.get('doctor_name')),
-            doctor_contact=_opt(row.get('doctor_contact')),
-            physical_limitations=_opt(row.get('physical_limitations')),
-            # F. Emergency Contact
-            emergency_name=row['emergency_name'],
-            emergency_relationship=row['emergency_relationship'],
-            emergency_mobile=row['emergency_mobile'],
-            emergency_alt_mobile=_opt(row.get('emergency_alt_mobile')),
-            emergency_address=_opt(row.get('emergency_address')),
-            # G. Family / Sibling Details
-            sibling_1_name=_opt(row.get('sibling_1_name')),
-            sibling_1_class_school=_opt(row.get('sibling_1_class_school')),
-            sibling_1_skill_lab_id=_opt(row.get('sibling_1_skill_lab_id')),
-            sibling_2_name=_opt(row.get('sibling_2_name')),
-            sibling_2_class_school=_opt(row.get('sibling_2_class_school')),
-            sibling_2_skill_lab_id=_opt(row.get('sibling_2_skill_lab_id')),
-            sibling_3_name=_opt(row.get('sibling_3_name')),
-            sibling_3_class_school=_opt(row.get('sibling_3_class_school')),
-            sibling_3_skill_lab_id=_opt(row.get('sibling_3_skill_lab_id')),
-        )
-
-    _send_welcome_email(email, f"{row['first_name']} {row['last_name']}", password, 'Student')
-
-
-def _process_parent(row, created_by):
+    user = _new_user(
+        email,
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        role='STUDENT',
+    )
+
+    profile = Student(
+        user=user,
+        school=school,
+        # A. Basic Information
+        first_name=row['first_name'],
+        middle_name=_opt(row.get('middle_name')),
+        last_name=row['last_name'],
+        gender=row['gender'].lower(),
+        date_of_birth=_parse_date(row['date_of_birth']),
+        nationality=row.get('nationality') or 'Indian',
+        mother_tongue=_opt(row.get('mother_tongue')),
+        blood_group=_opt(row.get('blood_group')),
+        aadhar_number=_opt(row.get('aadhar_number')),
+        # B. Academic Details
+        school_name=school.school_name if school else (school_name or None),
+        school_branch=_opt(row.get('school_branch')),
+        student_class=row['student_class'],
+        division=row['division'],
+        roll_number=row['roll_number'],
+        academic_year=row['academic_year'],
+        gr_number=gr_number,
+        previous_school=_opt(row.get('previous_school')),
+        stream=_opt(row.get('stream')),
+        school_board=row['school_board'],
+        # C. Contact Details
+        student_mobile=_opt(row.get('student_mobile')),
+        school_email=email,
+        personal_email=_opt(row.get('personal_email')),
+        address=_opt(row.get('address')),
+        # D. Skill Lab Details
+        skill_lab_reg_id=reg_id,
+        enrollment_date=_parse_date(row['enrollment_date']),
+        skills_enrolled=_opt(row.get('skills_enrolled')),
+        current_skill_level=_opt(row.get('current_skill_level')),
+        assigned_trainer=_opt(row.get('assigned_trainer')),
+        batch_timing=_opt(row.get('batch_timing')),
+        learning_style=_opt(row.get('learning_style')),
+        interests_aptitude=_opt(row.get('interests_aptitude')),
+        preferred_language=_opt(row.get('preferred_language')),
+        practice_hours=_opt_int(row.get('practice_hours'), 0),
+        certificates_earned=_opt(row.get('certificates_earned')),
+        badges_earned=_opt(row.get('badges_earned')),
+        # E. Health & Safety
+        medical_conditions=_opt(row.get('medical_conditions')),
+        allergies=_opt(row.get('allergies')),
+        emergency_instructions=_opt(row.get('emergency_instructions')),
+        doctor_name=_opt(row.get('doctor_name')),
+        doctor_contact=_opt(row.get('doctor_contact')),
+        physical_limitations=_opt(row.get('physical_limitations')),
+        # F. Emergency Contact
+        emergency_name=row['emergency_name'],
+        emergency_relationship=row['emergency_relationship'],
+        emergency_mobile=row['emergency_mobile'],
+        emergency_alt_mobile=_opt(row.get('emergency_alt_mobile')),
+        emergency_address=_opt(row.get('emergency_address')),
+        # G. Family / Sibling Details
+        sibling_1_name=_opt(row.get('sibling_1_name')),
+        sibling_1_class_school=_opt(row.get('sibling_1_class_school')),
+        sibling_1_skill_lab_id=_opt(row.get('sibling_1_skill_lab_id')),
+        sibling_2_name=_opt(row.get('sibling_2_name')),
+        sibling_2_class_school=_opt(row.get('sibling_2_class_school')),
+        sibling_2_skill_lab_id=_opt(row.get('sibling_2_skill_lab_id')),
+        sibling_3_name=_opt(row.get('sibling_3_name')),
+        sibling_3_class_school=_opt(row.get('sibling_3_class_school')),
+        sibling_3_skill_lab_id=_opt(row.get('sibling_3_skill_lab_id')),
+    )
+
+    return NewAccount(user, profile, password, f"{row['first_name']} {row['last_name']}", 'Student')
+
+
+def _process_parent(row, created_by, lookups):
     from parent.models import Parent
 
     required = ['full_name', 'relation_to_student', 'mobile_number', 'email',
@@ -691,75 +1215,74 @@ def _process_parent(row, created_by):
             raise ValueError(f'{field} is required')
 
     email = row['email']
-    if User.objects.filter(username=email).exists():
-        raise ValueError(f'Email "{email}" already exists')
+    lookups.check_email(email)
 
     password = generate_password()
     name_parts = row['full_name'].split(' ', 1)
 
-    with transaction.atomic():
-        user = User.objects.create_user(
-            username=email, email=email, password=password,
-            first_name=name_parts[0],
-            last_name=name_parts[1] if len(name_parts) > 1 else '',
-            role='PARENT',
-        )
-
-        Parent.objects.create(
-            user=user,
-            # A. Primary Parent / Guardian Details
-            full_name=row['full_name'],
-            relation_to_student=row['relation_to_student'].lower(),
-            mobile_number=row['mobile_number'],
-            alternate_mobile=_opt(row.get('alternate_mobile')),
-            email=email,
-            occupation=_opt(row.get('occupation')),
-            organization=_opt(row.get('organization')),
-            education_level=_opt(row.get('education_level')),
-            id_proof=_opt(row.get('id_proof')),
-            # B. Secondary Parent / Guardian
-            secondary_full_name=_opt(row.get('secondary_full_name')),
-            secondary_relation=_opt(row.get('secondary_relation')),
-            secondary_mobile=_opt(row.get('secondary_mobile')),
-            secondary_email=_opt(row.get('secondary_email')),
-            secondary_occupation=_opt(row.get('secondary_occupation')),
-            preferred_contact=row.get('preferred_contact') or 'primary',
-            # C. Contact & Address
-            residential_address=row['residential_address'],
-            landmark=_opt(row.get('landmark')),
-            city=row['city'],
-            state=row['state'],
-            pin_code=row['pin_code'],
-            permanent_address=_opt(row.get('permanent_address')),
-            # D. Communication Preferences
-            contact_method=row.get('contact_method') or 'whatsapp',
-            preferred_language=row.get('preferred_language') or 'english',
-            dnd_timings=_opt(row.get('dnd_timings')),
-            whatsapp_consent=_opt_bool(row.get('whatsapp_consent'), True),
-            photo_consent=_opt_bool(row.get('photo_consent'), True),
-            # E. Financial & Administrative
-            fee_category=row.get('fee_category') or 'regular',
-            payment_mode=_opt(row.get('payment_mode')),
-            billing_email=_opt(row.get('billing_email')),
-            gst_number=_opt(row.get('gst_number')),
-            # F. Emergency Contacts
-            emergency_name=row['emergency_name'],
-            emergency_relation=row['emergency_relation'],
-            emergency_phone=row['emergency_phone'],
-            emergency_address=_opt(row.get('emergency_address')),
-            # G. Parent Involvement
-            meeting_availability=_opt(row.get('meeting_availability')),
-            volunteer_interest=_opt(row.get('volunteer_interest')),
-            parent_skills=_opt(row.get('parent_skills')),
-            # Status
-            account_status='pending',
-            is_active=True,
-        )
-
-    _send_welcome_email(email, row['full_name'], password, 'Parent')
-
-
-def _process_coordinator(row, created_by):
+    user = _new_user(
+        email,
+        first_name=name_parts[0],
+        last_name=name_parts[1] if len(name_parts) > 1 else '',
+        role='PARENT',
+    )
+
+    profile = Parent(
+        user=user,
+        parent_id=Parent.generate_parent_id(),   # bulk_create skips Parent.save()
+        # A. Primary Parent / Guardian Details
+        full_name=row['full_name'],
+        relation_to_student=row['relation_to_student'].lower(),
+        mobile_number=row['mobile_number'],
+        alternate_mobile=_opt(row.get('alternate_mobile')),
+        email=email,
+        occupation=_opt(row.get('occupation')),
+        organization=_opt(row.get('organization')),
+        education_level=_opt(row.get('education_level')),
+        id_proof=_opt(row.get('id_proof')),
+        # B. Secondary Parent / Guardian
+        secondary_full_name=_opt(row.get('secondary_full_name')),
+        secondary_relation=_opt(row.get('secondary_relation')),
+        secondary_mobile=_opt(row.get('secondary_mobile')),
+        secondary_email=_opt(row.get('secondary_email')),
+        secondary_occupation=_opt(row.get('secondary_occupation')),
+        preferred_contact=row.get('preferred_contact') or 'primary',
+        # C. Contact & Address
+        residential_address=row['residential_address'],
+        landmark=_opt(row.get('landmark')),
+        city=row['city'],
+        state=row['state'],
+        pin_code=row['pin_code'],
+        permanent_address=_opt(row.get('permanent_address')),
+        # D. Communication Preferences
+        contact_method=row.get('contact_method') or 'whatsapp',
+        preferred_language=row.get('preferred_language') or 'english',
+        dnd_timings=_opt(row.get('dnd_timings')),
+        whatsapp_consent=_opt_bool(row.get('whatsapp_consent'), True),
+        photo_consent=_opt_bool(row.get('photo_consent'), True),
+        # E. Financial & Administrative
+        fee_category=row.get('fee_category') or 'regular',
+        payment_mode=_opt(row.get('payment_mode')),
+        billing_email=_opt(row.get('billing_email')),
+        gst_number=_opt(row.get('gst_number')),
+        # F. Emergency Contacts
+        emergency_name=row['emergency_name'],
+        emergency_relation=row['emergency_relation'],
+        emergency_phone=row['emergency_phone'],
+        emergency_address=_opt(row.get('emergency_address')),
+        # G. Parent Involvement
+        meeting_availability=_opt(row.get('meeting_availability')),
+        volunteer_interest=_opt(row.get('volunteer_interest')),
+        parent_skills=_opt(row.get('parent_skills')),
+        # Status
+        account_status='pending',
+        is_active=True,
+    )
+
+    return NewAccount(user, profile, password, row['full_name'], 'Parent')
+
+
+def _process_coordinator(row, created_by, lookups):
     from coordinator.models import ProgramCoordinator
 
     required = ['full_name', 'gender', 'date_of_birth', 'aadhar_number', 'pan_number',
@@ -773,87 +1296,85 @@ def _process_coordinator(row, created_by):
             raise ValueError(f'{field} is required')
 
     email = row['official_email']
-    if User.objects.filter(username=email).exists():
-        raise ValueError(f'Email "{email}" already exists')
+    lookups.check_email(email)
 
     password = generate_password()
     name_parts = row['full_name'].split(' ', 1)
     year = datetime.now().year
     emp_id = f"EMP{year}{''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))}"
 
-    with transaction.atomic():
-        user = User.objects.create_user(
-            username=email, email=email, password=password,
-            first_name=name_parts[0],
-            last_name=name_parts[1] if len(name_parts) > 1 else '',
-            role='PROGRAM_COORDINATOR',
-        )
-
-        ProgramCoordinator.objects.create(
-            user=user,
-            employee_id=emp_id,
-            # Basic Information
-            full_name=row['full_name'],
-            gender=row['gender'].lower(),
-            date_of_birth=_parse_date(row['date_of_birth']),
-            blood_group=_opt(row.get('blood_group')),
-            nationality=row.get('nationality') or 'Indian',
-            aadhar_number=row['aadhar_number'],
-            pan_number=row['pan_number'].upper(),
-            # Professional Details
-            designation=row['designation'],
-            qualification=row['qualification'],
-            specialization=row['specialization'],
-            total_experience=row['total_experience'],
-            program_management_exp=_opt(row.get('program_management_exp')),
-            education_exp=_opt(row.get('education_exp')),
-            previous_organizations=_opt(row.get('previous_organizations')),
-            languages_known=row['languages_known'],
-            certifications=_opt(row.get('certifications')),
-            # Contact Information
-            mobile_number=row['mobile_number'],
-            alternate_number=_opt(row.get('alternate_number')),
-            official_email=email,
-            personal_email=_opt(row.get('personal_email')),
-            # Address Details
-            current_address=row['current_address'],
-            permanent_address=_opt(row.get('permanent_address')),
-            city=row['city'],
-            state=row['state'],
-            pincode=row['pincode'],
-            # Compliance & Documentation
-            id_proof=_opt(row.get('id_proof')),
-            address_proof=_opt(row.get('address_proof')),
-            police_verification=row.get('police_verification') or 'Pending',
-            passport_photo_uploaded=row.get('passport_photo_uploaded') or 'No',
-            contract_uploaded=row.get('contract_uploaded') or 'No',
-            pan_aadhar_linked=row.get('pan_aadhar_linked') or 'No',
-            nda_signed=row.get('nda_signed') or 'No',
-            # Program & Work Assignment
-            program_assigned=_opt(row.get('program_assigned')),
-            zone_assigned=_opt(row.get('zone_assigned')),
-            branch_region=_opt(row.get('branch_region')),
-            reporting_manager=_opt(row.get('reporting_manager')),
-            login_role=_opt(row.get('login_role')),
-            joining_date=_parse_date(row['joining_date']),
-            employment_type=row['employment_type'],
-            contract_start_date=_parse_date(row.get('contract_start_date')),
-            contract_end_date=_parse_date(row.get('contract_end_date')),
-            # Bank & Payroll Details
-            bank_name=row['bank_name'],
-            branch_name=row['branch_name'],
-            account_number=row['account_number'],
-            ifsc_code=row['ifsc_code'].upper(),
-            # Additional Optional Data
-            strength_areas=_opt(row.get('strength_areas')),
-            hobbies=_opt(row.get('hobbies')),
-            work_style=_opt(row.get('work_style')),
-            tools_comfortable=_opt(row.get('tools_comfortable')),
-            achievements=_opt(row.get('achievements')),
-            career_aspirations=_opt(row.get('career_aspirations')),
-        )
-
-    _send_welcome_email(email, row['full_name'], password, 'Program Coordinator')
+    user = _new_user(
+        email,
+        first_name=name_parts[0],
+        last_name=name_parts[1] if len(name_parts) > 1 else '',
+        role='PROGRAM_COORDINATOR',
+    )
+
+    profile = ProgramCoordinator(
+        user=user,
+        employee_id=emp_id,
+        # Basic Information
+        full_name=row['full_name'],
+        gender=row['gender'].lower(),
+        date_of_birth=_parse_date(row['date_of_birth']),
+        blood_group=_opt(row.get('blood_group')),
+        nationality=row.get('nationality') or 'Indian',
+        aadhar_number=row['aadhar_number'],
+        pan_number=row['pan_number'].upper(),
+        # Professional Details
+        designation=row['designation'],
+        qualification=row['qualification'],
+        specialization=row['specialization'],
+        total_experience=row['total_experience'],
+        program_management_exp=_opt(row.get('program_management_exp')),
+        education_exp=_opt(row.get('education_exp')),
+        previous_organizations=_opt(row.get('previous_organizations')),
+        languages_known=row['languages_known'],
+        certifications=_opt(row.get('certifications')),
+        # Contact Information
+        mobile_number=row['mobile_number'],
+        alternate_number=_opt(row.get('alternate_number')),
+        official_email=email,
+        personal_email=_opt(row.get('personal_email')),
+        # Address Details
+        current_address=row['current_address'],
+        permanent_address=_opt(row.get('permanent_address')),
+        city=row['city'],
+        state=row['state'],
+        pincode=row['pincode'],
+        # Compliance & Documentation
+        id_proof=_opt(row.get('id_proof')),
+        address_proof=_opt(row.get('address_proof')),
+        police_verification=row.get('police_verification') or 'Pending',
+        passport_photo_uploaded=row.get('passport_photo_uploaded') or 'No',
+        contract_uploaded=row.get('contract_uploaded') or 'No',
+        pan_aadhar_linked=row.get('pan_aadhar_linked') or 'No',
+        nda_signed=row.get('nda_signed') or 'No',
+        # Program & Work Assignment
+        program_assigned=_opt(row.get('program_assigned')),
+        zone_assigned=_opt(row.get('zone_assigned')),
+        branch_region=_opt(row.get('branch_region')),
+        reporting_manager=_opt(row.get('reporting_manager')),
+        login_role=_opt(row.get('login_role')),
+        joining_date=_parse_date(row['joining_date']),
+        employment_type=row['employment_type'],
+        contract_start_date=_parse_date(row.get('contract_start_date')),
+        contract_end_date=_parse_date(row.get('contract_end_date')),
+        # Bank & Payroll Details
+        bank_name=row['bank_name'],
+        branch_name=row['branch_name'],
+        account_number=row['account_number'],
+        ifsc_code=row['ifsc_code'].upper(),
+        # Additional Optional Data
+        strength_areas=_opt(row.get('strength_areas')),
+        hobbies=_opt(row.get('hobbies')),
+        work_style=_opt(row.get('work_style')),
+        tools_comfortable=_opt(row.get('tools_comfortable')),
+        achievements=_opt(row.get('achievements')),
+        career_aspirations=_opt(row.get('career_aspirations')),
+    )
+
+    return NewAccount(user, profile, password, row['full_name'], 'Program Coordinator')
 
 
 # ============================================================
@@ -872,17 +1393,25 @@ def _parse_date(value):
     raise ValueError(f'Invalid date format: "{value}". Use YYYY-MM-DD')
 
 
-def _send_welcome_email(email, name, password, role_label):
-    try:
-        send_mail(
-            subject=f'Welcome to Enpower Skill Lab — {role_label} Account',
-            message=f'Hello {name},\n\nYour {role_label} account has been created.\n\nLogin: {email}\nPassword: {password}\n\nPlease change your password after first login.\n\nTeam Enpower Skill Lab',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=True,
-        )
-    except Exception:
-        pass  # Email failure should not block import
+def _activity_events(profiles):
+    build = {'teacher.Teacher': teacher_events, 'student.Student': student_events}
+    label = profiles[0]._meta.label if profiles else None
+    if label not in build:
+        return []
+    return [event for profile in profiles for event in build[label](profile)]
+
+
+def _welcome_email(account):
+    """Unsaved outbox message with the account's credentials."""
+    email = account.user.email
+    name = account.name
+    role_label = account.role_label
+    return build_email(
+        subject=f'Welcome to Enpower Skill Lab — {role_label} Account',
+        body=f'Hello {name},\n\nYour {role_label} account has been created.\n\nLogin: {email}\nPassword: {account.password}\n\nPlease change your password after first login.\n\nTeam Enpower Skill Lab',
+        recipients=[email],
+        from_email=settings.DEFAULT_FROM_EMAIL,
+    )
 
 
 ROLE_PROCESSORS = {
@@ -0,0 +1,72 @@
+"""
+Parallel password hashing for bulk user creation.
+
+PBKDF2 (Django's default hasher) is deliberately slow, so hashing one
+password per row dominates a large import. PasswordHashPool hashes a
+whole chunk across all cores with the configured default hasher: the
+result is exactly what make_password() would store, so the accounts log
+in through django.contrib.auth as usual.
+
+Workers are spawned, not forked (safe inside a threaded server), and only
+unpickle the hasher — they never set up Django or touch the database.
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher
+
+
+MIN_PARALLEL_PASSWORDS = 32   # smaller batches are hashed in-process
+
+
+def _encode(hasher, password, salt):
+    return hasher.encode(password, salt)
+
+
+class PasswordHashPool:
+    """
+    Use as a context manager around an import; the worker processes are
+    started on the first large batch and reused for every chunk after it.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def hash(self, passwords):
+        """Returns the encoded form of each password, in order."""
+        hasher = get_hasher('default')
+        salts = [hasher.salt() for _ in passwords]
+
+        if self.workers > 1 and len(passwords) >= MIN_PARALLEL_PASSWORDS:
+            try:
+                return self._hash_parallel(hasher, passwords, salts)
+            except Exception:
+                # Process pool unavailable (sandbox, broken worker): hash inline
+                self.close()
+                self.workers = 1
+
+        return [_encode(hasher, password, salt) for password, salt in zip(passwords, salts)]
+
+    def _hash_parallel(self, hasher, passwords, salts):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self.executor.map(
+            _encode, itertools.repeat(hasher), passwords, salts, chunksize=chunksize
+        ))
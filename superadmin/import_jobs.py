@@ -0,0 +1,245 @@
+"""
+Bulk Import Job Queue
+=====================
+Uploads are imported outside the HTTP request, so large rosters no longer
+hit gunicorn / nginx timeouts. Same model as the report queue
+(competencies.jobs): a table, a conditional-UPDATE claim, and a worker
+command — `manage.py import_worker`.
+
+  enqueue_import()     — saves the upload with a Pending ImportJob, or
+                         returns the job that already has this file
+  claim_import_job()   — a worker atomically takes the oldest Pending job
+  run_import_job()     — imports it chunk by chunk (bulk_import.import_upload),
+                         committing per-row results, counters and the
+                         last_row checkpoint with each chunk
+  import_job_status()  — progress polling for the upload modal
+
+Imports are resumable and idempotent: a job whose worker died is requeued
+and continues after its last committed row, and re-uploading a file that
+failed part way resumes that job instead of re-inserting the first half.
+A file whose import finished with failed rows, and any upload marked as a
+rerun, gets a new job. Dry runs are never reused — each one checks the
+file against the current database.
+"""
+
+import hashlib
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ImportJob, ImportRowResult
+
+
+STALE_AFTER      = timedelta(minutes=30)   # Running this long without progress → worker died
+PREVIEW_FAILURES = 100                     # failed rows returned with the status
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def file_sha256(uploaded):
+    digest = hashlib.sha256()
+    for chunk in uploaded.chunks():
+        digest.update(chunk)
+    uploaded.seek(0)
+    return digest.hexdigest()
+
+
+def enqueue_import(role, uploaded, user, dry_run=False, rerun=False):
+    """
+    Returns (job, created). The same file for the same role maps to one
+    job: a running one keeps running, a failed one is requeued to resume
+    after its checkpoint, and a cleanly finished one is returned as is.
+
+    A new job imports the file again when the last one finished with
+    failed rows (the data they referred to may have been fixed since —
+    rows imported the first time now fail as duplicates), or when the
+    upload asks for a rerun.
+    """
+    file_hash = file_sha256(uploaded)
+    job = None
+    if not (dry_run or rerun):
+        job = (
+            ImportJob.objects
+            .filter(role=role, file_hash=file_hash, dry_run=False)
+            .order_by('-created_at', '-id')
+            .first()
+        )
+    if job is not None and job.status == ImportJob.DONE and job.rows.filter(status=ImportRowResult.FAILED).exists():
+        job = None
+    if job is None:
+        job = ImportJob.objects.create(
+            role=role,
+            file=uploaded,
+            file_name=uploaded.name,
+            file_size=uploaded.size or 0,
+            file_hash=file_hash,
+            dry_run=dry_run,
+            created_by=user,
+        )
+        return job, True
+
+    if job.status == ImportJob.FAILED:
+        if not job.file:
+            job.file.save(uploaded.name, uploaded, save=False)
+        job.status = ImportJob.PENDING
+        job.attempts = 0
+        job.error = ''
+        job.finished_at = None
+        job.created_by = user
+        job.save(update_fields=['file', 'status', 'attempts', 'error', 'finished_at', 'created_by'])
+    return job, False
+
+
+# ─────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────
+
+def claim_import_job(worker):
+    """Moves the oldest Pending job to Running for this worker, or returns None."""
+    now = timezone.now()
+    _requeue_stale_jobs(now)
+
+    job_id = (
+        ImportJob.objects
+        .filter(status=ImportJob.PENDING)
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if job_id is None:
+        return None
+
+    token   = f'{worker}:{uuid.uuid4().hex[:8]}'
+    claimed = ImportJob.objects.filter(id=job_id, status=ImportJob.PENDING).update(
+        status=ImportJob.RUNNING, claimed_by=token, claimed_at=now, attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return None   # another worker was faster
+    return ImportJob.objects.select_related('created_by').get(id=job_id)
+
+
+def _requeue_stale_jobs(now):
+    # The worker died; the next claim resumes after the job's last_row.
+    # attempts counts claims: a file that keeps killing its worker is given up
+    # (re-uploading it resumes the job with fresh attempts).
+    stale = ImportJob.objects.filter(status=ImportJob.RUNNING, claimed_at__lt=now - STALE_AFTER)
+    with transaction.atomic():
+        stale.filter(attempts__gte=F('max_attempts')).update(
+            status=ImportJob.FAILED,
+            error='The import worker stopped while processing this file',
+            finished_at=now,
+        )
+        stale.update(status=ImportJob.PENDING, claimed_by='', claimed_at=None)
+
+
+def run_import_job(job):
+    """
+    Imports a claimed job, starting after its last_row checkpoint. Each
+    chunk's accounts, row results, counters and checkpoint commit in one
+    transaction; claimed_at doubles as the progress heartbeat.
+    """
+    from .bulk_import import count_rows, import_upload
+
+    def save_chunk(results, last_row, percent):
+        failed = sum(1 for _, _, error in results if error)
+        ImportRowResult.objects.bulk_create([
+            ImportRowResult(
+                job=job,
+                row_number=row_number,
+                name=name[:255],
+                status=ImportRowResult.FAILED if error else ImportRowResult.SUCCESS,
+                reason=error or '',
+            )
+            for row_number, name, error in results
+        ])
+        ImportJob.objects.filter(pk=job.pk).update(
+            processed=F('processed') + len(results),
+            succeeded=F('succeeded') + len(results) - failed,
+            failed=F('failed') + failed,
+            last_row=last_row,
+            percent=percent,
+            claimed_at=timezone.now(),
+        )
+
+    try:
+        with job.file.storage.open(job.file.name, 'rb') as f:
+            if job.total_rows is None:
+                job.total_rows = count_rows(f, job.file_name, job.role)
+                f.seek(0)
+                ImportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows)
+
+            import_upload(
+                f, job.file_name, job.role, job.created_by, job.total_rows, save_chunk,
+                start_after=job.last_row, dry_run=job.dry_run,
+            )
+    except Exception as exc:
+        _finish(job, ImportJob.FAILED, str(exc) or exc.__class__.__name__)
+        return
+
+    _finish(job, ImportJob.DONE)
+
+
+def _finish(job, status, error=''):
+    ImportJob.objects.filter(pk=job.pk).update(
+        status=status,
+        error=error,
+        percent=100 if status == ImportJob.DONE else F('percent'),
+        finished_at=timezone.now(),
+    )
+    if status == ImportJob.DONE and job.file:
+        # The upload holds personal data; the row results are all we keep
+        job.file.delete(save=False)
+        ImportJob.objects.filter(pk=job.pk).update(file='')
+
+
+def work_once(worker=None):
+    """Claims and runs one job. Returns True if there was one."""
+    job = claim_import_job(worker or worker_name())
+    if job is None:
+        return False
+    run_import_job(job)
+    return True
+
+
+# ─────────────────────────────────────────────
+# Status polling
+# ─────────────────────────────────────────────
+
+def import_job_status(job):
+    """
+    { job_id, status, dry_run, total, processed, success, failed,
+      remaining, percent, error, results } — results lists the first
+    failed rows once the job has finished (all rows are in the CSV
+    download). For a dry run, success / failed are what an import would do.
+    """
+    total = job.total_rows
+    status = {
+        'job_id':    job.id,
+        'status':    job.status,
+        'dry_run':   job.dry_run,
+        'total':     total,
+        'processed': job.processed,
+        'success':   job.succeeded,
+        'failed':    job.failed,
+        'remaining': max(total - job.processed, 0) if total is not None else None,
+        'percent':   job.percent,
+        'error':     job.error,
+        'results':   [],
+    }
+    if job.status in (ImportJob.DONE, ImportJob.FAILED):
+        status['results'] = list(
+            job.rows
+            .filter(status=ImportRowResult.FAILED)
+            .order_by('row_number')
+            .values('row_number', 'name', 'status', 'reason')[:PREVIEW_FAILURES]
+        )
+        for row in status['results']:
+            row['row'] = row.pop('row_number')
+    return status
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from superadmin.import_jobs import work_once, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Process queued bulk import jobs (ImportJob). Start several to import files in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait when the queue is empty (default 2).')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit instead of running forever.')
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        self.stdout.write(f'Import worker {worker} started.')
+
+        while True:
+            if work_once(worker):
+                self.stdout.write('Finished one import job.')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
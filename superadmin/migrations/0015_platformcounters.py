@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('superadmin', '0014_importjob_dry_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schools', models.IntegerField(default=0)),
+                ('active_schools', models.IntegerField(default=0)),
+                ('teachers', models.IntegerField(default=0)),
+                ('active_teachers', models.IntegerField(default=0)),
+                ('students', models.IntegerField(default=0)),
+                ('active_students', models.IntegerField(default=0)),
+                ('parents', models.IntegerField(default=0)),
+                ('coordinators', models.IntegerField(default=0)),
+                ('school_admins', models.IntegerField(default=0)),
+                ('lessons', models.IntegerField(default=0)),
+                ('classes', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Platform Counters',
+                'verbose_name_plural': 'Platform Counters',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('superadmin', '0015_platformcounters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='max_attempts',
+            field=models.PositiveSmallIntegerField(default=3),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -47,3 +49,104 @@ class SuperAdmin(models.Model):
 
     def __str__(self):
         return f"{self.full_name} - Super Admin"
+
+
+def import_upload_storage():
+    return FileSystemStorage(location=settings.BULK_IMPORT_ROOT)
+
+
+class ImportJob(models.Model):
+    """
+    One uploaded bulk-import file, processed by `manage.py import_worker`
+    (see superadmin.import_jobs). The counters and the last_row checkpoint
+    are committed with every chunk, so the upload modal can poll progress
+    and an interrupted import resumes after the last committed row.
+    Keyed by (role, file_hash): uploading the same file again reuses the
+    job instead of importing it twice. A dry_run job only validates: it
+    records the would-succeed / would-fail report and writes no accounts.
+    """
+    PENDING = 'Pending'
+    RUNNING = 'Running'
+    DONE    = 'Done'
+    FAILED  = 'Failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE,    'Done'),
+        (FAILED,  'Failed'),
+    ]
+
+    role          = models.CharField(max_length=30)
+    file          = models.FileField(upload_to='%Y/%m/', storage=import_upload_storage, blank=True)
+    file_name     = models.CharField(max_length=255)
+    file_size     = models.PositiveBigIntegerField(default=0)
+    file_hash     = models.CharField(max_length=64, blank=True, db_index=True)   # sha256 of the upload
+    dry_run       = models.BooleanField(default=False)
+    created_by    = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='import_jobs')
+    status        = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts      = models.PositiveSmallIntegerField(default=0)   # claims since the last upload
+    max_attempts  = models.PositiveSmallIntegerField(default=3)
+    total_rows    = models.PositiveIntegerField(null=True, blank=True)   # counted when the job starts
+    processed     = models.PositiveIntegerField(default=0)
+    last_row      = models.PositiveIntegerField(default=0)   # rows up to here are committed
+    succeeded     = models.PositiveIntegerField(default=0)
+    failed        = models.PositiveIntegerField(default=0)
+    percent       = models.PositiveSmallIntegerField(default=0)
+    error         = models.TextField(blank=True)
+    claimed_by    = models.CharField(max_length=100, blank=True)
+    claimed_at    = models.DateTimeField(null=True, blank=True)
+    finished_at   = models.DateTimeField(null=True, blank=True)
+    created_at    = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes  = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.role}) — {self.status}"
+
+
+class ImportRowResult(models.Model):
+    """Outcome of one data row of an ImportJob; downloadable as CSV."""
+    SUCCESS = 'success'
+    FAILED  = 'failed'
+
+    job        = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='rows')
+    row_number = models.PositiveIntegerField()
+    name       = models.CharField(max_length=255, blank=True)
+    status     = models.CharField(max_length=10)
+    reason     = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['job', 'row_number']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'row_number'], name='unique_import_row'),
+        ]
+
+
+class PlatformCounters(models.Model):
+    """
+    The superadmin dashboard's platform totals in one row (pk=1), kept up
+    to date by superadmin.signals and the bulk importer — see
+    superadmin.platform_counters. `manage.py reconcile_platform_counters`
+    recounts them from the tables.
+    """
+    schools         = models.IntegerField(default=0)
+    active_schools  = models.IntegerField(default=0)
+    teachers        = models.IntegerField(default=0)
+    active_teachers = models.IntegerField(default=0)
+    students        = models.IntegerField(default=0)
+    active_students = models.IntegerField(default=0)
+    parents         = models.IntegerField(default=0)
+    coordinators    = models.IntegerField(default=0)
+    school_admins   = models.IntegerField(default=0)
+    lessons         = models.IntegerField(default=0)
+    classes         = models.IntegerField(default=0)
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Platform Counters'
+        verbose_name_plural = 'Platform Counters'
+
+    def __str__(self):
+        return f"Platform counters (updated {self.updated_at:%Y-%m-%d %H:%M})"
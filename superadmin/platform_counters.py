@@ -0,0 +1,113 @@
+"""
+Platform Counters
+=================
+The superadmin dashboard shows platform-wide totals (schools, teachers,
+students, …). Counting every table on each page load grows with every
+onboarded school, so the totals live in one PlatformCounters row:
+
+  - superadmin.signals feeds every save / delete of a counted model
+    through apply_counter_deltas
+  - bulk writes that skip signals (the bulk importer's bulk_create) call
+    count_created() directly
+  - rebuild_platform_counters() recounts from the tables (used when the
+    row is missing, after queryset updates, and by
+    `manage.py reconcile_platform_counters`)
+
+Deltas are applied with F() expressions after the writing transaction
+commits: a rolled-back write never counts, and the one shared row is
+not held locked for the length of someone else's transaction.
+"""
+
+from collections import Counter
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import PlatformCounters
+
+
+COUNTERS_PK = 1
+
+# model → (total field, active field or None)
+COUNTED_MODELS = {
+    'schools.School':                 ('schools', 'active_schools'),
+    'teacher.Teacher':                ('teachers', 'active_teachers'),
+    'student.Student':                ('students', 'active_students'),
+    'parent.Parent':                  ('parents', None),
+    'coordinator.ProgramCoordinator': ('coordinators', None),
+    'school_admin.SchoolAdmin':       ('school_admins', None),
+    'lms.Lesson':                     ('lessons', None),
+    'schools.Class':                  ('classes', None),
+}
+
+
+def counted_models():
+    """(model, total field, active field) for every counted model."""
+    return [
+        (apps.get_model(label), total, active)
+        for label, (total, active) in COUNTED_MODELS.items()
+    ]
+
+
+def fields_for(model):
+    """(total field, active field) for a counted model, or None."""
+    return COUNTED_MODELS.get(model._meta.label)
+
+
+def apply_counter_deltas(deltas):
+    """
+    deltas: { field: n }. Applied once the current transaction commits
+    (immediately outside one).
+    """
+    deltas = {field: n for field, n in deltas.items() if n}
+    if deltas:
+        transaction.on_commit(lambda: _apply(deltas))
+
+
+def _apply(deltas):
+    updates = {field: F(field) + n for field, n in deltas.items()}
+    updated = PlatformCounters.objects.filter(pk=COUNTERS_PK).update(
+        updated_at=timezone.now(), **updates
+    )
+    if not updated:
+        # No row yet: count from the tables (already includes this write)
+        rebuild_platform_counters()
+
+
+def count_created(model, objects):
+    """Counts objects inserted without signals (bulk_create)."""
+    fields = fields_for(model)
+    if fields is None:
+        return
+    total, active = fields
+
+    deltas = Counter({total: len(objects)})
+    if active:
+        deltas[active] = sum(1 for obj in objects if obj.is_active)
+    apply_counter_deltas(deltas)
+
+
+def rebuild_platform_counters():
+    """Recounts every counter from its table. Returns the row."""
+    counters = PlatformCounters(pk=COUNTERS_PK)
+    for model, total, active in counted_models():
+        setattr(counters, total, model.objects.count())
+        if active:
+            setattr(counters, active, model.objects.filter(is_active=True).count())
+
+    try:
+        with transaction.atomic():
+            counters.save()
+    except IntegrityError:
+        pass   # created concurrently, from the same tables
+    return counters
+
+
+def platform_counters():
+    """The counters row — one query, or a full recount the first time."""
+    counters = PlatformCounters.objects.filter(pk=COUNTERS_PK).first()
+    if counters is None:
+        counters = rebuild_platform_counters()
+    return counters
@@ -0,0 +1,49 @@
+"""
+Signal handlers for the superadmin app.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .platform_counters import apply_counter_deltas, counted_models, fields_for
+
+
+# ─────────────────────────────────────────────
+# Platform counters
+# ─────────────────────────────────────────────
+
+def counted_loaded(sender, instance, **kwargs):
+    # is_active as last read from / written to the DB — the "old" side of a
+    # delta. Deferred loads leave it out rather than triggering a query.
+    instance._counted_active = instance.__dict__.get('is_active')
+
+
+def counted_saved(sender, instance, created, **kwargs):
+    total, active = fields_for(sender)
+    deltas = {}
+    if created:
+        deltas[total] = 1
+        if active and instance.is_active:
+            deltas[active] = 1
+    elif active:
+        old = getattr(instance, '_counted_active', None)
+        if old is not None and old != instance.is_active:
+            deltas[active] = 1 if instance.is_active else -1
+    apply_counter_deltas(deltas)
+
+    if active:
+        instance._counted_active = instance.is_active
+
+
+def counted_deleted(sender, instance, **kwargs):
+    total, active = fields_for(sender)
+    deltas = {total: -1}
+    if active and getattr(instance, '_counted_active', instance.is_active):
+        deltas[active] = -1
+    apply_counter_deltas(deltas)
+
+
+for _model, _total, _active in counted_models():
+    post_save.connect(counted_saved, sender=_model, dispatch_uid=f'platform_counters_save_{_total}')
+    post_delete.connect(counted_deleted, sender=_model, dispatch_uid=f'platform_counters_delete_{_total}')
+    if _active:
+        post_init.connect(counted_loaded, sender=_model, dispatch_uid=f'platform_counters_init_{_total}')
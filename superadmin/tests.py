@@ -1,3 +1,118 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from school_admin.models import SchoolAdmin
+from schools.models import School
+
+from .import_jobs import STALE_AFTER, claim_import_job, enqueue_import, work_once
+from .models import ImportJob
+
+
+User = get_user_model()
+
+SCHOOL_ADMIN_CSV = (
+    'full_name,email,phone,gender,school_name,date_of_birth,address,city,state,pincode\n'
+    'Rahul Sharma,rahul@example.com,9876543210,Male,Delhi Public School,1990-05-15,1 Road,Pune,MH,411001\n'
+    'Priya Patel,priya@example.com,9876543211,Female,Missing School,1992-08-20,2 Road,Pune,MH,411001\n'
+).encode()
+
+
+class ImportJobTestCase(TestCase):
+    """Runs uploads through the job queue with a throwaway upload directory."""
+
+    def setUp(self):
+        upload_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_root, ignore_errors=True)
+        settings_override = override_settings(BULK_IMPORT_ROOT=upload_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='super', password='pw', role='SUPER_ADMIN')
+        School.objects.create(
+            school_name='Delhi Public School', school_code='DPS1', city='Pune', state='MH', pincode='411001',
+        )
+
+    def upload(self, **kwargs):
+        uploaded = SimpleUploadedFile('admins.csv', SCHOOL_ADMIN_CSV, content_type='text/csv')
+        job, created = enqueue_import('school_admin', uploaded, self.user, **kwargs)
+        while work_once('test-worker'):
+            pass
+        job.refresh_from_db()
+        return job, created
+
+
+class ImportJobReuploadTests(ImportJobTestCase):
+    """Uploading the same file again re-imports it when rows failed the first time."""
+
+    def test_upload_fix_data_upload_again(self):
+        first, created = self.upload()
+        self.assertTrue(created)
+        self.assertEqual((first.status, first.succeeded, first.failed), (ImportJob.DONE, 1, 1))
+
+        School.objects.create(
+            school_name='Missing School', school_code='MS1', city='Pune', state='MH', pincode='411001',
+        )
+        second, created = self.upload()
+        self.assertTrue(created)
+        self.assertNotEqual(second.pk, first.pk)
+        self.assertEqual(second.status, ImportJob.DONE)
+        self.assertTrue(User.objects.filter(email='priya@example.com').exists())
+
+    def test_clean_import_is_reused_unless_rerun(self):
+        School.objects.create(
+            school_name='Missing School', school_code='MS1', city='Pune', state='MH', pincode='411001',
+        )
+        first, _ = self.upload()
+        self.assertEqual(first.failed, 0)
+
+        again, created = self.upload()
+        self.assertEqual((again.pk, created), (first.pk, False))
+
+        rerun, created = self.upload(rerun=True)
+        self.assertTrue(created)
+        self.assertNotEqual(rerun.pk, first.pk)
+
+
+class ImportSchoolLookupTests(ImportJobTestCase):
+    """Rows attach to the same school as school_name__iexact(...).first() did."""
+
+    def test_newest_of_same_named_schools_wins(self):
+        School.objects.filter(school_name='Delhi Public School').update(
+            created_at=timezone.now() - timedelta(days=30),
+        )
+        newest = School.objects.create(
+            school_name='DELHI PUBLIC SCHOOL', school_code='DPS2', city='Pune', state='MH', pincode='411001',
+        )
+        self.assertEqual(School.objects.filter(school_name__iexact='Delhi Public School').first(), newest)
+
+        job, _ = self.upload()
+        self.assertEqual(job.succeeded, 1)
+        self.assertEqual(SchoolAdmin.objects.get(email='rahul@example.com').school, newest)
+
+
+class StaleImportJobTests(TestCase):
+    """A file whose worker keeps dying is retried up to max_attempts, then failed."""
+
+    def test_stale_jobs_count_attempts(self):
+        stale_since = timezone.now() - STALE_AFTER * 2
+        retried, exhausted = [
+            ImportJob.objects.create(
+                role='school_admin', file_name=f'{attempts}.csv', status=ImportJob.RUNNING,
+                attempts=attempts, claimed_by='dead-worker', claimed_at=stale_since,
+            )
+            for attempts in [1, 3]
+        ]
+
+        claimed = claim_import_job('worker')
+
+        self.assertEqual(claimed.id, retried.id)
+        self.assertEqual(claimed.attempts, 2)
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.status, ImportJob.FAILED)
+        self.assertIsNotNone(exhausted.finished_at)
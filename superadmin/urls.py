@@ -1,28 +1,35 @@
 from django.urls import path
 from . import views
-from .bulk_import import download_sample_csv, bulk_import
+from .bulk_import import (
+    download_sample_csv, download_sample_workbook, bulk_import, bulk_import_status, bulk_import_results,
+)
 
 
 urlpatterns = [
     
     path('dashboard/', views.dashboard, name='superadmin_dashboard'),
+    path('dashboard/activity/', views.activity_feed, name='superadmin_activity_feed'),
     path('onboard-school/', views.onboard_school, name='onboard_school'),
     path('schools/', views.school_list, name='school_list'),
+    path('schools/rows/', views.school_list_rows, name='school_list_rows'),
     path('school/<int:school_id>/', views.view_school, name='view_school'),
     path('school/<int:school_id>/edit/', views.edit_school, name='edit_school'),
     path('school/<int:school_id>/delete/', views.delete_school, name='delete_school'),
     path('school-admins/', views.school_admin_list, name='school_admin_list'),
+    path('school-admins/rows/', views.school_admin_list_rows, name='school_admin_list_rows'),
     path('school-admin/<int:admin_id>/', views.view_school_admin, name='view_school_admin'),
     path('school-admin/<int:admin_id>/edit/', views.edit_school_admin, name='edit_school_admin'),
     path('school-admin/<int:admin_id>/delete/', views.delete_school_admin, name='delete_school_admin'),
     path('onboard-school-admin/', views.onboard_school_admin, name='onboard_school_admin'),
     path('onboard-student/', views.onboard_student, name='onboard_student'),
     path('students/', views.student_list, name='student_list'),
+    path('students/rows/', views.student_list_rows, name='student_list_rows'),
     path('student/<int:student_id>/', views.view_student, name='view_student'),
     path('student/<int:student_id>/edit/', views.edit_student, name='edit_student'),
     path('student/<int:student_id>/delete/', views.delete_student, name='delete_student'),
     path('onboard-teacher/', views.onboard_teacher, name='onboard_teacher'),
     path('teachers/', views.teacher_list, name='teacher_list'),
+    path('teachers/rows/', views.teacher_list_rows, name='teacher_list_rows'),
     path('teacher/<int:teacher_id>/', views.view_teacher, name='view_teacher'),
     path('teacher/<int:teacher_id>/edit/', views.edit_teacher, name='edit_teacher'),
     path('teacher/<int:teacher_id>/delete/', views.delete_teacher, name='delete_teacher'),
@@ -33,6 +40,7 @@ urlpatterns = [
     path('coordinator/<int:coordinator_id>/edit/', views.edit_coordinator, name='edit_coordinator'),
     path('coordinator/<int:coordinator_id>/delete/', views.delete_coordinator, name='delete_coordinator'),
     path('parents/', views.parent_list, name='parent_list'),
+    path('parents/rows/', views.parent_list_rows, name='parent_list_rows'),
     path('parent/<int:parent_id>/', views.view_parent, name='view_parent'),
     path('parent/<int:parent_id>/edit/', views.edit_parent, name='edit_parent'),
     path('parent/<int:parent_id>/delete/', views.delete_parent, name='delete_parent'),
@@ -56,8 +64,11 @@ urlpatterns = [
     # Bulk Upload / Manage Users
     path('bulk-upload/', views.bulk_upload_page, name='bulk_upload_page'),
     # Bulk Import URLs
+    path('bulk-import/sample-workbook.xlsx', download_sample_workbook, name='download_sample_workbook'),
     path('bulk-import/<str:role>/sample-csv/', download_sample_csv, name='download_sample_csv'),
     path('bulk-import/<str:role>/upload/', bulk_import, name='bulk_import'),
+    path('bulk-import/jobs/<int:job_id>/', bulk_import_status, name='bulk_import_status'),
+    path('bulk-import/jobs/<int:job_id>/results.csv', bulk_import_results, name='bulk_import_results'),
     # Skill Passport
     path('skill-passport/learning-pillars/', views.learning_pillars, name='learning_pillars'),
     path('skill-passport/profiles-competencies/', views.profiles_competencies, name='profiles_competencies'),
@@ -2,14 +2,18 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.http import JsonResponse
-from django.db.models import Q
+from django.template.loader import render_to_string
+from django.db.models import Exists, OuterRef, Q
 from django.contrib.auth import get_user_model, logout
 from django.contrib.auth.hashers import make_password
-from django.core.mail import send_mail
+from accounts.outbox import queue_email
 from django.conf import settings
 from django.utils import timezone
 from schools.models import School
 from school_admin.models import SchoolAdmin
+from accounts.listing import (
+    DirectoryList, ListFilter, badge_color, initials, rows_response, school_directory,
+)
 from .models import SuperAdmin
 from competencies.models import Pillar, SubPillar, Competency, Profile, Project, Assessment, AssessmentCompetency
 import json
@@ -21,6 +25,13 @@ def is_superadmin(user):
     return user.is_authenticated and user.role == "SUPER_ADMIN"
 
 
+# Directory list badges and filters (see accounts.listing)
+BADGE_COLORS_WIDE = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899', '#a855f7']
+BADGE_COLORS_PARENT = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#f97316', '#6366f1', '#ec4899', '#14b8a6']
+def _school_choices():
+    return list(School.objects.order_by('school_name').values_list('id', 'school_name'))
+
+
 # Test view for previewing toast messages (remove in production)
 @login_required
 @user_passes_test(is_superadmin)
@@ -44,86 +55,61 @@ def superadmin_logout(request):
 @login_required
 @user_passes_test(is_superadmin)
 def dashboard(request):
-    from teacher.models import Teacher
-    from student.models import Student
-    from parent.models import Parent
-    from coordinator.models import ProgramCoordinator
-    from lms.models import Lesson
-    from schools.models import Class
+    from accounts.activity import PLATFORM, feed
+    from .platform_counters import platform_counters
 
-    # Platform overview stats
-    total_schools = School.objects.count()
-    active_schools = School.objects.filter(is_active=True).count()
-    total_teachers = Teacher.objects.count()
-    total_students = Student.objects.count()
-    total_parents = Parent.objects.count()
-    total_coordinators = ProgramCoordinator.objects.count()
-    total_school_admins = SchoolAdmin.objects.count()
-    total_lessons = Lesson.objects.count()
-    total_classes = Class.objects.count()
-
-    # Active counts
-    active_teachers = Teacher.objects.filter(is_active=True).count()
-    active_students = Student.objects.filter(is_active=True).count()
+    # Platform overview stats — one row, kept current by signals
+    counters = platform_counters()
 
     # Recently added schools (5)
     recent_schools = School.objects.order_by('-created_at')[:5]
 
-    # Recent activities — mixed, sorted by created_at, limit 5 total
-    from itertools import chain
-    from operator import attrgetter
-
-    recent_activity_schools = list(School.objects.order_by('-created_at')[:5])
-    recent_activity_teachers = list(Teacher.objects.order_by('-created_at')[:5])
-    recent_activity_students = list(Student.objects.order_by('-created_at')[:5])
-
-    # Tag each item with its type for template rendering
-    for item in recent_activity_schools:
-        item.activity_type = 'school'
-    for item in recent_activity_teachers:
-        item.activity_type = 'teacher'
-    for item in recent_activity_students:
-        item.activity_type = 'student'
-
-    all_activities = sorted(
-        chain(recent_activity_schools, recent_activity_teachers, recent_activity_students),
-        key=attrgetter('created_at'),
-        reverse=True
-    )[:5]
+    # Recent activities — newest platform events (schools, teachers, students)
+    recent_activities, activities_next = feed(PLATFORM)
 
     context = {
-        'total_schools': total_schools,
-        'active_schools': active_schools,
-        'total_teachers': total_teachers,
-        'total_students': total_students,
-        'total_parents': total_parents,
-        'total_coordinators': total_coordinators,
-        'total_school_admins': total_school_admins,
-        'total_lessons': total_lessons,
-        'total_classes': total_classes,
-        'active_teachers': active_teachers,
-        'active_students': active_students,
+        'total_schools': counters.schools,
+        'active_schools': counters.active_schools,
+        'total_teachers': counters.teachers,
+        'total_students': counters.students,
+        'total_parents': counters.parents,
+        'total_coordinators': counters.coordinators,
+        'total_school_admins': counters.school_admins,
+        'total_lessons': counters.lessons,
+        'total_classes': counters.classes,
+        'active_teachers': counters.active_teachers,
+        'active_students': counters.active_students,
         'recent_schools': recent_schools,
-        'recent_activities': all_activities,
+        'recent_activities': recent_activities,
+        'activities_next': activities_next,
     }
     return render(request, 'superadmin/dashboard.html', context)
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def activity_feed(request):
+    """Next page of the dashboard's activity feed ("load more")."""
+    from accounts.activity import PLATFORM, feed
+
+    events, next_cursor = feed(PLATFORM, before=request.GET.get('before'))
+    html = render_to_string('superadmin/includes/activity_items.html', {'recent_activities': events})
+    return JsonResponse({'html': html, 'next': next_cursor})
+
+
 @login_required
 @user_passes_test(is_superadmin)
 def bulk_upload_page(request):
     """Bulk Upload / Manage Users page — all roles in one place"""
-    from teacher.models import Teacher
-    from student.models import Student
-    from parent.models import Parent
-    from coordinator.models import ProgramCoordinator
+    from .platform_counters import platform_counters
 
+    counters = platform_counters()
     context = {
-        'total_school_admins': SchoolAdmin.objects.count(),
-        'total_teachers': Teacher.objects.count(),
-        'total_students': Student.objects.count(),
-        'total_parents': Parent.objects.count(),
-        'total_coordinators': ProgramCoordinator.objects.count(),
+        'total_school_admins': counters.school_admins,
+        'total_teachers': counters.teachers,
+        'total_students': counters.students,
+        'total_parents': counters.parents,
+        'total_coordinators': counters.coordinators,
     }
     return render(request, 'superadmin/bulk-upload.html', context)
 
@@ -269,31 +255,24 @@ def onboard_school(request):
 @user_passes_test(is_superadmin)
 def school_list(request):
     """
-    View to display list of all schools.
+    View to display list of all schools — the first page; school_list_rows
+    serves searches and the following pages.
     """
-    schools = School.objects.all().order_by('-created_at')
-    
-    # Add helper properties for each school
-    colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4']
-    for school in schools:
-        # Get initials from school name
-        words = school.school_name.strip().split()
-        if len(words) >= 2:
-            school.initials = (words[0][0] + words[1][0]).upper()
-        else:
-            school.initials = school.school_name[:2].upper()
-        
-        # Assign badge color based on first character
-        school.badge_color = colors[ord(school.school_name[0]) % len(colors)]
-    
+    listing = school_directory().page(request.GET)
     context = {
-        'schools': schools,
-        'total_schools': schools.count(),
-        'active_schools': schools.filter(is_active=True).count(),
+        'schools': listing.rows,
+        'listing': listing,
     }
     return render(request, 'superadmin/school-list.html', context)
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def school_list_rows(request):
+    """JSON rows of the school list (search, filter, sort, next page)."""
+    return rows_response(request, school_directory(), 'superadmin/includes/school_rows.html', 'schools')
+
+
 @login_required
 @user_passes_test(is_superadmin)
 def view_school(request, school_id):
@@ -386,27 +365,27 @@ def delete_school(request, school_id):
 @user_passes_test(is_superadmin)
 def search_schools(request):
     """
-    AJAX endpoint to search schools by name, code, or city.
-    Returns JSON response with matching schools and their assignment status.
+    AJAX endpoint to search schools by name, code, city or email (prefix
+    matches, best first — accounts.search). Returns JSON with the matching
+    schools and whether each already has an active admin.
     """
+    from accounts.search import SearchEntry, match_ids
+
     query = request.GET.get('q', '').strip()
 
     if not query:
         return JsonResponse({'schools': []})
 
-    # Search schools by name, code, or city
-    schools = School.objects.filter(
-        Q(school_name__icontains=query) |
-        Q(school_code__icontains=query) |
-        Q(city__icontains=query)
-    ).values('id', 'school_name', 'school_code', 'city', 'state')[:10]  # Limit to 10 results
-
-    # Convert to list and add assignment status
-    schools_list = list(schools)
-    for school in schools_list:
-        # Check if this school already has an admin assigned
-        has_admin = SchoolAdmin.objects.filter(school_id=school['id'], is_active=True).exists()
-        school['has_admin'] = has_admin
+    entry_ids = match_ids(query, kinds=[SearchEntry.SCHOOL], limit=10)
+    school_of = dict(SearchEntry.objects.filter(id__in=entry_ids).values_list('id', 'object_id'))
+    ids = [school_of[entry_id] for entry_id in entry_ids if entry_id in school_of]
+    schools = {
+        school['id']: school
+        for school in School.objects.filter(id__in=ids).annotate(
+            has_admin=Exists(SchoolAdmin.objects.filter(school_id=OuterRef('pk'), is_active=True))
+        ).values('id', 'school_name', 'school_code', 'city', 'state', 'has_admin')
+    }
+    schools_list = [schools[school_id] for school_id in ids if school_id in schools]
 
     return JsonResponse({'schools': schools_list})
 
@@ -415,34 +394,47 @@ def search_schools(request):
 @user_passes_test(is_superadmin)
 def school_admin_list(request):
     """
-    View to display list of all school admins.
+    View to display list of all school admins — the first page;
+    school_admin_list_rows serves searches and the following pages.
     """
-    school_admins = SchoolAdmin.objects.select_related('school').all().order_by('-created_at')
+    listing = _school_admin_directory().page(request.GET)
+    context = {
+        'school_admins': listing.rows,
+        'listing': listing,
+    }
+    return render(request, 'superadmin/school-admin-list.html', context)
 
-    # Add helper properties for each admin
-    colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4']
+
+@login_required
+@user_passes_test(is_superadmin)
+def school_admin_list_rows(request):
+    """JSON rows of the school admin list (search, filter, sort, next page)."""
+    return rows_response(
+        request, _school_admin_directory(), 'superadmin/includes/school_admin_rows.html', 'school_admins'
+    )
+
+
+def _school_admin_directory():
+    return DirectoryList(
+        SchoolAdmin.objects.select_related('school'),
+        sorts={'created': 'created_at', 'name': 'full_name'},
+        default_sort='-created',
+        search=['full_name', 'email', 'phone', 'school__school_name'],
+        filters=[
+            ListFilter('status', 'account_status', 'All statuses', SchoolAdmin.STATUS_CHOICES),
+            ListFilter('school', 'school_id', 'All schools', _school_choices),
+        ],
+        decorate=_school_admin_badges,
+    )
+
+
+def _school_admin_badges(school_admins):
     for admin in school_admins:
-        # Get initials from admin name
-        words = admin.full_name.strip().split()
-        if len(words) >= 2:
-            admin.initials = (words[0][0] + words[1][0]).upper()
-        else:
-            admin.initials = admin.full_name[:2].upper()
-
-        # Assign badge color based on first character
-        admin.badge_color = colors[ord(admin.full_name[0]) % len(colors)]
-        
+        admin.initials = initials(admin.full_name)
+        admin.badge_color = badge_color(admin.full_name)
         # Check if profile photo file actually exists
         admin.has_photo = bool(admin.profile_photo and admin.profile_photo.name)
 
-    context = {
-        'school_admins': school_admins,
-        'total_admins': school_admins.count(),
-        'active_admins': school_admins.filter(account_status='active').count(),
-        'pending_admins': school_admins.filter(account_status='pending').count(),
-    }
-    return render(request, 'superadmin/school-admin-list.html', context)
-
 
 @login_required
 @user_passes_test(is_superadmin)
@@ -638,15 +630,14 @@ Best regards,
 Enpower Skill Lab Team
                 """
 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [school_admin.email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
 
-                messages.success(request, f'School Admin "{school_admin.full_name}" has been successfully onboarded! Credentials sent to {school_admin.email}.')
+                messages.success(request, f'School Admin "{school_admin.full_name}" has been successfully onboarded! Credentials will be emailed to {school_admin.email}.')
             except Exception as email_error:
                 messages.warning(request, f'School Admin created but email failed to send: {str(email_error)}. Temporary password: {temp_password}')
 
@@ -793,9 +784,9 @@ def change_password(request):
             
             # Send email notification
             try:
-                send_mail(
+                queue_email(
                     subject='Password Changed - ENpower Skill Lab',
-                    message=f'''Hello {request.user.get_full_name() or request.user.username},
+                    body=f'''Hello {request.user.get_full_name() or request.user.username},
 
 Your password for ENpower Skill Lab Super Admin account has been changed successfully.
 
@@ -806,14 +797,13 @@ Date & Time: {timezone.now().strftime("%B %d, %Y at %I:%M %p")}
 Best regards,
 ENpower Skill Lab Team''',
                     from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[request.user.email],
-                    fail_silently=True,
+                    recipients=[request.user.email],
                 )
             except Exception as email_error:
                 # Log email error but don't fail the password change
                 print(f"Email notification failed: {email_error}")
             
-            messages.success(request, 'Your password has been changed successfully. A confirmation email has been sent to your registered email address.')
+            messages.success(request, 'Your password has been changed successfully. A confirmation email will be sent to your registered email address.')
             
             # Re-authenticate user to prevent logout
             from django.contrib.auth import update_session_auth_hash
@@ -986,14 +976,13 @@ Best regards,
 ENpower Skill Lab Team
                 """
                 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
-                messages.success(request, f'Student {student.full_name} added successfully! Credentials sent to {email}')
+                messages.success(request, f'Student {student.full_name} added successfully! Credentials will be emailed to {email}')
             except Exception as mail_error:
                 messages.warning(request, f'Student added but email failed: {str(mail_error)}. Password: {temp_password}')
             
@@ -1015,24 +1004,43 @@ ENpower Skill Lab Team
 @login_required
 @user_passes_test(is_superadmin)
 def student_list(request):
-    """View to display list of all students"""
-    from student.models import Student
-    import random
-    
-    # Get all students
-    students = Student.objects.all().order_by('-created_at')
-    
-    # Add badge colors for students without photos
-    badge_colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899', '#a855f7']
-    for student in students:
-        student.badge_color = random.choice(badge_colors)
-    
+    """View to display list of all students (first page; student_list_rows serves the rest)"""
+    listing = _student_directory().page(request.GET)
     context = {
-        'students': students
+        'students': listing.rows,
+        'listing': listing,
     }
     return render(request, 'superadmin/students-list.html', context)
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def student_list_rows(request):
+    """JSON rows of the student list (search, filter, sort, next page)"""
+    return rows_response(request, _student_directory(), 'superadmin/includes/student_rows.html', 'students')
+
+
+def _student_directory():
+    from student.models import Student
+    return DirectoryList(
+        Student.objects.all(),
+        sorts={'created': 'created_at', 'name': 'first_name', 'class': 'student_class'},
+        default_sort='-created',
+        search=['first_name', 'last_name', 'gr_number', 'skill_lab_reg_id', 'school_email', 'school_name'],
+        filters=[
+            ListFilter('status', 'attendance_status', 'All statuses', Student.ATTENDANCE_STATUS_CHOICES),
+            ListFilter('school', 'school_id', 'All schools', _school_choices),
+        ],
+        decorate=_student_badges,
+    )
+
+
+def _student_badges(students):
+    # Badge colors for students without photos
+    for student in students:
+        student.badge_color = badge_color(student.first_name, BADGE_COLORS_WIDE)
+
+
 @login_required
 @user_passes_test(is_superadmin)
 def view_student(request, student_id):
@@ -1250,14 +1258,13 @@ Best regards,
 ENpower Skill Lab Team
                 """
                 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
-                messages.success(request, f'Teacher {teacher.full_name} added successfully! Credentials sent to {email}')
+                messages.success(request, f'Teacher {teacher.full_name} added successfully! Credentials will be emailed to {email}')
             except Exception as mail_error:
                 messages.warning(request, f'Teacher added but email failed: {str(mail_error)}. Password: {temp_password}')
             
@@ -1279,24 +1286,44 @@ ENpower Skill Lab Team
 @login_required
 @user_passes_test(is_superadmin)
 def teacher_list(request):
-    """View to display list of all teachers"""
-    from teacher.models import Teacher
-    import random
-
-    # Get all teachers
-    teachers = Teacher.objects.all().order_by('-created_at')
-
-    # Add badge colors for teachers without photos
-    badge_colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#ec4899', '#a855f7']
-    for teacher in teachers:
-        teacher.badge_color = random.choice(badge_colors)
-
+    """View to display list of all teachers (first page; teacher_list_rows serves the rest)"""
+    listing = _teacher_directory().page(request.GET)
     context = {
-        'teachers': teachers
+        'teachers': listing.rows,
+        'listing': listing,
     }
     return render(request, 'superadmin/teachers-list.html', context)
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def teacher_list_rows(request):
+    """JSON rows of the teacher list (search, filter, sort, next page)"""
+    return rows_response(request, _teacher_directory(), 'superadmin/includes/teacher_rows.html', 'teachers')
+
+
+def _teacher_directory():
+    from teacher.models import Teacher
+    return DirectoryList(
+        Teacher.objects.all(),
+        sorts={'created': 'created_at', 'name': 'full_name', 'id': 'employee_id'},
+        default_sort='-created',
+        search=['full_name', 'employee_id', 'official_email', 'mobile_number'],
+        filters=[
+            ListFilter('status', 'attendance_status', 'All statuses', Teacher.ATTENDANCE_STATUS_CHOICES),
+            ListFilter('designation', 'designation', 'All designations', Teacher.DESIGNATION_CHOICES),
+            ListFilter('school', 'school_id', 'All schools', _school_choices),
+        ],
+        decorate=_teacher_badges,
+    )
+
+
+def _teacher_badges(teachers):
+    # Badge colors for teachers without photos
+    for teacher in teachers:
+        teacher.badge_color = badge_color(teacher.full_name, BADGE_COLORS_WIDE)
+
+
 @login_required
 @user_passes_test(is_superadmin)
 def view_teacher(request, teacher_id):
@@ -1401,25 +1428,41 @@ def delete_student(request, student_id):
 @login_required
 @user_passes_test(is_superadmin)
 def parent_list(request):
-    """View to display list of all parents"""
-    from parent.models import Parent
-    parents = Parent.objects.prefetch_related('students').all().order_by('-created_at')
-
-    # Add helper properties for each parent
-    colors = ['#3b82f6', '#8b5cf6', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#f97316', '#6366f1', '#ec4899', '#14b8a6']
-    for parent in parents:
-        # Assign badge color based on first character
-        parent.badge_color = colors[ord(parent.full_name[0]) % len(colors)]
-
+    """View to display list of all parents (first page; parent_list_rows serves the rest)"""
+    listing = _parent_directory().page(request.GET)
     context = {
-        'parents': parents,
-        'total_parents': parents.count(),
-        'active_parents': parents.filter(account_status='active').count(),
-        'pending_parents': parents.filter(account_status='pending').count(),
+        'parents': listing.rows,
+        'listing': listing,
     }
     return render(request, 'superadmin/parent-list.html', context)
 
 
+@login_required
+@user_passes_test(is_superadmin)
+def parent_list_rows(request):
+    """JSON rows of the parent list (search, filter, sort, next page)"""
+    return rows_response(request, _parent_directory(), 'superadmin/includes/parent_rows.html', 'parents')
+
+
+def _parent_directory():
+    from parent.models import Parent
+    return DirectoryList(
+        # Children are prefetched for the rows of each page only
+        Parent.objects.prefetch_related('students'),
+        sorts={'created': 'created_at', 'name': 'full_name', 'id': 'parent_id'},
+        default_sort='-created',
+        search=['full_name', 'parent_id', 'email', 'mobile_number'],
+        filters=[ListFilter('status', 'account_status', 'All statuses', Parent.ACCOUNT_STATUS_CHOICES)],
+        decorate=_parent_badges,
+    )
+
+
+def _parent_badges(parents):
+    # Assign badge color based on first character
+    for parent in parents:
+        parent.badge_color = badge_color(parent.full_name, BADGE_COLORS_PARENT)
+
+
 @login_required
 @user_passes_test(is_superadmin)
 def onboard_parent(request):
@@ -1566,14 +1609,13 @@ Best regards,
 ENpower Skill Lab Team
                 """
                 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
-                messages.success(request, f'Parent "{parent.full_name}" onboarded successfully! Credentials sent to {email}')
+                messages.success(request, f'Parent "{parent.full_name}" onboarded successfully! Credentials will be emailed to {email}')
             except Exception as mail_error:
                 messages.warning(request, f'Parent added but email failed: {str(mail_error)}. Password: {temp_password}')
             
@@ -1873,15 +1915,14 @@ Best regards,
 Enpower Skill Lab Team
                 """
 
-                send_mail(
+                queue_email(
                     email_subject,
                     email_body,
-                    settings.DEFAULT_FROM_EMAIL,
                     [coordinator.official_email],
-                    fail_silently=False,
+                    settings.DEFAULT_FROM_EMAIL,
                 )
 
-                messages.success(request, f'Program Coordinator "{coordinator.full_name}" onboarded successfully! Credentials sent to {coordinator.official_email}.')
+                messages.success(request, f'Program Coordinator "{coordinator.full_name}" onboarded successfully! Credentials will be emailed to {coordinator.official_email}.')
             except Exception as email_error:
                 messages.warning(request, f'Program Coordinator created but email failed to send: {str(email_error)}. Temporary password: {temp_password}')
             
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_school_list_indexes'),
+        ('teacher', '0001_move_teacher_from_superadmin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['created_at', 'id'], name='teachers_created_2d9d5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['full_name', 'id'], name='teachers_full_na_3192f4_idx'),
+        ),
+    ]
@@ -175,6 +175,11 @@ class Teacher(models.Model):
         verbose_name = 'Teacher'
         verbose_name_plural = 'Teachers'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pages of the teacher list (accounts.listing)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['full_name', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.employee_id}"
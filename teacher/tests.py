@@ -1,3 +1,186 @@
+import json
+from datetime import date
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
+from competencies import score_stream
+from competencies.assessment_stats import assessment_summary
+from competencies.models import (
+    Assessment, AssessmentCompetency, Competency, Project, ProjectReport, ScoreChange, ScoreEntry, SubPillar,
+)
+from schools.models import School
+from student.models import Student
+
+from .models import Teacher
+
+
+User = get_user_model()
+
+
+class ScoreEntryTestCase(TestCase):
+    """A coach with a school and a Middle-stage assessment of two competencies."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            school_name='School', school_code='SC1', city='Pune', state='MH', pincode='411001',
+        )
+        cls.coach = User.objects.create_user(username='coach', password='pw', role='THINKING_COACH')
+        Teacher.objects.create(
+            user=cls.coach, school=cls.school, employee_id='EMP1', full_name='Coach',
+            date_of_birth=date(1990, 1, 1), joining_date=date(2020, 1, 1),
+            official_email='coach@example.com',
+        )
+        cls.students = [
+            Student.objects.create(
+                first_name=f'Student{i}', last_name='Test', gender='male', date_of_birth=date(2012, 1, 1),
+                student_class='8', division='A', roll_number=str(i), academic_year='2024-2025',
+                gr_number=f'GR{i}', school_board='CBSE', school_email=f'student{i}@example.com',
+                enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+                emergency_mobile='9000000002', school=cls.school,
+            )
+            for i in range(3)
+        ]
+        # Another school's student: not the coach's to score
+        Student.objects.filter(pk=cls.students[2].pk).update(
+            school=School.objects.create(
+                school_name='Other School', school_code='SC2', city='Pune', state='MH', pincode='411002',
+            )
+        )
+        sub_pillar = SubPillar.objects.order_by('sp_number').first()
+        cls.project = Project.objects.create(
+            title='Project', project_type='Life Form', grade='Middle', status='Active',
+        )
+        cls.assessment = Assessment.objects.create(project=cls.project, name='Assessment')
+        cls.acs = [
+            AssessmentCompetency.objects.create(
+                assessment=cls.assessment,
+                competency=Competency.objects.create(
+                    sub_pillar=sub_pillar, code=f'T{i}', name=f'Competency {i}', stage='Middle',
+                ),
+            )
+            for i in range(2)
+        ]
+
+
+class ScoreStreamTests(ScoreEntryTestCase):
+    """The SSE endpoint serves a coach who has a school."""
+
+    @mock.patch.object(score_stream, 'POLL_INTERVAL', 0.01)
+    async def test_stream_sends_ready_then_changes(self):
+        await self.async_client.aforce_login(self.coach)
+        response = await self.async_client.get(
+            reverse('teacher:api_score_stream'), {'assessment_id': self.assessment.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        events = aiter(response.streaming_content)
+        try:
+            self.assertTrue((await anext(events)).startswith(b'event: ready'))
+
+            await sync_to_async(ScoreEntry.objects.create)(
+                student=self.students[0], assessment_competency=self.acs[0], score=7,
+            )
+            event = await anext(events)
+            self.assertTrue(event.startswith(b'event: scores'))
+            self.assertIn(f'"{self.students[0].id}__{self.acs[0].id}": 7'.encode(), event)
+            self.assertIn(b'"stats": {"total_students": 2, "scored_count": 1, "class_avg": 7.0}', event)
+        finally:
+            await events.aclose()
+
+
+class ScoreEntryDataTests(ScoreEntryTestCase):
+    """The grid header's class average covers the grid's students only."""
+
+    def test_class_avg_ignores_students_outside_the_grid(self):
+        # Same school, but Class 3: not in a Middle-stage grid
+        younger = Student.objects.create(
+            first_name='Younger', last_name='Test', gender='male', date_of_birth=date(2017, 1, 1),
+            student_class='3', division='A', roll_number='9', academic_year='2024-2025',
+            gr_number='GR9', school_board='CBSE', school_email='younger@example.com',
+            enrollment_date=date(2024, 1, 1), emergency_name='E', emergency_relationship='father',
+            emergency_mobile='9000000002', school=self.school,
+        )
+        for student, score in zip(self.students + [younger], [8, 5, 1, 2]):
+            ScoreEntry.objects.create(student=student, assessment_competency=self.acs[0], score=score)
+
+        self.client.force_login(self.coach)
+        response = self.client.get(reverse('teacher:api_score_entry_data'), {'assessment_id': self.assessment.id})
+
+        self.assertEqual(response.json()['stats'], {'total_students': 2, 'scored_count': 2, 'class_avg': 6.5})
+
+
+class SaveScoresTests(ScoreEntryTestCase):
+    """api_save_scores upserts valid cells, reports the rest, and keeps derived data in step."""
+
+    def setUp(self):
+        self.client.force_login(self.coach)
+
+    def save(self, *cells):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('teacher:api_save_scores'), json.dumps({'scores': list(cells)}),
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def cell(self, student, ac, score):
+        return {'student_id': student.id, 'assessment_competency_id': ac.id, 'score': score}
+
+    def scores(self):
+        return dict(ScoreEntry.objects.values_list('student_id', 'score'))
+
+    def test_creates_updates_and_clears(self):
+        s0, s1 = self.students[:2]
+        ac = self.acs[0]
+
+        self.assertEqual(self.save(self.cell(s0, ac, 7), self.cell(s1, ac, 5))['saved'], 2)
+        self.assertEqual(self.scores(), {s0.id: 7, s1.id: 5})
+
+        data = self.save(self.cell(s0, ac, 9), self.cell(s1, ac, ''))
+        self.assertEqual([r['score'] for r in data['results']], [9, None])
+        self.assertEqual(self.scores(), {s0.id: 9, s1.id: None})
+
+    def test_invalid_cells_are_reported_in_request_order(self):
+        s0, other = self.students[0], self.students[2]
+        data = self.save(
+            self.cell(s0, self.acs[0], 11),
+            {'student_id': s0.id},
+            self.cell(other, self.acs[0], 5),
+            {'student_id': s0.id, 'assessment_competency_id': 0, 'score': 5},
+            self.cell(s0, self.acs[1], 6),
+        )
+
+        self.assertEqual((data['saved'], data['failed']), (1, 4))
+        self.assertEqual([r.get('error') for r in data['results']], [
+            'Score must be 1-10', 'Invalid data', 'Student not found in your school',
+            'Assessment competency not found', None,
+        ])
+        self.assertEqual(list(ScoreEntry.objects.values_list('assessment_competency_id', 'score')),
+                         [(self.acs[1].id, 6)])
+
+    def test_side_effects(self):
+        s0 = self.students[0]
+        report = ProjectReport.objects.create(student=s0, project=self.project, is_outdated=False)
+
+        self.save(self.cell(s0, self.acs[0], 8), self.cell(self.students[1], self.acs[0], 4))
+        self.save(self.cell(s0, self.acs[0], 6))
+
+        self.assertEqual(list(ScoreChange.objects.filter(student=s0).values_list('score', flat=True)), [8, 6])
+        summary = assessment_summary(self.assessment.id, self.school.id)
+        self.assertEqual((summary['count'], summary['sum']), (2, 10))
+        report.refresh_from_db()
+        self.assertTrue(report.is_outdated)
+
+    def test_form_post_from_send_beacon(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('teacher:api_save_scores'), {
+                'scores': json.dumps([self.cell(self.students[0], self.acs[0], 3)]),
+            })
 
-# Create your tests here.
+        self.assertEqual(response.json()['saved'], 1)
+        self.assertEqual(self.scores(), {self.students[0].id: 3})
@@ -20,11 +20,15 @@ urlpatterns = [
     path('academics/score-entry/', views.score_entry, name='score_entry'),
     path('api/assessments-by-project/', views.api_assessments_by_project, name='api_assessments_by_project'),
     path('api/score-entry-data/', views.api_score_entry_data, name='api_score_entry_data'),
+    path('api/score-entry-changes/', views.api_score_entry_changes, name='api_score_entry_changes'),
+    path('api/score-stream/', views.api_score_stream, name='api_score_stream'),
     path('api/save-score/', views.api_save_score, name='api_save_score'),
+    path('api/save-scores/', views.api_save_scores, name='api_save_scores'),
     path('api/projects-by-grade/', views.api_projects_by_grade, name='api_projects_by_grade'),
     path('api/project-details/', views.api_project_details, name='api_project_details'),
     path('assessment/<int:assessment_id>/student/<int:student_id>/', views.student_score_detail, name='student_score_detail'),
     path('api/save-feedback/', views.api_save_feedback, name='api_save_feedback'),
     path('api/generate-report/', views.api_generate_report, name='api_generate_report'),
+    path('api/report-jobs/', views.api_report_jobs, name='api_report_jobs'),
     path('api/save-project-feedback/', views.api_save_project_feedback, name='api_save_project_feedback'),
 ]
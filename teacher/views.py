@@ -167,11 +167,35 @@ def api_assessments_by_project(request):
     return JsonResponse({'assessments': assessments})
 
 
+STAGE_TO_CLASSES = {
+    'Foundational': ['1', '2'],
+    'Preparatory':  ['3', '4', '5'],
+    'Middle':       ['6', '7', '8'],
+    'Secondary':    ['9', '10', '11', '12'],
+}
+
+
+def _score_entry_students(assessment, teacher_obj):
+    """Students shown in the score entry grid for an assessment."""
+    class_range = STAGE_TO_CLASSES.get(assessment.project.grade, [])
+
+    students_qs = Student.objects.filter(
+        student_class__in=class_range,
+        attendance_status='active'
+    )
+    # school_id, not school: api_score_stream calls this from async code,
+    # where following the FK would be a blocking query
+    if teacher_obj and teacher_obj.school_id:
+        students_qs = students_qs.filter(school_id=teacher_obj.school_id)
+    return students_qs
+
+
 @login_required
 @user_passes_test(is_teacher)
 def api_score_entry_data(request):
     """AJAX: return students + competencies + existing scores for an assessment"""
     from competencies.models import Assessment, ScoreEntry
+    from competencies.score_sync import current_cursor
     from student.models import Student
 
     assessment_id = request.GET.get('assessment_id', '')
@@ -183,22 +207,8 @@ def api_score_entry_data(request):
     except (Assessment.DoesNotExist, ValueError):
         return JsonResponse({'error': 'Not found'}, status=404)
 
-    STAGE_TO_CLASSES = {
-        'Foundational': ['1', '2'],
-        'Preparatory':  ['3', '4', '5'],
-        'Middle':       ['6', '7', '8'],
-        'Secondary':    ['9', '10', '11', '12'],
-    }
-    grade = assessment.project.grade
-    class_range = STAGE_TO_CLASSES.get(grade, [])
-
     teacher_obj = getattr(request.user, 'teacher_profile', None)
-    students_qs = Student.objects.filter(
-        student_class__in=class_range,
-        attendance_status='active'
-    )
-    if teacher_obj and teacher_obj.school:
-        students_qs = students_qs.filter(school=teacher_obj.school)
+    students_qs = _score_entry_students(assessment, teacher_obj)
 
     students = list(
         students_qs.order_by('first_name', 'last_name')
@@ -211,6 +221,9 @@ def api_score_entry_data(request):
         .values('id', 'competency__code', 'competency__name', 'comp_type')
     )
 
+    # Read the cursor first: a change landing mid-request is re-sent, never lost
+    cursor = current_cursor()
+
     student_ids = [s['id'] for s in students]
     ac_ids      = [c['id'] for c in comp_mappings]
     scores_qs   = ScoreEntry.objects.filter(
@@ -226,8 +239,9 @@ def api_score_entry_data(request):
         if s['score'] is not None:
             scored_student_ids.add(s['student_id'])
 
-    all_score_vals = [s['score'] for s in scores_qs if s['score'] is not None]
-    class_avg = round(sum(all_score_vals) / len(all_score_vals), 1) if all_score_vals else None
+    # Average of the scores in this grid (its students only), as refreshStats recomputes it
+    score_vals = [score for score in scores.values() if score is not None]
+    class_avg  = round(sum(score_vals) / len(score_vals), 1) if score_vals else None
 
     return JsonResponse({
         'assessment': {'id': assessment.id, 'name': assessment.name, 'type': assessment.assessment_type},
@@ -235,6 +249,7 @@ def api_score_entry_data(request):
         'students':    students,
         'competencies': comp_mappings,
         'scores':      scores,
+        'cursor':      cursor,
         'stats': {
             'total_students': len(students),
             'scored_count':   len(scored_student_ids),
@@ -243,6 +258,85 @@ def api_score_entry_data(request):
     })
 
 
+@login_required
+@user_passes_test(is_teacher)
+def api_score_entry_changes(request):
+    """
+    AJAX: cells changed since the client's cursor — ?assessment_id=&since=
+    Answers 304 (no body) when nothing changed, otherwise
+    { cursor, scores: { 'studentid__acid': score } } with only those cells.
+    410 when the cursor is older than the retained change log: the grid
+    must reload.
+    """
+    from django.http import HttpResponse
+    from competencies.score_sync import changes_since, cursor_expired, latest_cursor
+
+    try:
+        assessment_id = int(request.GET.get('assessment_id', ''))
+        since         = int(request.GET.get('since', 0))
+    except ValueError:
+        return JsonResponse({'error': 'assessment_id and since required'}, status=400)
+
+    latest = latest_cursor(assessment_id)
+    if latest <= since:
+        return HttpResponse(status=304)
+    if cursor_expired(since):
+        return JsonResponse({'error': 'Changes since this cursor were purged; reload the grid'}, status=410)
+
+    student_ids = None
+    teacher_obj = getattr(request.user, 'teacher_profile', None)
+    if teacher_obj and teacher_obj.school:
+        student_ids = Student.objects.filter(school=teacher_obj.school).values('id')
+
+    cursor, scores = changes_since(assessment_id, since, student_ids, latest=latest)
+    return JsonResponse({'cursor': cursor, 'scores': scores})
+
+
+@login_required
+@user_passes_test(is_teacher)
+async def api_score_stream(request):
+    """
+    SSE: live score-cell changes + class average for an assessment —
+    ?assessment_id=&since=  (EventSource sends Last-Event-ID on reconnect).
+
+    Needs the ASGI server (enpower_skill_lab/asgi.py). Under WSGI every open
+    stream would pin a worker, so it answers 501 and the grid keeps polling
+    api_score_entry_changes instead.
+    """
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import StreamingHttpResponse
+    from asgiref.sync import sync_to_async
+    from competencies.models import Assessment
+    from competencies.score_stream import score_events
+
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live updates need the ASGI server'}, status=501)
+
+    try:
+        assessment_id = int(request.GET.get('assessment_id', ''))
+        since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+        since = int(since) if since not in (None, '') else None
+    except ValueError:
+        return JsonResponse({'error': 'assessment_id required'}, status=400)
+
+    assessment = await Assessment.objects.select_related('project').filter(id=assessment_id).afirst()
+    if assessment is None:
+        return JsonResponse({'error': 'Not found'}, status=404)
+
+    user        = await request.auser()
+    teacher_obj = await sync_to_async(lambda: getattr(user, 'teacher_profile', None))()
+    students_qs = _score_entry_students(assessment, teacher_obj)
+    scope_key   = teacher_obj.school_id if teacher_obj else None
+
+    response = StreamingHttpResponse(
+        score_events(assessment.id, scope_key, students_qs, since),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control']     = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'   # nginx: do not buffer the stream
+    return response
+
+
 @login_required
 @user_passes_test(is_teacher)
 def api_save_score(request):
@@ -275,6 +369,144 @@ def api_save_score(request):
     return JsonResponse({'ok': True, 'score': entry.score})
 
 
+MAX_SCORE_BATCH = 2000
+
+
+@login_required
+@user_passes_test(is_teacher)
+def api_save_scores(request):
+    """
+    AJAX POST: save many score cells at once.
+
+    Body: { scores: [ { student_id, assessment_competency_id, score }, ... ] }
+    — or, from navigator.sendBeacon on page exit, a form whose `scores`
+    field holds that list as JSON.
+    Every cell is validated; valid cells are written in one transaction with
+    a single upsert on (student, assessment_competency). Returns one result
+    per cell, in request order.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    import json
+    from django.db import transaction
+    from competencies.models import AssessmentCompetency, ScoreEntry
+    from competencies.outdated import mark_scores_changed
+    from competencies.score_sync import record_score_changes
+    from competencies.assessment_stats import apply_score_deltas
+    from accounts.activity import record_events, score_events
+
+    try:
+        if request.content_type in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+            cells = json.loads(request.POST['scores'])
+        else:
+            cells = json.loads(request.body)['scores']
+        if not isinstance(cells, list):
+            raise TypeError
+    except (KeyError, ValueError, TypeError):
+        return JsonResponse({'error': 'Invalid data'}, status=400)
+
+    if len(cells) > MAX_SCORE_BATCH:
+        return JsonResponse({'error': f'At most {MAX_SCORE_BATCH} scores per request'}, status=400)
+
+    # Validate shape and range
+    results = []
+    parsed  = []
+    for cell in cells:
+        try:
+            student_id = int(cell['student_id'])
+            ac_id      = int(cell['assessment_competency_id'])
+            score_val  = cell.get('score')
+            if score_val is not None and score_val != '':
+                score_val = int(score_val)
+                if not (1 <= score_val <= 10):
+                    results.append({'ok': False, 'student_id': student_id, 'assessment_competency_id': ac_id,
+                                    'error': 'Score must be 1-10'})
+                    parsed.append(None)
+                    continue
+            else:
+                score_val = None
+        except (KeyError, ValueError, TypeError, AttributeError):
+            results.append({'ok': False, 'error': 'Invalid data'})
+            parsed.append(None)
+            continue
+        results.append({'ok': True, 'student_id': student_id, 'assessment_competency_id': ac_id})
+        parsed.append((student_id, ac_id, score_val))
+
+    # Validate references — one query each
+    teacher_profile = getattr(request.user, 'teacher_profile', None)
+    students_qs     = Student.objects.filter(id__in={p[0] for p in parsed if p})
+    if teacher_profile:
+        students_qs = students_qs.filter(school=teacher_profile.school)
+    valid_students = set(students_qs.values_list('id', flat=True))
+    valid_acs      = set(
+        AssessmentCompetency.objects
+        .filter(id__in={p[1] for p in parsed if p})
+        .values_list('id', flat=True)
+    )
+
+    # Last write wins for a cell sent twice
+    entries = {}
+    for i, item in enumerate(parsed):
+        if item is None:
+            continue
+        student_id, ac_id, score_val = item
+        if student_id not in valid_students:
+            results[i] = {'ok': False, 'student_id': student_id, 'assessment_competency_id': ac_id,
+                          'error': 'Student not found in your school'}
+            continue
+        if ac_id not in valid_acs:
+            results[i] = {'ok': False, 'student_id': student_id, 'assessment_competency_id': ac_id,
+                          'error': 'Assessment competency not found'}
+            continue
+        entries[(student_id, ac_id)] = ScoreEntry(
+            student_id=student_id,
+            assessment_competency_id=ac_id,
+            score=score_val,
+            entered_by=request.user,
+        )
+        results[i]['score'] = score_val
+
+    if entries:
+        with transaction.atomic():
+            previous = {
+                (sid, ac_id): score
+                for sid, ac_id, score in ScoreEntry.objects.filter(
+                    student_id__in={k[0] for k in entries},
+                    assessment_competency_id__in={k[1] for k in entries},
+                ).values_list('student_id', 'assessment_competency_id', 'score')
+            }
+            ScoreEntry.objects.bulk_create(
+                list(entries.values()),
+                update_conflicts=True,
+                unique_fields=['student', 'assessment_competency'],
+                update_fields=['score', 'entered_by', 'updated_at'],
+            )
+            # bulk_create skips post_save, so flag stale reports and log
+            # the changes for delta sync directly
+            mark_scores_changed(entries.keys())
+            record_score_changes(
+                (entry.student_id, entry.assessment_competency_id, entry.score)
+                for entry in entries.values()
+            )
+            apply_score_deltas(
+                (sid, ac_id, previous.get((sid, ac_id)), entry.score)
+                for (sid, ac_id), entry in entries.items()
+            )
+            record_events(score_events(
+                (sid, ac_id, entry.score)
+                for (sid, ac_id), entry in entries.items()
+                if entry.score != previous.get((sid, ac_id))
+            ))
+
+    return JsonResponse({
+        'ok': True,
+        'saved': len(entries),
+        'failed': sum(1 for r in results if not r['ok']),
+        'results': results,
+    })
+
+
 @login_required
 @user_passes_test(is_teacher)
 def student_score_detail(request, assessment_id, student_id):
@@ -1006,7 +1238,16 @@ def delete_lessons(request):
 @login_required
 @user_passes_test(is_teacher)
 def api_generate_report(request):
-    """AJAX POST: generate (or regenerate) a ProjectReport for a student + project."""
+    """
+    AJAX POST: generate (or regenerate) ProjectReports for a project.
+
+    Accepts one of:
+      { project_id, student_id }          — single student
+      { project_id, student_ids: [...] }  — explicit batch
+      { project_id, class_id }            — every active student in a Class
+    A single student is generated inline. Batches are queued as ReportJobs
+    for `manage.py report_worker`; poll api_report_jobs with the job_ids.
+    """
 
     if request.method != 'POST':
         return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
@@ -1014,31 +1255,94 @@ def api_generate_report(request):
     import json
     from competencies.models import Project
     from competencies.engine import generate_project_report
+    from competencies.jobs import enqueue_report_jobs
+    from schools.models import Class
 
     try:
-        data       = json.loads(request.body)
-        student_id = int(data.get('student_id', 0))
-        project_id = int(data.get('project_id', 0))
+        data        = json.loads(request.body)
+        project_id  = int(data.get('project_id', 0))
+        student_id  = int(data.get('student_id') or 0)
+        class_id    = int(data.get('class_id') or 0)
+        student_ids = [int(sid) for sid in data.get('student_ids') or []]
     except (ValueError, TypeError):
         return JsonResponse({'ok': False, 'error': 'Invalid data'}, status=400)
 
-    student = Student.objects.filter(id=student_id).first()
     project = Project.objects.filter(id=project_id).first()
+    if not project:
+        return JsonResponse({'ok': False, 'error': 'Project not found'}, status=404)
 
-    if not student or not project:
-        return JsonResponse({'ok': False, 'error': 'Student or project not found'}, status=404)
-
-    # Ensure teacher can only generate for students in their school
     teacher_profile = getattr(request.user, 'teacher_profile', None)
-    if teacher_profile and student.school != teacher_profile.school:
-        return JsonResponse({'ok': False, 'error': 'Student not in your school'}, status=403)
 
-    report, error = generate_project_report(student, project)
-    if error:
-        return JsonResponse({'ok': False, 'error': error})
+    if student_id and not (student_ids or class_id):
+        student = Student.objects.filter(id=student_id).first()
+        if not student:
+            return JsonResponse({'ok': False, 'error': 'Student or project not found'}, status=404)
+
+        # Ensure teacher can only generate for students in their school
+        if teacher_profile and student.school != teacher_profile.school:
+            return JsonResponse({'ok': False, 'error': 'Student not in your school'}, status=403)
+
+        report, error = generate_project_report(student, project)
+        if error:
+            return JsonResponse({'ok': False, 'error': error})
+
+        return JsonResponse({
+            'ok': True,
+            'message': f'Report generated for {student.first_name} {student.last_name}',
+            'report_id': report.id,
+        })
+
+    # Batch: explicit student list or a whole class
+    if class_id:
+        cls = Class.objects.filter(id=class_id).first()
+        if not cls:
+            return JsonResponse({'ok': False, 'error': 'Class not found'}, status=404)
+        students_qs = Student.objects.filter(
+            school=cls.school,
+            student_class=cls.grade,
+            division=cls.division,
+            is_active=True,
+        )
+    elif student_ids:
+        students_qs = Student.objects.filter(id__in=student_ids)
+    else:
+        return JsonResponse({'ok': False, 'error': 'student_id, student_ids or class_id required'}, status=400)
+
+    if teacher_profile:
+        students_qs = students_qs.filter(school=teacher_profile.school)
+
+    cohort_ids = list(students_qs.values_list('id', flat=True))
+    if not cohort_ids:
+        return JsonResponse({'ok': False, 'error': 'No students found in your school'}, status=404)
+
+    jobs = enqueue_report_jobs(cohort_ids, project)
+
+    return JsonResponse({
+        'ok': True,
+        'message': f'Report generation queued for {len(jobs)} students',
+        'queued': len(jobs),
+        'job_ids': [job.id for job in jobs],
+    })
+
+
+@login_required
+@user_passes_test(is_teacher)
+def api_report_jobs(request):
+    """AJAX GET: status of queued report jobs — ?ids=1,2,3"""
+    from competencies.jobs import report_job_statuses
+
+    try:
+        job_ids = [int(i) for i in request.GET.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Invalid ids'}, status=400)
+
+    teacher_profile = getattr(request.user, 'teacher_profile', None)
+    school = teacher_profile.school if teacher_profile else None
+    jobs, counts = report_job_statuses(job_ids, school=school)
 
     return JsonResponse({
         'ok': True,
-        'message': f'Report generated for {student.first_name} {student.last_name}',
-        'report_id': report.id,
+        'jobs': jobs,
+        'counts': counts,
+        'finished': counts['Pending'] == 0 and counts['Running'] == 0,
     })